@@ -1,7 +1,121 @@
+import asyncio
+import threading
 from app.services.nlp_engine import NLPEngine
+from app.services.vector_store import VectorStore
+from app.services.candidate_pool import CandidatePool
+from app.services.extraction_service import get_extraction_service
+from app.services.job_queue import JobQueue
+from app.core.config import settings
+from app.core.executors import run_inference
+from app.core.readiness import readiness
 from functools import lru_cache
 
+# Serializes model loading so a request arriving during preload waits for it
+# instead of loading a second copy
+_load_lock = threading.RLock()
+
+# Readiness components backed by the NLP engine
+NLP_COMPONENTS = ("spacy", "encoder")
+
+
 @lru_cache()
+def _load_nlp_engine():
+    with readiness.track("spacy"), readiness.track("encoder"):
+        engine = NLPEngine()
+    for name, seconds in engine.load_timings.items():
+        readiness.record(name, "load", seconds)
+    if not settings.preload_models:
+        # Loaded by the first request that needs it; there is no warmup pass to wait for
+        readiness.mark_ready(*NLP_COMPONENTS)
+    return engine
+
+
 def get_nlp_engine():
     """Singleton instance of NLP Engine to avoid reloading models."""
-    return NLPEngine()
+    with _load_lock:
+        return _load_nlp_engine()
+
+
+@lru_cache()
+def _load_candidate_pool():
+    store = VectorStore(
+        dimension=get_nlp_engine().encoder.get_sentence_embedding_dimension(),
+        index_path=settings.candidate_index_path,
+        index_type=settings.candidate_index_type,
+        nlist=settings.candidate_ivf_nlist,
+        nprobe=settings.candidate_ivf_nprobe,
+        hnsw_m=settings.candidate_hnsw_m,
+        ef_search=settings.candidate_hnsw_ef_search,
+        # IVF training runs in the pool's background thread, not in a request
+        defer_ivf_build=True
+    )
+    store.load()
+    return CandidatePool(store, save_every=settings.candidate_save_every)
+
+
+def get_candidate_pool():
+    """Singleton candidate pool, loaded from disk on first use."""
+    with _load_lock:
+        return _load_candidate_pool()
+
+
+@lru_cache()
+def get_job_queue() -> JobQueue:
+    """Singleton background job queue, persisted in SQLite."""
+    return JobQueue(
+        path=settings.job_queue_path,
+        max_attempts=settings.job_max_attempts,
+        retry_backoff=settings.job_retry_backoff_seconds,
+        result_ttl=settings.job_result_ttl_seconds,
+        lease_seconds=settings.job_lease_seconds
+    )
+
+
+def nlp_engine_loaded() -> bool:
+    return _load_nlp_engine.cache_info().currsize > 0
+
+
+def candidate_pool_loaded() -> bool:
+    return _load_candidate_pool.cache_info().currsize > 0
+
+
+def job_queue_loaded() -> bool:
+    return get_job_queue.cache_info().currsize > 0
+
+
+def register_readiness():
+    """
+    Declare what /ready waits for. The NLP models are always listed, so with
+    PRELOAD_MODELS=0 /ready stays 503 until a request has loaded them.
+    """
+    readiness.register(*NLP_COMPONENTS)
+    if nlp_engine_loaded():
+        readiness.mark_ready(*NLP_COMPONENTS)
+    if settings.preload_models:
+        readiness.register("candidate_pool", "parse_workers")
+
+
+async def preload_models():
+    """
+    Load and warm every model-backed singleton before the app reports ready.
+    Runs on the inference executor so /health stays responsive meanwhile.
+    """
+    try:
+        engine = await run_inference(get_nlp_engine)
+        with readiness.track("spacy", "warmup"), readiness.track("encoder", "warmup"):
+            warmup_timings = await run_inference(engine.warmup)
+        for name, seconds in warmup_timings.items():
+            readiness.record(name, "warmup", seconds)
+        readiness.mark_ready(*NLP_COMPONENTS)
+
+        with readiness.track("candidate_pool"):
+            await run_inference(get_candidate_pool)
+        readiness.mark_ready("candidate_pool")
+
+        with readiness.track("parse_workers", "warmup"):
+            await get_extraction_service().warmup()
+        readiness.mark_ready("parse_workers")
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"Model preload failed: {e}")
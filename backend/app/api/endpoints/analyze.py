@@ -1,141 +1,232 @@
+import json
 from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
-from typing import Optional
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Tuple
 from app.models.schemas import AnalysisResponse
-from app.services.parser import ResumeParser
-from app.services.scorer import Scorer
-from app.api.dependencies import get_nlp_engine
+from app.services.parser import ParsedDocument, ResumeParser
+from app.api.dependencies import get_nlp_engine, get_candidate_pool
 from app.services.nlp_engine import NLPEngine
-from app.services.interview_generator import InterviewGenerator
-from app.services.bullet_analyzer import BulletAnalyzer
-from app.services.market_data import MarketDataService
-from app.services.success_predictor import SuccessPredictor
+from app.services.candidate_pool import CandidatePool
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.interview_generator import parse_difficulties
+from app.core.executors import run_inference
+from app.core.config import settings
+from app.core.metrics import stage, PARSE_STATUS
+from app.api.uploads import SpooledUpload, parse_job_description, read_upload
 
 
 router = APIRouter()
 
+async def read_inputs(resume: UploadFile, jd_file: Optional[UploadFile]) -> Tuple[SpooledUpload, Optional[SpooledUpload]]:
+    """Bounded reads of the resume and JD files (413 past PARSE_MAX_BYTES); the caller closes both."""
+    resume_upload = await read_upload(resume, settings.parse_max_bytes)
+    try:
+        jd_upload = await read_upload(jd_file, settings.parse_max_bytes) if jd_file else None
+    except BaseException:
+        resume_upload.close()
+        raise
+    return resume_upload, jd_upload
+
+
+async def parse_inputs(
+    resume: SpooledUpload,
+    job_description: Optional[str] = None,
+    jd: Optional[SpooledUpload] = None
+) -> Tuple[ParsedDocument, str]:
+    """Parse the resume and JD uploads. Returns (parsed_resume, jd_text); jd_text is empty on a parse timeout."""
+    # 1. Parse Resume (cached by upload hash)
+    with stage("parse_resume"):
+        parsed_resume = await ResumeParser.parse_upload_async(resume.source, resume.filename.lower(), digest=resume.digest)
+    PARSE_STATUS.inc(status=parsed_resume.status)
+
+    if parsed_resume.status == "too_large":
+        raise HTTPException(status_code=413, detail=parsed_resume.detail)
+    if parsed_resume.status == "timeout":
+        return parsed_resume, ""
+
+    if not parsed_resume.text:
+         raise HTTPException(status_code=400, detail="Could not extract text from resume.")
+
+    # 2. Parse Job Description (Text or File)
+    jd_text = await parse_job_description(job_description, jd)
+        
+    if not jd_text:
+        # If no JD provided, we can still analyze resume but JD-specific parts will be generic
+        jd_text = "Generic Job Description" 
+
+    return parsed_resume, jd_text
+
+
+async def analyze_content(
+    nlp_engine: NLPEngine,
+    resume: SpooledUpload,
+    job_description: Optional[str] = None,
+    jd: Optional[SpooledUpload] = None,
+    candidate_pool: Optional[CandidatePool] = None,
+    fields: Optional[List[str]] = None,
+    interview_rotation: int = 0,
+    interview_difficulty: Optional[str] = None
+) -> AnalysisResponse:
+    """Parse and analyze one resume; shared by /analyze and background analyze jobs."""
+    parsed_resume, jd_text = await parse_inputs(resume, job_description, jd)
+    if parsed_resume.status == "timeout":
+        return AnalysisPipeline.parsing_failed(parsed_resume)
+
+    # 3-12. CPU-bound analysis runs on the inference executor
+    return await run_inference(
+        AnalysisPipeline.run,
+        nlp_engine=nlp_engine,
+        parsed_resume=parsed_resume,
+        jd_text=jd_text,
+        filename=resume.filename.lower(),
+        file_size=resume.size,
+        candidate_pool=candidate_pool,
+        fields=fields,
+        interview_rotation=interview_rotation,
+        interview_difficulty=interview_difficulty
+    )
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Comma-separated AnalysisResponse field names; None (everything) when not given."""
+    if not fields or not fields.strip():
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    try:
+        AnalysisPipeline.plan(selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return selected
+
+
+def parse_interview_difficulty(difficulty: Optional[str]) -> Optional[str]:
+    """Comma-separated question levels for the interview section; None (any level) when not given."""
+    try:
+        levels = parse_difficulties(difficulty)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ",".join(levels) if levels else None
+
+
+def _ndjson_line(payload: dict) -> str:
+    # Analysis values may carry numpy scalars
+    return json.dumps(payload, default=lambda o: o.item() if hasattr(o, "item") else str(o)) + "\n"
+
+
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_resume(
     resume: UploadFile = File(...),
     job_description: Optional[str] = Form(None),
     github_url: Optional[str] = Form(None),
     jd_file: Optional[UploadFile] = File(None),
-    nlp_engine: NLPEngine = Depends(get_nlp_engine)
+    add_to_pool: bool = Form(False),
+    fields: Optional[str] = Form(None),
+    interview_rotation: int = Form(0, ge=0),
+    interview_difficulty: Optional[str] = Form(None),
+    nlp_engine: NLPEngine = Depends(get_nlp_engine),
+    candidate_pool: CandidatePool = Depends(get_candidate_pool)
 ):
+    """
+    Full resume analysis. `fields` optionally lists the AnalysisResponse fields
+    to compute (e.g. "score,missing_skills,present_skills"); stages no
+    requested field depends on are skipped and their sections left empty.
+    `interview_rotation` moves each interview question to a later one in the
+    bank (a different set for a repeat session); `interview_difficulty`
+    ("hard", "easy,medium") keeps only questions of those levels.
+    """
     try:
-        # 1. Parse Resume
-        content = await resume.read()
-        filename = resume.filename.lower() if resume.filename else ""
-        
-        if filename.endswith(".pdf"):
-            resume_text = ResumeParser.parse_pdf(content)
-        elif filename.endswith(".docx"):
-            resume_text = ResumeParser.parse_docx(content)
-        else:
-            resume_text = content.decode("utf-8", errors="ignore")
-            
-        if not resume_text:
-             raise HTTPException(status_code=400, detail="Could not extract text from resume.")
-
-        # 2. Parse Job Description (Text or File)
-        jd_text = ""
-        if jd_file:
-            jd_content = await jd_file.read()
-            jd_filename = jd_file.filename.lower() if jd_file.filename else ""
-            
-            if jd_filename.endswith(".pdf"):
-                jd_text = ResumeParser.parse_pdf(jd_content)
-            elif jd_filename.endswith(".docx"):
-                jd_text = ResumeParser.parse_docx(jd_content)
-            else:
-                jd_text = jd_content.decode("utf-8", errors="ignore")
-        elif job_description:
-            jd_text = job_description
-            
-        if not jd_text:
-            # If no JD provided, we can still analyze resume but JD-specific parts will be generic
-            jd_text = "Generic Job Description" 
-
-        # 3. Extract Entities & Skills (Resume)
-        resume_entities = nlp_engine.extract_entities(resume_text)
-        resume_skills = nlp_engine.extract_skills(resume_text)
-        
-        # 4. Process Job Description
-        jd_skills = nlp_engine.extract_skills(jd_text)
-        
-        # 5. Generate Embeddings
-        resume_vec = nlp_engine.get_embedding(resume_text)
-        jd_vec = nlp_engine.get_embedding(jd_text)
-        
-        # 6. Calculate Score
-        similarity_score = nlp_engine.compute_similarity(resume_vec, jd_vec)
-        
-        scoring_result = Scorer.calculate_score(
-            semantic_score=similarity_score,
-            resume_skills=resume_skills,
-            job_skills=jd_skills
-        )
-        
-        recommendations = Scorer.generate_recommendations(
-            missing_skills=scoring_result["missing_skills"],
-            score=scoring_result["total_score"]
-        )
+        selected = parse_fields(fields)
+        difficulty = parse_interview_difficulty(interview_difficulty)
+        resume_upload, jd_upload = await read_inputs(resume, jd_file)
+        try:
+            return await analyze_content(
+                nlp_engine,
+                resume_upload,
+                job_description=job_description,
+                jd=jd_upload,
+                candidate_pool=candidate_pool if add_to_pool else None,
+                fields=selected,
+                interview_rotation=interview_rotation,
+                interview_difficulty=difficulty
+            )
+        finally:
+            resume_upload.close()
+            if jd_upload is not None:
+                jd_upload.close()
 
-        # ATS Structural Checks (Basic)
-        structure_analysis = {
-            "file_size_kb": len(content) / 1024,
-            "text_length": len(resume_text),
-            "is_scanned_pdf": len(resume_text) < 200 and filename.endswith(".pdf"),
-            "contact_info_present": "@" in resume_text # Simple check
-        }
-        
-        if structure_analysis["is_scanned_pdf"]:
-            recommendations.append("⚠️ CRITICAL: Your resume appears to be an image/scanned PDF. ATS cannot read it. Use a text-based PDF.")
-
-        # 7. Calculate Trajectory
-        trajectory = Scorer.calculate_trajectory(
-            nlp_engine=nlp_engine,
-            base_resume_text=resume_text,
-            job_description=jd_text,
-            missing_skills=scoring_result["missing_skills"],
-            current_score=scoring_result["total_score"]
-        )
-
-        # 8. Generate Interview Questions
-        interview_questions = InterviewGenerator.generate_questions(
-            missing_skills=scoring_result["missing_skills"],
-            job_skills=jd_skills
-        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
-        # 9. Analyze Bullets
-        bullet_analysis = BulletAnalyzer.analyze_bullets(resume_text, nlp_engine=nlp_engine)
 
-        # 10. Market Demand Analysis
-        market_analysis = MarketDataService.get_market_data(resume_text, jd_text)
-        
-        # 11. Success Prediction
-        success_prediction = SuccessPredictor.predict_success(
-            resume_score=scoring_result["total_score"],
-            missing_skills=scoring_result["missing_skills"],
-            market_data=market_analysis
-        )
-        
+@router.post("/analyze/stream")
+async def analyze_resume_stream(
+    resume: UploadFile = File(...),
+    job_description: Optional[str] = Form(None),
+    github_url: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None),
+    add_to_pool: bool = Form(False),
+    fields: Optional[str] = Form(None),
+    interview_rotation: int = Form(0, ge=0),
+    interview_difficulty: Optional[str] = Form(None),
+    nlp_engine: NLPEngine = Depends(get_nlp_engine),
+    candidate_pool: CandidatePool = Depends(get_candidate_pool)
+):
+    """
+    Same analysis as /analyze, streamed as NDJSON: one {"section", "data"} line per
+    AnalysisResponse section as soon as it is computed (score first), then
+    {"section": "done"}. Upload errors are still plain HTTP errors; failures
+    after the stream has started are reported as an {"section": "error"} line.
+    `fields` and the interview options work as for /analyze.
+    """
+    try:
+        selected = parse_fields(fields)
+        difficulty = parse_interview_difficulty(interview_difficulty)
+        resume_upload, jd_upload = await read_inputs(resume, jd_file)
+        try:
+            parsed_resume, jd_text = await parse_inputs(resume_upload, job_description, jd_upload)
+        finally:
+            # Only the extracted text is needed past this point
+            resume_upload.close()
+            if jd_upload is not None:
+                jd_upload.close()
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
 
+    async def stream():
+        if parsed_resume.status == "timeout":
+            yield _ndjson_line({"section": "parsing_failed", "data": AnalysisPipeline.parsing_failed(parsed_resume).model_dump()})
+            yield _ndjson_line({"section": "done"})
+            return
 
-        return AnalysisResponse(
-            score=scoring_result["total_score"],
-            missing_skills=scoring_result["missing_skills"],
-            present_skills=scoring_result["present_skills"],
-            recommendations=recommendations,
-            trajectory=trajectory,
-            interview_questions=interview_questions,
-            bullet_analysis=bullet_analysis,
-            market_analysis=market_analysis,
-            success_prediction=success_prediction,
-            github_analysis=None,
-            structure_analysis=structure_analysis,
-            resume_parsing_status="success"
+        sections = AnalysisPipeline.sections(
+            nlp_engine,
+            parsed_resume,
+            jd_text,
+            filename=resume_upload.filename.lower(),
+            file_size=resume_upload.size,
+            candidate_pool=candidate_pool if add_to_pool else None,
+            fields=selected,
+            interview_rotation=interview_rotation,
+            interview_difficulty=difficulty
         )
+        try:
+            # Each section is computed on the inference executor, one step at a time
+            while True:
+                item = await run_inference(next, sections, None)
+                if item is None:
+                    break
+                name, data = item
+                yield _ndjson_line({"section": name, "data": data})
+        except Exception as e:
+            print(f"Error streaming analysis: {str(e)}")
+            yield _ndjson_line({"section": "error", "detail": str(e)})
+            return
+        yield _ndjson_line({"section": "done"})
 
-    except Exception as e:
-        print(f"Error processing request: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from typing import List, Optional
+from app.models.schemas import CandidateSearchResponse
+from app.api.dependencies import get_nlp_engine, get_candidate_pool
+from app.api.uploads import close_uploads, collect_resume_uploads, parse_uploads, read_job_description
+from app.services.nlp_engine import NLPEngine
+from app.services.candidate_pool import CandidatePool
+from app.core.executors import run_inference
+
+
+router = APIRouter()
+
+@router.post("/candidates")
+async def add_candidates(
+    resumes: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    external_ids: Optional[str] = Form(None),
+    nlp_engine: NLPEngine = Depends(get_nlp_engine),
+    pool: CandidatePool = Depends(get_candidate_pool)
+):
+    """
+    Parse, embed and add resumes to the persistent candidate pool.
+    external_ids is an optional comma-separated list (one per upload, in order);
+    re-submitting an external ID replaces the pooled candidate.
+    """
+    try:
+        uploads = await collect_resume_uploads(resumes, archive)
+        try:
+            ids = None
+            if external_ids:
+                ids = [e.strip() or None for e in external_ids.split(",")]
+                if len(ids) != len(uploads):
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Got {len(ids)} external IDs for {len(uploads)} resumes."
+                    )
+            candidates = await parse_uploads(uploads)
+        finally:
+            close_uploads(uploads)
+        added = await run_inference(pool.add_documents, nlp_engine, candidates, ids)
+        return {"pool_size": len(pool.store), "candidates": added}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/candidates/search", response_model=CandidateSearchResponse)
+async def search_candidates(
+    job_description: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None),
+    k: int = Form(10, ge=1, le=100),
+    nlp_engine: NLPEngine = Depends(get_nlp_engine),
+    pool: CandidatePool = Depends(get_candidate_pool)
+):
+    """Top-k pooled resumes for a job description, served from the vector index."""
+    try:
+        jd_text = await read_job_description(job_description, jd_file)
+        if not jd_text:
+            raise HTTPException(status_code=400, detail="A job description is required for search.")
+        results = await run_inference(pool.search_text, nlp_engine, jd_text, k)
+        return {"pool_size": len(pool.store), "results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/candidates/{candidate_id}")
+async def remove_candidate(
+    candidate_id: str,
+    pool: CandidatePool = Depends(get_candidate_pool)
+):
+    """Remove a pooled candidate by external ID, or by numeric pool ID."""
+    removed = await run_inference(pool.remove, None, [candidate_id])
+    if not removed and candidate_id.isdigit():
+        removed = await run_inference(pool.remove, [int(candidate_id)])
+    if not removed:
+        raise HTTPException(status_code=404, detail="Candidate not found.")
+    return {"removed": removed, "pool_size": len(pool.store)}
+
+
+@router.get("/candidates/stats")
+def candidate_stats(pool: CandidatePool = Depends(get_candidate_pool)):
+    return pool.stats()
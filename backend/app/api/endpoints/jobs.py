@@ -0,0 +1,191 @@
+import asyncio
+import time
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Request
+from typing import List, Optional, Tuple
+from app.models.schemas import JobStatus
+from app.api.dependencies import get_nlp_engine, get_candidate_pool, get_job_queue
+from app.api.endpoints.analyze import analyze_content, parse_fields, parse_interview_difficulty
+from app.api.endpoints.rank import rank_uploads
+from app.api.uploads import (
+    SpooledUpload, close_uploads, gather_resume_uploads, parse_job_description, read_resume_uploads, read_upload_bytes
+)
+from app.services.job_queue import JobQueue, PermanentJobError
+from app.core.config import settings
+from app.core.executors import run_inference
+
+
+router = APIRouter()
+
+# Long-poll re-check interval
+_POLL_SECONDS = 0.25
+# Job file field for resumes over the extraction limit: stored without content and
+# reported as "too_large" in the ranking, the same way POST /rank reports them
+_TOO_LARGE_FIELD = "too_large"
+# Accepted priority range; 0 is normal, higher runs first
+_MAX_PRIORITY = 10
+
+
+def _file(files: List[Tuple[str, str, bytes]], field: str) -> Optional[Tuple[str, bytes]]:
+    for name, filename, content in files:
+        if name == field:
+            return filename, content
+    return None
+
+
+async def run_analyze_job(params: dict, files: List[Tuple[str, str, bytes]]) -> dict:
+    """Background counterpart of POST /analyze."""
+    resume = SpooledUpload.from_bytes(*_file(files, "resume"))
+    jd = _file(files, "jd_file")
+    nlp_engine = await run_inference(get_nlp_engine)
+    candidate_pool = await run_inference(get_candidate_pool) if params.get("add_to_pool") else None
+    try:
+        response = await analyze_content(
+            nlp_engine,
+            resume,
+            job_description=params.get("job_description"),
+            jd=SpooledUpload.from_bytes(*jd) if jd else None,
+            candidate_pool=candidate_pool,
+            fields=params.get("fields"),
+            interview_rotation=params.get("interview_rotation", 0),
+            interview_difficulty=params.get("interview_difficulty")
+        )
+    except HTTPException as e:
+        # Unreadable or oversized uploads fail the same way on every attempt
+        raise PermanentJobError(e.detail)
+    return response.model_dump()
+
+
+async def run_rank_job(params: dict, files: List[Tuple[str, str, bytes]]) -> dict:
+    """Background counterpart of POST /rank."""
+    archive = _file(files, "archive")
+    jd = _file(files, "jd_file")
+    try:
+        uploads = await asyncio.to_thread(
+            gather_resume_uploads,
+            [
+                (filename, SpooledUpload.from_bytes(filename, content) if field == "resumes" else None)
+                for field, filename, content in files if field in ("resumes", _TOO_LARGE_FIELD)
+            ],
+            archive[1] if archive else None
+        )
+    except HTTPException as e:
+        raise PermanentJobError(e.detail)
+    try:
+        jd_text = await parse_job_description(
+            params.get("job_description"), SpooledUpload.from_bytes(*jd) if jd else None
+        )
+        if not jd_text:
+            raise HTTPException(status_code=400, detail="A job description is required for ranking.")
+    except HTTPException as e:
+        close_uploads(uploads)
+        raise PermanentJobError(e.detail)
+    nlp_engine = await run_inference(get_nlp_engine)
+    return await rank_uploads(
+        nlp_engine, uploads, jd_text, params.get("include_details", False), params.get("top_k")
+    )
+
+
+JOB_HANDLERS = {"analyze": run_analyze_job, "rank": run_rank_job}
+
+
+async def _submit(request: Request, queue: JobQueue, kind: str, params: dict, files: list, priority: int) -> dict:
+    job_id = await asyncio.to_thread(queue.submit, kind, params, files, priority)
+    workers = getattr(request.app.state, "job_workers", None)
+    if workers is not None:
+        workers.notify()
+    return await asyncio.to_thread(queue.get, job_id)
+
+
+@router.post("/jobs/analyze", response_model=JobStatus, status_code=202)
+async def submit_analyze_job(
+    request: Request,
+    resume: UploadFile = File(...),
+    job_description: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None),
+    add_to_pool: bool = Form(False),
+    fields: Optional[str] = Form(None),
+    interview_rotation: int = Form(0, ge=0),
+    interview_difficulty: Optional[str] = Form(None),
+    priority: int = Form(0, ge=-_MAX_PRIORITY, le=_MAX_PRIORITY),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """
+    Queue a resume analysis and return its job immediately (202).
+    Takes the same fields as /analyze plus a priority from -10 to 10
+    (higher runs first); poll GET /jobs/{job_id} for the result.
+    """
+    try:
+        params = {
+            "job_description": job_description,
+            "add_to_pool": add_to_pool,
+            "fields": parse_fields(fields),
+            "interview_rotation": interview_rotation,
+            "interview_difficulty": parse_interview_difficulty(interview_difficulty)
+        }
+        files = [("resume", resume.filename or "", await read_upload_bytes(resume, settings.parse_max_bytes))]
+        if jd_file:
+            files.append(("jd_file", jd_file.filename or "", await read_upload_bytes(jd_file, settings.parse_max_bytes)))
+        return await _submit(request, queue, "analyze", params, files, priority)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error submitting job: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/jobs/rank", response_model=JobStatus, status_code=202)
+async def submit_rank_job(
+    request: Request,
+    resumes: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    job_description: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None),
+    include_details: bool = Form(False),
+    top_k: Optional[int] = Form(None, ge=1),
+    priority: int = Form(0, ge=-_MAX_PRIORITY, le=_MAX_PRIORITY),
+    queue: JobQueue = Depends(get_job_queue)
+):
+    """Queue a batch ranking (same fields as /rank plus a priority, as for /jobs/analyze) and return its job immediately (202)."""
+    try:
+        if not resumes and archive is None:
+            raise HTTPException(status_code=400, detail="No resumes provided.")
+        if not job_description and jd_file is None:
+            raise HTTPException(status_code=400, detail="A job description is required for ranking.")
+
+        params = {"job_description": job_description, "include_details": include_details, "top_k": top_k}
+        files = []
+        uploads = await read_resume_uploads(resumes)
+        try:
+            for name, upload in uploads:
+                files.append(("resumes", name, upload.read()) if upload is not None else (_TOO_LARGE_FIELD, name, b""))
+        finally:
+            close_uploads(uploads)
+        if archive is not None:
+            files.append(("archive", archive.filename or "archive.zip", await read_upload_bytes(archive)))
+        if jd_file:
+            files.append(("jd_file", jd_file.filename or "", await read_upload_bytes(jd_file, settings.parse_max_bytes)))
+        return await _submit(request, queue, "rank", params, files, priority)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error submitting job: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str, wait: float = 0, queue: JobQueue = Depends(get_job_queue)):
+    """
+    Job state and, once finished, its result or error.
+    With wait > 0 the request long-polls for up to that many seconds
+    (capped by JOB_MAX_WAIT_SECONDS) until the job finishes.
+    """
+    deadline = time.monotonic() + min(max(wait, 0), settings.job_max_wait_seconds)
+    while True:
+        job = await asyncio.to_thread(queue.get, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found (unknown or expired).")
+        if job["status"] in ("succeeded", "failed") or time.monotonic() >= deadline:
+            return job
+        await asyncio.sleep(_POLL_SECONDS)
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException
+from typing import List, Optional
+from app.models.schemas import RankResponse
+from app.api.dependencies import get_nlp_engine
+from app.api.uploads import Uploads, close_uploads, collect_resume_uploads, parse_uploads, read_job_description
+from app.services.nlp_engine import NLPEngine
+from app.services.ranking import CandidateRanker
+from app.core.executors import run_inference
+
+
+router = APIRouter()
+
+
+async def rank_uploads(
+    nlp_engine: NLPEngine,
+    uploads: Uploads,
+    jd_text: str,
+    include_details: bool = False,
+    top_k: Optional[int] = None
+) -> dict:
+    """Parse and rank collected uploads; shared by /rank and background rank jobs."""
+    # 3. Parse all resumes in parallel (bounded by the extraction pool)
+    candidates = await parse_uploads(uploads)
+
+    # 4. Batched embedding + vectorized scoring
+    ranking = await run_inference(
+        CandidateRanker.rank,
+        nlp_engine=nlp_engine,
+        candidates=candidates,
+        jd_text=jd_text,
+        include_details=include_details
+    )
+    if top_k is not None:
+        ranking["results"] = ranking["results"][:top_k]
+    return ranking
+
+
+@router.post("/rank", response_model=RankResponse)
+async def rank_resumes(
+    resumes: Optional[List[UploadFile]] = File(None),
+    archive: Optional[UploadFile] = File(None),
+    job_description: Optional[str] = Form(None),
+    jd_file: Optional[UploadFile] = File(None),
+    include_details: bool = Form(False),
+    top_k: Optional[int] = Form(None, ge=1),
+    nlp_engine: NLPEngine = Depends(get_nlp_engine)
+):
+    """
+    Score many resumes against one job description.
+    Resumes arrive as repeated `resumes` files and/or a zip `archive`.
+    """
+    try:
+        # 1. Collect uploads
+        uploads = await collect_resume_uploads(resumes, archive)
+        try:
+            # 2. Job Description (Text or File)
+            jd_text = await read_job_description(job_description, jd_file)
+            if not jd_text:
+                raise HTTPException(status_code=400, detail="A job description is required for ranking.")
+
+            return await rank_uploads(nlp_engine, uploads, jd_text, include_details, top_k)
+        finally:
+            close_uploads(uploads)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error processing request: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,304 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import zipfile
+from dataclasses import dataclass
+from fastapi import UploadFile, HTTPException
+from typing import List, Optional, Tuple
+from app.services.parser import DocumentSource, ResumeParser, ParsedDocument
+from app.core.body_limit import format_limit
+from app.core.config import settings
+from app.core.metrics import stage, PARSE_STATUS
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".txt")
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Small members legitimately compress very well; only larger ones are ratio-checked
+ARCHIVE_RATIO_MIN_BYTES = 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """
+    An upload read in bounded chunks. Small files stay in memory; larger ones
+    are spooled to a temp file and handed to the parser by path. The SHA-256
+    digest is taken while reading so the parse cache never rehashes the bytes.
+    """
+    filename: str
+    size: int
+    digest: str
+    content: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @classmethod
+    def from_bytes(cls, filename: str, content: bytes) -> "SpooledUpload":
+        return cls(filename, len(content), hashlib.sha256(content).hexdigest(), content=content)
+
+    @property
+    def source(self) -> DocumentSource:
+        return self.path if self.path is not None else self.content
+
+    def read(self) -> bytes:
+        if self.path is None:
+            return self.content
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self):
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+# (filename, upload) pairs for a batch; None marks a file over the extraction limit
+Uploads = List[Tuple[str, Optional[SpooledUpload]]]
+
+
+class _Spooler:
+    """Collects chunks in memory and moves them to a temp file once they pass spool_bytes."""
+
+    def __init__(self, filename: str, spool_bytes: int):
+        self.filename = filename
+        self.spool_bytes = spool_bytes
+        self.digest = hashlib.sha256()
+        self.buffer = bytearray()
+        self.size = 0
+        self.spool = None
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        self.digest.update(chunk)
+        if self.spool is None and self.size > self.spool_bytes:
+            self.spool = tempfile.NamedTemporaryFile(
+                prefix="upload-", suffix=os.path.splitext(self.filename)[1], dir=settings.upload_spool_dir, delete=False
+            )
+            self.spool.write(self.buffer)
+            self.buffer = None
+        if self.spool is not None:
+            self.spool.write(chunk)
+        else:
+            self.buffer.extend(chunk)
+
+    def finish(self) -> SpooledUpload:
+        if self.spool is not None:
+            self.spool.close()
+            return SpooledUpload(self.filename, self.size, self.digest.hexdigest(), path=self.spool.name)
+        return SpooledUpload(self.filename, self.size, self.digest.hexdigest(), content=bytes(self.buffer))
+
+    def discard(self):
+        if self.spool is not None:
+            self.spool.close()
+            os.unlink(self.spool.name)
+            self.spool = None
+
+
+async def read_upload(upload: UploadFile, max_bytes: int = 0, spool_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Read an upload chunk by chunk, rejecting it with 413 as soon as it passes
+    max_bytes (0 = no limit) and moving it to a temp file once it passes
+    spool_bytes. The caller closes the result to remove any temp file.
+    """
+    filename = upload.filename or ""
+    spooler = _Spooler(filename, settings.upload_spool_bytes if spool_bytes is None else spool_bytes)
+    try:
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            if max_bytes and spooler.size + len(chunk) > max_bytes:
+                raise HTTPException(
+                    status_code=413,
+                    detail=f"{filename or 'Upload'} exceeds the {format_limit(max_bytes)} upload limit."
+                )
+            spooler.write(chunk)
+    except BaseException:
+        spooler.discard()
+        raise
+    return spooler.finish()
+
+
+async def read_upload_bytes(upload: UploadFile, max_bytes: int = 0) -> bytes:
+    """Bounded read of a whole upload into memory (413 past max_bytes)."""
+    spooled = await read_upload(upload, max_bytes)
+    try:
+        return spooled.read()
+    finally:
+        spooled.close()
+
+
+def _spool_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> SpooledUpload:
+    """Stream one archive member into a SpooledUpload instead of inflating it whole."""
+    spooler = _Spooler(info.filename, settings.upload_spool_bytes)
+    try:
+        # zipfile stops at the declared file_size, so this reads at most what was checked
+        with zf.open(info) as member:
+            while True:
+                chunk = member.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                spooler.write(chunk)
+    except BaseException:
+        spooler.discard()
+        raise
+    return spooler.finish()
+
+
+def read_archive(archive: DocumentSource) -> Uploads:
+    """
+    Pull supported resume files out of a zip archive (bytes or a spooled file path),
+    skipping folders and OS metadata. Members are streamed into spooled uploads.
+    Members over the extraction byte limit are returned with None content, unread.
+    Archives that expand past ARCHIVE_MAX_BYTES in total (413) or hold a large
+    member with a zip-bomb compression ratio (400) are rejected before inflating.
+    """
+    files: Uploads = []
+    total = 0
+    try:
+        with ResumeParser.open_source(archive) as f, zipfile.ZipFile(f) as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if info.is_dir() or name.startswith("__MACOSX/") or os.path.basename(name).startswith("."):
+                    continue
+                if not name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    continue
+                if settings.parse_max_bytes and info.file_size > settings.parse_max_bytes:
+                    files.append((name, None))
+                    continue
+                if (
+                    settings.archive_max_compression_ratio
+                    and info.file_size > ARCHIVE_RATIO_MIN_BYTES
+                    and info.file_size > settings.archive_max_compression_ratio * max(info.compress_size, 1)
+                ):
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Archive member {name} has a suspicious compression ratio."
+                    )
+                total += info.file_size
+                if settings.archive_max_bytes and total > settings.archive_max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Archive expands beyond the {format_limit(settings.archive_max_bytes)} limit."
+                    )
+                files.append((name, _spool_member(zf, info)))
+    except BaseException:
+        close_uploads(files)
+        raise
+    return files
+
+
+async def read_resume_uploads(resumes: Optional[List[UploadFile]]) -> Uploads:
+    """Read repeated resume file fields; files over the extraction limit come back as None, unread."""
+    files: Uploads = []
+    try:
+        for upload in resumes or []:
+            name = upload.filename or f"resume_{len(files) + 1}"
+            try:
+                files.append((name, await read_upload(upload, settings.parse_max_bytes)))
+            except HTTPException as e:
+                if e.status_code != 413:
+                    raise
+                files.append((name, None))
+    except BaseException:
+        close_uploads(files)
+        raise
+    return files
+
+
+async def collect_resume_uploads(
+    resumes: Optional[List[UploadFile]],
+    archive: Optional[UploadFile]
+) -> Uploads:
+    """
+    Gather (filename, upload) pairs from repeated file fields and/or a zip archive.
+    Files over the extraction limit are not read past it and come back as None.
+    The caller closes the uploads (parse_uploads does) to remove spool files.
+    """
+    files = await read_resume_uploads(resumes)
+    try:
+        if archive is None:
+            return gather_resume_uploads(files)
+        # The archive is opened from its spool file rather than loaded into memory
+        spooled_archive = await read_upload(archive)
+        try:
+            return await asyncio.to_thread(gather_resume_uploads, files, spooled_archive.source)
+        finally:
+            spooled_archive.close()
+    except BaseException:
+        close_uploads(files)
+        raise
+
+
+def gather_resume_uploads(files: Uploads, archive: Optional[DocumentSource] = None) -> Uploads:
+    """Combine already-read resume files with the members of a zip archive and check the batch limit."""
+    uploads: Uploads = list(files)
+    if archive is not None:
+        try:
+            uploads.extend(read_archive(archive))
+        except zipfile.BadZipFile:
+            raise HTTPException(status_code=400, detail="Archive is not a valid zip file.")
+
+    if not uploads:
+        raise HTTPException(status_code=400, detail="No resumes provided.")
+    if len(uploads) > settings.rank_max_resumes:
+        close_uploads(uploads)
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many resumes: {len(uploads)} (limit {settings.rank_max_resumes})."
+        )
+    return uploads
+
+
+def close_uploads(uploads: Uploads):
+    """Remove the spool files of a batch; safe to call more than once."""
+    for _, upload in uploads:
+        if upload is not None:
+            upload.close()
+
+
+async def _parse_one(name: str, upload: Optional[SpooledUpload], slots: asyncio.Semaphore) -> Tuple[str, ParsedDocument]:
+    if upload is None:
+        return name, ParsedDocument(text="", status="too_large", detail="File exceeds the extraction limit.")
+    try:
+        async with slots:
+            return name, await ResumeParser.parse_upload_async(upload.source, name, digest=upload.digest)
+    finally:
+        upload.close()
+
+
+async def parse_uploads(uploads: Uploads) -> List[Tuple[str, ParsedDocument]]:
+    """
+    Parse uploads concurrently, at most one per extraction worker at a time so
+    no document waits in the pool queue against its own timeout. Each upload
+    is closed once parsed.
+    """
+    slots = asyncio.Semaphore(max(1, settings.parse_workers))
+    try:
+        with stage("parse_resumes"):
+            parsed = list(await asyncio.gather(*(_parse_one(name, upload, slots) for name, upload in uploads)))
+    finally:
+        close_uploads(uploads)
+    for _, doc in parsed:
+        PARSE_STATUS.inc(status=doc.status)
+    return parsed
+
+
+async def read_job_description(job_description: Optional[str], jd_file: Optional[UploadFile]) -> str:
+    """JD text from an uploaded file, falling back to the form field."""
+    if jd_file:
+        jd = await read_upload(jd_file, settings.parse_max_bytes)
+        try:
+            return await parse_job_description(job_description, jd)
+        finally:
+            jd.close()
+    return job_description or ""
+
+
+async def parse_job_description(job_description: Optional[str], jd: Optional[SpooledUpload]) -> str:
+    """JD text from an already-read upload, falling back to the form field."""
+    if jd is not None:
+        with stage("parse_jd"):
+            return (await ResumeParser.parse_upload_async(jd.source, jd.filename, digest=jd.digest)).text
+    return job_description or ""
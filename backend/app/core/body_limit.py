@@ -0,0 +1,56 @@
+from typing import Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+
+def format_limit(max_bytes: int) -> str:
+    if max_bytes >= 1024 * 1024:
+        return f"{max_bytes / (1024 * 1024):.0f} MB"
+    return f"{max_bytes / 1024:.0f} KB"
+
+
+class BodySizeLimitMiddleware:
+    """
+    Rejects request bodies over a size limit with 413 before they are buffered.
+
+    A declared Content-Length over the limit is refused without reading the
+    body at all. Bodies without one (chunked transfer) are counted as they
+    arrive and cut off as soon as they pass the limit, before form parsing
+    spools them. Limits can be set per path; 0 disables the check.
+    """
+
+    def __init__(self, app, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.path_limits.get(scope["path"], self.max_bytes)
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body exceeds the {format_limit(limit)} limit."
+        content_length = dict(scope["headers"]).get(b"content-length", b"")
+        if content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse(status_code=413, content={"detail": detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Surfaces through FastAPI's body parsing as a plain 413 response
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,147 @@
+import os
+from typing import Optional
+
+
+def _env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    value = os.getenv(name)
+    return value if value not in (None, "") else default
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    try:
+        return int(value) if value not in (None, "") else default
+    except ValueError:
+        print(f"Invalid integer for {name}: {value!r}. Using {default}.")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    try:
+        return float(value) if value not in (None, "") else default
+    except ValueError:
+        print(f"Invalid number for {name}: {value!r}. Using {default}.")
+        return default
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+class Settings:
+    """Runtime configuration, read once from environment variables."""
+
+    def __init__(self):
+        # Startup: load and warm models in the lifespan instead of on the first request
+        self.preload_models = _env_bool("PRELOAD_MODELS", True)
+
+        # Observability: add a Server-Timing header with per-stage durations to every response
+        self.server_timing = _env_bool("SERVER_TIMING", False)
+
+        # Embeddings
+        self.embedding_model = _env_str("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+        # Encoder backend: "torch" | "torch-int8" | "onnx" | "onnx-int8" (see services/encoders.py)
+        self.encoder_backend = _env_str("ENCODER_BACKEND", "torch")
+        self.encoder_export_dir = _env_str("ENCODER_EXPORT_DIR", "data/encoders")
+        # ONNX int8 quantization target: "avx2" | "avx512" | "avx512_vnni" | "arm64"
+        self.encoder_quantization = _env_str("ENCODER_QUANTIZATION", "avx2")
+        self.embedding_cache_max_bytes = _env_int("EMBEDDING_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+        # Directory for the persistent (memory-mapped) embedding tier; disabled when unset
+        self.embedding_cache_dir = _env_str("EMBEDDING_CACHE_DIR")
+        # Read-only workers share a cache directory populated by another process
+        self.embedding_cache_read_only = _env_bool("EMBEDDING_CACHE_READ_ONLY", False)
+        # The persistent tier keeps its newest half once its vectors pass this size (0 = unbounded)
+        self.embedding_cache_max_disk_bytes = _env_int("EMBEDDING_CACHE_MAX_DISK_BYTES", 1024 * 1024 * 1024)
+        # "full" embeds the whole document (the encoder truncates at its max sequence length);
+        # "chunked" embeds overlapping word windows and pools their similarities.
+        self.embedding_mode = _env_str("EMBEDDING_MODE", "full")
+        # Chunk pooling: "mean" | "max" | "topk"
+        self.chunk_pooling = _env_str("CHUNK_POOLING", "max")
+        self.chunk_top_k = _env_int("CHUNK_TOP_K", 3)
+        # all-MiniLM-L6-v2 truncates at 256 word pieces; 150 words stays under that for typical prose
+        self.chunk_max_words = _env_int("CHUNK_MAX_WORDS", 150)
+        self.chunk_overlap_words = _env_int("CHUNK_OVERLAP_WORDS", 30)
+
+        # Skills: JSON ontology replacing the built-in one (see services/skill_ontology.py)
+        self.skill_ontology_path = _env_str("SKILL_ONTOLOGY_PATH")
+        # Interview question bank replacing the built-in app/data/question_bank.json
+        self.question_bank_path = _env_str("QUESTION_BANK_PATH")
+
+        # Market data: columnar JSON dataset replacing the built-in app/data/market_data.json
+        self.market_data_path = _env_str("MARKET_DATA_PATH")
+        # Region whose salaries are reported (falls back to the dataset's default region)
+        self.market_region = _env_str("MARKET_REGION")
+        # Role centroids from scripts/build_role_centroids.py, used when no role keyword matches
+        self.market_role_centroids_path = _env_str("MARKET_ROLE_CENTROIDS_PATH")
+        self.market_role_min_similarity = _env_float("MARKET_ROLE_MIN_SIMILARITY", 0.4)
+
+        # Parsing
+        self.parse_cache_max_bytes = _env_int("PARSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)
+
+        # Executors: CPU-bound stages run off the event loop.
+        # "process" | "thread" | "inline" for parsing, "thread" | "inline" for model inference.
+        # Only "process" can enforce the hard parse timeout (threads cannot be killed).
+        self.parse_executor = _env_str("PARSE_EXECUTOR", "process")
+        self.parse_workers = _env_int("PARSE_WORKERS", min(4, os.cpu_count() or 1))
+        self.inference_executor = _env_str("INFERENCE_EXECUTOR", "thread")
+        self.inference_workers = _env_int("INFERENCE_WORKERS", 2)
+
+        # Extraction budgets (per document)
+        self.parse_timeout_seconds = _env_int("PARSE_TIMEOUT_SECONDS", 15)
+        self.parse_max_pages = _env_int("PARSE_MAX_PAGES", 10)
+        self.parse_max_bytes = _env_int("PARSE_MAX_BYTES", 10 * 1024 * 1024)
+        # Parse worker processes are replaced after this many documents to cap memory growth
+        self.parse_worker_max_tasks = _env_int("PARSE_WORKER_MAX_TASKS", 50)
+
+        # Upload ingestion. Request bodies over these sizes are rejected with 413 before they
+        # are read (by Content-Length, or while streaming when the length is not declared).
+        # Analyze requests carry a resume and at most one JD file, each up to PARSE_MAX_BYTES.
+        self.analyze_max_request_bytes = _env_int(
+            "ANALYZE_MAX_REQUEST_BYTES", 2 * self.parse_max_bytes + 1024 * 1024
+        )
+        self.upload_max_request_bytes = _env_int("UPLOAD_MAX_REQUEST_BYTES", 256 * 1024 * 1024)
+        # Uploads larger than this are spooled to a temp file and parsed from its path
+        self.upload_spool_bytes = _env_int("UPLOAD_SPOOL_BYTES", 1024 * 1024)
+        # Temp directory for spooled uploads (system default when unset)
+        self.upload_spool_dir = _env_str("UPLOAD_SPOOL_DIR")
+        # Zip archives: cap on the total uncompressed size of their resumes, and on the
+        # uncompressed/compressed ratio of any member over 1 MB (0 disables either check)
+        self.archive_max_bytes = _env_int("ARCHIVE_MAX_BYTES", 512 * 1024 * 1024)
+        self.archive_max_compression_ratio = _env_int("ARCHIVE_MAX_COMPRESSION_RATIO", 100)
+
+        # Batch ranking
+        self.rank_max_resumes = _env_int("RANK_MAX_RESUMES", 2000)
+        self.embedding_batch_size = _env_int("EMBEDDING_BATCH_SIZE", 64)
+
+        # Candidate pool (FAISS). Index type: "flat" | "ivf" | "hnsw"
+        self.candidate_index_path = _env_str("CANDIDATE_INDEX_PATH", "data/candidates.faiss")
+        self.candidate_index_type = _env_str("CANDIDATE_INDEX_TYPE", "flat")
+        self.candidate_ivf_nlist = _env_int("CANDIDATE_IVF_NLIST", 1024)
+        self.candidate_ivf_nprobe = _env_int("CANDIDATE_IVF_NPROBE", 16)
+        self.candidate_hnsw_m = _env_int("CANDIDATE_HNSW_M", 32)
+        self.candidate_hnsw_ef_search = _env_int("CANDIDATE_HNSW_EF_SEARCH", 64)
+        # Persist the index after this many additions (and always on shutdown)
+        self.candidate_save_every = _env_int("CANDIDATE_SAVE_EVERY", 50)
+
+        # Background jobs (SQLite queue drained by in-process workers)
+        self.job_queue_path = _env_str("JOB_QUEUE_PATH", "data/jobs.sqlite")
+        self.job_workers = _env_int("JOB_WORKERS", 2)
+        self.job_max_attempts = _env_int("JOB_MAX_ATTEMPTS", 3)
+        # Retry delay doubles per attempt: backoff, 2 x backoff, 4 x backoff, ...
+        self.job_retry_backoff_seconds = _env_int("JOB_RETRY_BACKOFF_SECONDS", 2)
+        # Finished jobs (and their results) are kept this long
+        self.job_result_ttl_seconds = _env_int("JOB_RESULT_TTL_SECONDS", 3600)
+        # A running job's lease lapses this long after its last heartbeat; the job is then
+        # re-queued (counting as an attempt) even if another process had claimed it
+        self.job_lease_seconds = _env_int("JOB_LEASE_SECONDS", 60)
+        # Jobs still running after this long fail without retries (0 = no limit)
+        self.job_timeout_seconds = _env_int("JOB_TIMEOUT_SECONDS", 600)
+        # Upper bound for long-polling GET /api/jobs/{id}?wait=...
+        self.job_max_wait_seconds = _env_int("JOB_MAX_WAIT_SECONDS", 30)
+
+
+settings = Settings()
@@ -0,0 +1,79 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from app.core.config import settings
+
+_lock = threading.Lock()
+_inference_executor: Optional[Executor] = None
+_parse_executor: Optional[Executor] = None
+
+
+def get_inference_executor() -> Optional[Executor]:
+    """
+    Thread pool for spaCy / SentenceTransformer work.
+    Torch releases the GIL inside its kernels, so threads give real parallelism
+    there while sharing one copy of the loaded models. None means run inline.
+    """
+    global _inference_executor
+    if settings.inference_executor == "inline":
+        return None
+    with _lock:
+        if _inference_executor is None:
+            _inference_executor = ThreadPoolExecutor(
+                max_workers=settings.inference_workers,
+                thread_name_prefix="inference"
+            )
+        return _inference_executor
+
+
+def get_parse_executor() -> Optional[Executor]:
+    """
+    Thread pool for document parsing when PARSE_EXECUTOR=thread.
+    The default "process" mode is served by ExtractionService, which owns its
+    own recycled, killable worker processes. None means run inline.
+    """
+    global _parse_executor
+    if settings.parse_executor != "thread":
+        return None
+    with _lock:
+        if _parse_executor is None:
+            _parse_executor = ThreadPoolExecutor(
+                max_workers=settings.parse_workers,
+                thread_name_prefix="parse"
+            )
+        return _parse_executor
+
+
+async def _run(executor: Optional[Executor], fn: Callable, *args, **kwargs):
+    if executor is None:
+        return fn(*args, **kwargs)
+    loop = asyncio.get_running_loop()
+    call = functools.partial(fn, *args, **kwargs)
+    if isinstance(executor, ThreadPoolExecutor):
+        # Carry request-scoped context variables into the worker thread
+        call = functools.partial(contextvars.copy_context().run, call)
+    return await loop.run_in_executor(executor, call)
+
+
+async def run_inference(fn: Callable, *args, **kwargs):
+    """Run a model-bound function without blocking the event loop."""
+    return await _run(get_inference_executor(), fn, *args, **kwargs)
+
+
+async def run_parsing(fn: Callable, *args, **kwargs):
+    """Run a parsing function without blocking the event loop."""
+    return await _run(get_parse_executor(), fn, *args, **kwargs)
+
+
+def shutdown_executors(wait: bool = True):
+    global _inference_executor, _parse_executor
+    with _lock:
+        for executor in (_inference_executor, _parse_executor):
+            if executor is not None:
+                executor.shutdown(wait=wait, cancel_futures=True)
+        _inference_executor = None
+        _parse_executor = None
@@ -0,0 +1,71 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class Readiness:
+    """
+    Load state of everything the app needs before it can serve traffic.
+    Each component moves pending -> loading -> warming -> ready (or failed),
+    with load and warmup timings recorded along the way.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components: Dict[str, Dict] = {}
+
+    def register(self, *names: str):
+        with self._lock:
+            for name in names:
+                self._components[name] = {
+                    "state": "pending",
+                    "load_seconds": None,
+                    "warmup_seconds": None,
+                    "error": None
+                }
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self._components.setdefault(name, {
+                "state": "pending", "load_seconds": None, "warmup_seconds": None, "error": None
+            }).update(fields)
+
+    def record(self, name: str, phase: str, seconds: float):
+        """Record a timing measured elsewhere (phase is "load" or "warmup")."""
+        self._update(name, **{f"{phase}_seconds": round(seconds, 3)})
+
+    @contextmanager
+    def track(self, name: str, phase: str = "load"):
+        """Time a load/warmup step; a failure marks the component failed and re-raises."""
+        self._update(name, state="loading" if phase == "load" else "warming")
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self._update(name, state="failed", error=str(e))
+            raise
+        self.record(name, phase, time.perf_counter() - start)
+
+    def mark_ready(self, *names: str):
+        for name in names:
+            self._update(name, state="ready")
+
+    def fail(self, name: str, error: str):
+        self._update(name, state="failed", error=error)
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return all(c["state"] == "ready" for c in self._components.values())
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            components = {name: dict(c) for name, c in self._components.items()}
+        return {
+            "ready": all(c["state"] == "ready" for c in components.values()),
+            "components": components
+        }
+
+
+readiness = Readiness()
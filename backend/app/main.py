@@ -1,7 +1,64 @@
-from fastapi import FastAPI
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.config import settings
+from app.core.executors import shutdown_executors
+from app.core.readiness import readiness
+from app.core.metrics import (
+    registry, start_request_timings, server_timing_header,
+    REQUEST_SECONDS, REQUESTS, REQUEST_BYTES
+)
+from app.services.extraction_service import get_extraction_service
+from app.services.parser import ResumeParser
+from app.services.job_queue import JOB_STATES, JobWorkers
+from app.api.dependencies import (
+    get_nlp_engine, get_candidate_pool, get_job_queue,
+    nlp_engine_loaded, candidate_pool_loaded, job_queue_loaded, preload_models, register_readiness
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models load in the background: /health answers immediately while
+    # /ready stays 503 until everything is loaded and warmed
+    register_readiness()
+    preload = asyncio.create_task(preload_models()) if settings.preload_models else None
+    # Background job workers drain the persistent queue, including jobs left from a previous run
+    job_workers = None
+    if settings.job_workers > 0:
+        job_workers = JobWorkers(
+            get_job_queue(), jobs.JOB_HANDLERS,
+            workers=settings.job_workers, job_timeout=settings.job_timeout_seconds
+        )
+        job_workers.start()
+    app.state.job_workers = job_workers
+    yield
+    if preload is not None and not preload.done():
+        preload.cancel()
+    if job_workers is not None:
+        await job_workers.stop()
+    # Let in-flight parse/inference jobs finish, then release pool workers
+    shutdown_executors()
+    get_extraction_service().shutdown()
+    if candidate_pool_loaded():
+        get_candidate_pool().save()
 
-app = FastAPI(title="Resume-Job Match Analyzer", version="1.0.0")
+
+app = FastAPI(title="Resume-Job Match Analyzer", version="1.0.0", lifespan=lifespan)
+
+# Oversized bodies are refused before they are read; analyze requests get a tighter bound
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.upload_max_request_bytes,
+    path_limits={
+        path: settings.analyze_max_request_bytes
+        for path in ("/api/analyze", "/api/analyze/stream", "/api/jobs/analyze")
+    }
+)
 
 # CORS Middleware
 app.add_middleware(
@@ -12,14 +69,128 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-from app.api.endpoints import analyze
+def _route_label(request: Request) -> str:
+    """Route template for metric labels (e.g. /api/candidates/{candidate_id}), never the raw path."""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Routes of included routers may carry their path without the router prefix
+    rendered = route.path_format.format(**request.path_params)
+    path = request.url.path
+    prefix = path[:-len(rendered)] if rendered and path.endswith(rendered) else ""
+    return prefix + route.path
+
+
+# Responses whose body is produced while it streams (e.g. /api/analyze/stream)
+STREAMED_MEDIA_TYPES = ("application/x-ndjson", "text/event-stream")
+
+
+@app.middleware("http")
+async def observe_requests(request: Request, call_next):
+    """
+    Request latency/size metrics, plus an optional Server-Timing header of stage durations.
+    Latency is observed once the body has been sent, so streamed responses count
+    the whole stream. Their headers leave before the body, so their Server-Timing
+    covers only the time to headers (reported as "headers" instead of "total").
+    """
+    timings = start_request_timings()
+    start = time.perf_counter()
+    response = await call_next(request)
+    elapsed = time.perf_counter() - start
+
+    route = _route_label(request)
+    REQUESTS.inc(method=request.method, route=route, status=str(response.status_code))
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit():
+        REQUEST_BYTES.observe(int(content_length), route=route)
+
+    if settings.server_timing:
+        streamed = response.headers.get("content-type", "").split(";")[0] in STREAMED_MEDIA_TYPES
+        response.headers["Server-Timing"] = server_timing_header(
+            timings + [("headers" if streamed else "total", elapsed)]
+        )
+
+    body = response.body_iterator
+
+    async def observed_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - start, method=request.method, route=route)
+
+    response.body_iterator = observed_body()
+    return response
+
+
+def _cache_metrics():
+    """Cache and worker counters that the services already keep, read at scrape time."""
+    families = []
+
+    def add(name, kind, documentation, stats, key, labels=None):
+        families.append((name, kind, documentation, [(labels or {}, stats[key])]))
+
+    parse = ResumeParser.cache.stats()
+    add("parse_cache_hits_total", "counter", "Parse cache hits.", parse, "hits")
+    add("parse_cache_misses_total", "counter", "Parse cache misses.", parse, "misses")
+    add("parse_cache_evictions_total", "counter", "Parse cache evictions.", parse, "evictions")
+    add("parse_cache_bytes", "gauge", "Text held by the parse cache.", parse, "bytes")
+
+    extraction = get_extraction_service().stats()
+    add("parse_timeouts_total", "counter", "Extractions killed at the hard timeout.", extraction, "timeouts")
+    add("parse_worker_recycles_total", "counter", "Parse worker pool recycles.", extraction, "recycles")
+    add("parse_retries_total", "counter", "Extractions retried after their pool was killed.", extraction, "retries")
+
+    if nlp_engine_loaded():
+        embedding = get_nlp_engine().embedding_cache.stats()
+        families.append(("embedding_cache_hits_total", "counter", "Embedding cache hits by tier.", [
+            ({"tier": "memory"}, embedding["hits"] - embedding["disk_hits"]),
+            ({"tier": "disk"}, embedding["disk_hits"])
+        ]))
+        add("embedding_cache_misses_total", "counter", "Embedding cache misses.", embedding, "misses")
+        add("embedding_cache_evictions_total", "counter", "Embedding cache evictions.", embedding, "evictions")
+        add("embedding_cache_bytes", "gauge", "Vectors held in memory by the embedding cache.", embedding, "bytes")
+        add("embedding_cache_disk_compactions_total", "counter", "Persistent embedding tier compactions.",
+            embedding, "disk_compactions")
+
+    if candidate_pool_loaded():
+        add("candidate_pool_size", "gauge", "Candidates in the pool.", get_candidate_pool().stats(), "size")
+
+    if job_queue_loaded():
+        queue = get_job_queue().stats()
+        families.append(("job_queue_jobs", "gauge", "Background jobs by state.", [
+            ({"state": state}, queue[state]) for state in JOB_STATES
+        ]))
+        add("job_queue_oldest_age_seconds", "gauge", "Age of the oldest queued job.", queue, "oldest_queued_age")
+    return families
+
+
+registry.register_collector(_cache_metrics)
+
+from app.api.endpoints import analyze, rank, candidates, jobs
 
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(rank.router, prefix="/api", tags=["Ranking"])
+app.include_router(candidates.router, prefix="/api", tags=["Candidates"])
+app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 
 @app.get("/health")
 def health_check():
     return {"status": "healthy", "service": "resume-analyzer-backend"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(registry.expose(), media_type="text/plain; version=0.0.4")
+
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness probe: 503 until every model is loaded and warmed, with per-model
+    state and timings. With PRELOAD_MODELS=0 the models load on first use.
+    """
+    snapshot = readiness.snapshot()
+    return JSONResponse(status_code=200 if snapshot["ready"] else 503, content=snapshot)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
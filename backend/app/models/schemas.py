@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional, Optional
 
 class ResumeContent(BaseModel):
@@ -15,16 +15,67 @@ class JobDescription(BaseModel):
 class AnalysisRequest(BaseModel):
     job_description: str
 
+class InterviewQuestion(BaseModel):
+    category: str
+    skill: str
+    question: str
+    difficulty: str = Field(description=(
+        "The question's own level in the question bank: Easy, Medium or Hard; N/A for behavioral questions."
+    ))
+
 class AnalysisResponse(BaseModel):
-    score: float
-    missing_skills: List[str]
-    present_skills: List[str]
-    recommendations: List[str]
+    # Sections left out by field selection keep these empty defaults
+    score: float = 0.0
+    missing_skills: List[str] = []
+    present_skills: List[str] = []
+    recommendations: List[str] = []
     trajectory: List[dict] = []
-    interview_questions: List[dict] = []
+    interview_questions: List[InterviewQuestion] = []
     bullet_analysis: List[dict] = []
     market_analysis: dict = {}
     success_prediction: dict = {}
     github_analysis: Optional[dict] = None
     structure_analysis: dict = {}
     resume_parsing_status: str
+
+class RankedCandidate(BaseModel):
+    rank: int
+    filename: str
+    score: float
+    section_scores: dict = {}
+    missing_skills: List[str] = []
+    present_skills: List[str] = []
+    resume_parsing_status: str
+    details: Optional[dict] = None
+
+class RankResponse(BaseModel):
+    total_candidates: int
+    job_skills: List[str]
+    results: List[RankedCandidate]
+
+class CandidateMatch(BaseModel):
+    id: int
+    external_id: Optional[str] = None
+    similarity: float
+    score: float
+    missing_skills: List[str] = []
+    present_skills: List[str] = []
+    metadata: dict = {}
+
+class CandidateSearchResponse(BaseModel):
+    pool_size: int
+    results: List[CandidateMatch]
+
+class JobStatus(BaseModel):
+    job_id: str
+    kind: str
+    status: str
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = 1
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
@@ -0,0 +1,101 @@
+from functools import cached_property
+from typing import Dict, List, Optional
+import numpy as np
+
+from .parser import ResumeParser
+from .bullet_analyzer import BulletAnalyzer
+from .chunking import mean_pool, pooled_similarity
+from app.core.config import settings
+
+
+class AnalysisContext:
+    """
+    Request-scoped memo of everything derived from one resume/JD pair.
+    Each product (skills, embeddings, sections, bullets and their spaCy tags) is computed
+    on first access and reused by every service that asks for it afterwards.
+    """
+
+    def __init__(
+        self,
+        nlp_engine,
+        resume_text: str,
+        jd_text: str,
+        resume_sections: Optional[Dict[str, str]] = None
+    ):
+        self.nlp_engine = nlp_engine
+        self.resume_text = resume_text
+        self.jd_text = jd_text
+        if resume_sections is not None:
+            # Section splits already computed (and cached) by the parser
+            self.resume_sections = resume_sections
+
+    # --- Skills ---
+
+    @cached_property
+    def resume_skills(self) -> List[str]:
+        return self.nlp_engine.extract_skills(self.resume_text)
+
+    @cached_property
+    def jd_skills(self) -> List[str]:
+        return self.nlp_engine.extract_skills(self.jd_text)
+
+    # --- Embeddings ---
+
+    @cached_property
+    def chunked(self) -> bool:
+        return self.nlp_engine.chunked
+
+    @cached_property
+    def _chunk_vecs(self) -> List[np.ndarray]:
+        # Resume and JD chunks are encoded together in one batch
+        return self.nlp_engine.get_chunk_embeddings([self.resume_text, self.jd_text])
+
+    @cached_property
+    def resume_chunk_vecs(self) -> np.ndarray:
+        return self._chunk_vecs[0]
+
+    @cached_property
+    def jd_chunk_vecs(self) -> np.ndarray:
+        return self._chunk_vecs[1]
+
+    @cached_property
+    def resume_vec(self) -> np.ndarray:
+        if self.chunked:
+            return mean_pool(self.resume_chunk_vecs)
+        return self.nlp_engine.get_embedding(self.resume_text)
+
+    @cached_property
+    def jd_vec(self) -> np.ndarray:
+        if self.chunked:
+            return mean_pool(self.jd_chunk_vecs)
+        return self.nlp_engine.get_embedding(self.jd_text)
+
+    @cached_property
+    def semantic_score(self) -> float:
+        if self.chunked:
+            return pooled_similarity(
+                self.resume_chunk_vecs,
+                self.jd_chunk_vecs,
+                strategy=self.nlp_engine.chunk_pooling,
+                top_k=settings.chunk_top_k
+            )
+        return self.nlp_engine.compute_similarity(self.resume_vec, self.jd_vec)
+
+    # --- Text structure ---
+
+    @cached_property
+    def resume_sections(self) -> Dict[str, str]:
+        return ResumeParser.extract_sections(self.resume_text)
+
+    @cached_property
+    def bullets(self) -> List[str]:
+        return BulletAnalyzer.extract_bullets(self.resume_text)
+
+    @cached_property
+    def bullet_docs(self) -> List[Optional[object]]:
+        """
+        spaCy views of each bullet, tagged in one nlp.pipe batch with the parser
+        and NER disabled. The resume as a whole is never run through spaCy:
+        no response field reads its parse or entities.
+        """
+        return BulletAnalyzer.tag_bullets(self.bullets, self.nlp_engine)
@@ -0,0 +1,233 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.models.schemas import AnalysisResponse
+from app.services.analysis_context import AnalysisContext
+from app.services.parser import ParsedDocument
+from app.services.scorer import Scorer
+from app.services.interview_generator import InterviewGenerator
+from app.services.bullet_analyzer import BulletAnalyzer
+from app.services.market_data import MarketDataService
+from app.services.success_predictor import SuccessPredictor
+from app.core.metrics import stage, TEXT_LENGTH
+
+
+# Section -> (AnalysisResponse fields it fills, sections it needs computed first).
+# Listed cheapest first; this is also the order sections are computed and streamed in.
+SECTIONS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "score": (("score", "missing_skills", "present_skills"), ()),
+    "recommendations": (("recommendations", "structure_analysis"), ("score",)),
+    "market_analysis": (("market_analysis",), ()),
+    "success_prediction": (("success_prediction",), ("score", "market_analysis")),
+    "interview_questions": (("interview_questions",), ("score",)),
+    "trajectory": (("trajectory",), ("score",)),
+    "bullet_analysis": (("bullet_analysis",), ()),
+}
+FIELD_SECTIONS = {field: section for section, (fields, _) in SECTIONS.items() for field in fields}
+SELECTABLE_FIELDS = tuple(FIELD_SECTIONS)
+
+
+class AnalysisPipeline:
+    @staticmethod
+    def plan(fields: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Sections needed to produce the requested AnalysisResponse fields,
+        dependencies included, in execution order. None means every section.
+        Raises ValueError for unknown field names.
+        """
+        if fields is None:
+            return list(SECTIONS)
+        unknown = sorted(set(fields) - set(FIELD_SECTIONS))
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(SELECTABLE_FIELDS)}.")
+
+        needed = set()
+        pending = [FIELD_SECTIONS[field] for field in fields]
+        while pending:
+            section = pending.pop()
+            if section not in needed:
+                needed.add(section)
+                pending.extend(SECTIONS[section][1])
+        return [section for section in SECTIONS if section in needed]
+
+    @staticmethod
+    def run(
+        nlp_engine,
+        parsed_resume: ParsedDocument,
+        jd_text: str,
+        filename: str = "",
+        file_size: int = 0,
+        candidate_pool=None,
+        fields: Optional[Iterable[str]] = None,
+        interview_rotation: int = 0,
+        interview_difficulty: Optional[str] = None
+    ) -> AnalysisResponse:
+        """
+        Run the CPU-bound analysis stages for one resume/JD pair.
+        Synchronous by design: the API layer dispatches it to the inference executor.
+        When a CandidatePool is given, the resume is added to it using the
+        embedding and skills already computed for the analysis.
+        With `fields`, only the stages those fields depend on run; every other
+        section of the response is left empty. interview_rotation and
+        interview_difficulty are passed on to InterviewGenerator.generate_questions.
+        """
+        response = {"resume_parsing_status": parsed_resume.status}
+        for _, section in AnalysisPipeline.sections(
+            nlp_engine, parsed_resume, jd_text, filename, file_size, candidate_pool, fields,
+            interview_rotation, interview_difficulty
+        ):
+            response.update(section)
+        return AnalysisResponse(**response)
+
+    @staticmethod
+    def sections(
+        nlp_engine,
+        parsed_resume: ParsedDocument,
+        jd_text: str,
+        filename: str = "",
+        file_size: int = 0,
+        candidate_pool=None,
+        fields: Optional[Iterable[str]] = None,
+        interview_rotation: int = 0,
+        interview_difficulty: Optional[str] = None
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Yield (section name, AnalysisResponse fields) as each section is computed,
+        cheapest first, so a streaming response can show the score before the
+        trajectory and bullet stages finish. Each step is synchronous work.
+        Sections computed only as dependencies of `fields` are not yielded.
+        """
+        fields = None if fields is None else list(fields)
+        plan = AnalysisPipeline.plan(fields)
+        for name, section in AnalysisPipeline._compute(
+            nlp_engine, parsed_resume, jd_text, filename, file_size, candidate_pool, plan,
+            interview_rotation, interview_difficulty
+        ):
+            if fields is not None:
+                section = {k: v for k, v in section.items() if k in fields}
+                if not section:
+                    continue
+            yield name, {**section, "resume_parsing_status": parsed_resume.status}
+
+    @staticmethod
+    def _compute(
+        nlp_engine,
+        parsed_resume: ParsedDocument,
+        jd_text: str,
+        filename: str,
+        file_size: int,
+        candidate_pool,
+        plan: List[str],
+        interview_rotation: int = 0,
+        interview_difficulty: Optional[str] = None
+    ) -> Iterator[Tuple[str, dict]]:
+        """Compute the planned sections in order; all sections share one AnalysisContext."""
+        resume_text = parsed_resume.text
+
+        # 3. Build the request-scoped analysis context.
+        # Skills, embeddings and bullet tags are computed lazily, once each.
+        context = AnalysisContext(nlp_engine, resume_text, jd_text, resume_sections=parsed_resume.sections)
+        TEXT_LENGTH.observe(len(resume_text), document="resume")
+        TEXT_LENGTH.observe(len(jd_text), document="job_description")
+
+        # 4-6. Skills, Embeddings & Score
+        # Context products are forced stage by stage so each timer measures only its own work
+        if "score" in plan:
+            with stage("skills"):
+                context.resume_skills, context.jd_skills
+            with stage("embedding"):
+                context.semantic_score
+            with stage("scoring"):
+                scoring_result = Scorer.score_context(context)
+            yield "score", {
+                "score": scoring_result["total_score"],
+                "missing_skills": scoring_result["missing_skills"],
+                "present_skills": scoring_result["present_skills"]
+            }
+
+        if "recommendations" in plan:
+            recommendations = Scorer.generate_recommendations(
+                missing_skills=scoring_result["missing_skills"],
+                score=scoring_result["total_score"]
+            )
+
+            # ATS Structural Checks (Basic)
+            structure_analysis = {
+                "file_size_kb": file_size / 1024,
+                "text_length": len(resume_text),
+                "is_scanned_pdf": len(resume_text) < 200 and filename.endswith(".pdf"),
+                "contact_info_present": "@" in resume_text # Simple check
+            }
+            
+            if structure_analysis["is_scanned_pdf"]:
+                recommendations.append("⚠️ CRITICAL: Your resume appears to be an image/scanned PDF. ATS cannot read it. Use a text-based PDF.")
+
+            if parsed_resume.status == "partial":
+                recommendations.append(f"⚠️ Partial analysis: {parsed_resume.detail}")
+            yield "recommendations", {"recommendations": recommendations, "structure_analysis": structure_analysis}
+
+        # 7. Market Demand Analysis
+        if "market_analysis" in plan:
+            with stage("market"):
+                market_analysis = MarketDataService.get_market_data(context=context)
+            yield "market_analysis", {"market_analysis": market_analysis}
+
+        # 8. Success Prediction
+        if "success_prediction" in plan:
+            with stage("prediction"):
+                success_prediction = SuccessPredictor.predict_success(
+                    resume_score=scoring_result["total_score"],
+                    missing_skills=scoring_result["missing_skills"],
+                    market_data=market_analysis
+                )
+            yield "success_prediction", {"success_prediction": success_prediction}
+
+        # 9. Generate Interview Questions
+        if "interview_questions" in plan:
+            with stage("interview"):
+                interview_questions = InterviewGenerator.generate_questions(
+                    missing_skills=scoring_result["missing_skills"],
+                    context=context,
+                    rotation=interview_rotation,
+                    difficulty=interview_difficulty
+                )
+            yield "interview_questions", {"interview_questions": interview_questions}
+
+        # 10. Calculate Trajectory
+        if "trajectory" in plan:
+            with stage("trajectory"):
+                trajectory = Scorer.calculate_trajectory(
+                    nlp_engine=nlp_engine,
+                    base_resume_text=resume_text,
+                    job_description=jd_text,
+                    missing_skills=scoring_result["missing_skills"],
+                    current_score=scoring_result["total_score"],
+                    context=context
+                )
+            yield "trajectory", {"trajectory": trajectory}
+
+        # 11. Analyze Bullets (only the bullets go through spaCy, tagger-only)
+        if "bullet_analysis" in plan:
+            with stage("bullets"):
+                bullet_analysis = BulletAnalyzer.analyze_bullets(resume_text, nlp_engine=nlp_engine, context=context)
+            yield "bullet_analysis", {"bullet_analysis": bullet_analysis}
+
+        # 12. Candidate Pool (opt-in), reusing whatever the context already computed
+        if candidate_pool is not None:
+            with stage("pool"):
+                candidate_pool.add(
+                    context.resume_vec,
+                    context.resume_skills,
+                    filename=filename,
+                    text_length=len(resume_text)
+                )
+
+    @staticmethod
+    def parsing_failed(parsed_resume: ParsedDocument) -> AnalysisResponse:
+        """Empty analysis that reports why the resume could not be read (e.g. "timeout")."""
+        return AnalysisResponse(
+            score=0,
+            missing_skills=[],
+            present_skills=[],
+            recommendations=[f"⚠️ We could not read your resume: {parsed_resume.detail} Try a smaller or text-based file."],
+            resume_parsing_status=parsed_resume.status
+        )
@@ -1,5 +1,8 @@
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+# Bullet scoring only reads POS tags and lemmas; dependency parsing and NER are skipped
+_UNUSED_PIPES = ("parser", "ner")
 
 class BulletAnalyzer:
     @staticmethod
@@ -80,12 +83,13 @@ class BulletAnalyzer:
         return bullets[:15]  # Analyze top 15 candidates
 
     @staticmethod
-    def analyze_bullet(bullet: str, nlp_engine=None) -> Dict:
+    def analyze_bullet(bullet: str, nlp_engine=None, doc=None) -> Dict:
         score = 0
         suggestions = []
         
         # 0. NLP Analysis (optional enhancement)
-        doc = nlp_engine.nlp(bullet) if nlp_engine else None
+        if doc is None and nlp_engine:
+            doc = nlp_engine.nlp(bullet)
         
         # 1. Strong Action Verb Check
         has_strong_verb = False
@@ -138,12 +142,23 @@ class BulletAnalyzer:
         }
 
     @staticmethod
-    def analyze_bullets(text: str, nlp_engine=None) -> List[Dict]:
-        raw_bullets = BulletAnalyzer.extract_bullets(text, nlp_engine)
+    def tag_bullets(bullets: List[str], nlp_engine=None, batch_size: int = 64) -> List[Optional[object]]:
+        """
+        POS-tag and lemmatize many bullets in one nlp.pipe call with the
+        parser and NER disabled. Returns None per bullet when no engine is given.
+        """
+        if nlp_engine is None or not bullets:
+            return [None] * len(bullets)
+        nlp = nlp_engine.nlp
+        disable = [name for name in _UNUSED_PIPES if name in nlp.pipe_names]
+        return list(nlp.pipe(bullets, batch_size=batch_size, disable=disable))
+
+    @staticmethod
+    def _summarize(bullets: List[str], docs: List, nlp_engine=None) -> List[Dict]:
         analysis = []
         
-        for b in raw_bullets:
-            result = BulletAnalyzer.analyze_bullet(b, nlp_engine)
+        for b, doc in zip(bullets, docs):
+            result = BulletAnalyzer.analyze_bullet(b, nlp_engine, doc=doc)
             # Include all bullets that need any improvement (score < 100)
             if result['score'] < 100:
                 analysis.append(result)
@@ -152,6 +167,32 @@ class BulletAnalyzer:
         analysis.sort(key=lambda x: x['score'])
         return analysis[:10]  # Return top 10
 
+    @staticmethod
+    def analyze_bullets(text: str, nlp_engine=None, context=None) -> List[Dict]:
+        if context is not None:
+            # Reuse the bullets and spaCy views memoized for this request
+            raw_bullets = context.bullets
+            docs = context.bullet_docs
+        else:
+            raw_bullets = BulletAnalyzer.extract_bullets(text, nlp_engine)
+            docs = BulletAnalyzer.tag_bullets(raw_bullets, nlp_engine)
+        return BulletAnalyzer._summarize(raw_bullets, docs, nlp_engine)
+
+    @staticmethod
+    def analyze_bullets_batch(texts: List[str], nlp_engine=None, batch_size: int = 64) -> List[List[Dict]]:
+        """
+        analyze_bullets for many resumes: the bullets of every resume are
+        tagged together in a single nlp.pipe stream.
+        """
+        bullet_lists = [BulletAnalyzer.extract_bullets(text, nlp_engine) for text in texts]
+        docs = BulletAnalyzer.tag_bullets([b for bullets in bullet_lists for b in bullets], nlp_engine, batch_size)
+
+        results, offset = [], 0
+        for bullets in bullet_lists:
+            results.append(BulletAnalyzer._summarize(bullets, docs[offset:offset + len(bullets)], nlp_engine))
+            offset += len(bullets)
+        return results
+
 
 # Strong action verbs set
 STRONG_ACTION_VERBS_SET = {
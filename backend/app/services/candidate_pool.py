@@ -0,0 +1,168 @@
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from .vector_store import VectorStore
+from .scorer import Scorer
+from .parser import ParsedDocument
+from app.core.config import settings
+
+
+class CandidatePool:
+    """
+    Persistent pool of analyzed resumes, searchable by job description.
+    Vectors live in a VectorStore; each entry keeps the metadata needed to
+    score it (skills, filename) so search never re-reads or re-embeds resumes.
+    With a deferred IVF store, k-means training runs in a background thread
+    once the pool is large enough, so no request waits for it.
+    """
+
+    def __init__(self, store: VectorStore, save_every: int = 50):
+        self.store = store
+        self.save_every = save_every
+        self._unsaved = 0
+        # FAISS indexes are not safe for concurrent add + search
+        self._lock = threading.RLock()
+        self._ivf_build: Optional[threading.Thread] = None
+        with self._lock:
+            self._schedule_ivf_build()
+
+    def _schedule_ivf_build(self):
+        if not self.store.defer_ivf_build or not self.store.ivf_build_due():
+            return
+        if self._ivf_build is not None and self._ivf_build.is_alive():
+            return
+        self._ivf_build = threading.Thread(target=self._build_ivf, name="candidate-ivf-build", daemon=True)
+        self._ivf_build.start()
+
+    def _build_ivf(self):
+        try:
+            if self.store.build_ivf(self._lock):
+                print(f"Candidate pool switched to an IVF index ({len(self.store)} vectors).")
+                with self._lock:
+                    self._save_locked()
+        except Exception as e:
+            print(f"Candidate pool IVF build failed: {e}")
+
+    @staticmethod
+    def _meta(resume_skills: List[str], filename: str, text_length: int, extra: Optional[Dict] = None) -> Dict:
+        return {
+            "filename": filename,
+            "skills": sorted(set(s.lower() for s in resume_skills)),
+            "text_length": text_length,
+            "added_at": time.time(),
+            **(extra or {})
+        }
+
+    def add(
+        self,
+        resume_vec: np.ndarray,
+        resume_skills: List[str],
+        filename: str = "",
+        text_length: int = 0,
+        extra: Optional[Dict] = None,
+        external_id: Optional[str] = None
+    ) -> int:
+        meta = self._meta(resume_skills, filename, text_length, extra)
+        return self._add_many(np.asarray(resume_vec).reshape(1, -1), [meta], [external_id])[0]
+
+    def _add_many(self, vectors: np.ndarray, metas: List[Dict], external_ids: List[Optional[str]]) -> List[int]:
+        with self._lock:
+            ids = self.store.add_vectors(vectors, metas, external_ids)
+            self._unsaved += len(ids)
+            if self.save_every and self._unsaved >= self.save_every:
+                self._save_locked()
+            self._schedule_ivf_build()
+        return ids
+
+    def add_documents(
+        self,
+        nlp_engine,
+        candidates: List[Tuple[str, ParsedDocument]],
+        external_ids: Optional[List[Optional[str]]] = None
+    ) -> List[Dict]:
+        """
+        Embed parsed resumes in batches and add the readable ones to the pool in
+        one index call. A candidate whose external ID is already pooled is replaced.
+        """
+        external_ids = external_ids or [None] * len(candidates)
+        readable = [(name, doc, ext) for (name, doc), ext in zip(candidates, external_ids) if doc.text]
+        vecs = nlp_engine.get_document_embeddings([doc.text for _, doc, _ in readable], batch_size=settings.embedding_batch_size)
+        metas = [
+            self._meta(nlp_engine.extract_skills(doc.text), name, len(doc.text))
+            for name, doc, _ in readable
+        ]
+        ids = self._add_many(vecs, metas, [ext for _, _, ext in readable]) if readable else []
+
+        added = [
+            {"id": candidate_id, "external_id": ext, "filename": name, "resume_parsing_status": doc.status}
+            for candidate_id, (name, doc, ext) in zip(ids, readable)
+        ]
+        skipped = [
+            {"id": None, "external_id": ext, "filename": name, "resume_parsing_status": doc.status}
+            for (name, doc), ext in zip(candidates, external_ids) if not doc.text
+        ]
+        return added + skipped
+
+    def remove(self, ids: Optional[List[int]] = None, external_ids: Optional[List[str]] = None) -> int:
+        """Drop candidates by pool ID and/or external ID. Returns how many were removed."""
+        with self._lock:
+            removed = self.store.remove(ids or [])
+            removed += self.store.remove_external(external_ids or [])
+            if removed:
+                self._unsaved += removed
+                if self.save_every and self._unsaved >= self.save_every:
+                    self._save_locked()
+        return removed
+
+    def search_text(self, nlp_engine, jd_text: str, k: int = 10) -> List[Dict]:
+        return self.search(nlp_engine.get_document_embedding(jd_text), nlp_engine.extract_skills(jd_text), k)
+
+    def search(self, jd_vec: np.ndarray, jd_skills: List[str], k: int = 10) -> List[Dict]:
+        """
+        Top-k candidates for a JD. The index supplies the nearest neighbours;
+        only those k are scored with the usual semantic + skill formula.
+        """
+        with self._lock:
+            hits = self.store.search(np.asarray(jd_vec), k)
+
+        results = []
+        for hit in hits:
+            meta = hit["metadata"]
+            scoring_result = Scorer.calculate_score(
+                semantic_score=hit["score"],
+                resume_skills=meta.get("skills", []),
+                job_skills=jd_skills
+            )
+            results.append({
+                "id": hit["id"],
+                "external_id": hit["external_id"],
+                "similarity": round(hit["score"], 4),
+                "score": scoring_result["total_score"],
+                "missing_skills": scoring_result["missing_skills"],
+                "present_skills": scoring_result["present_skills"],
+                "metadata": meta
+            })
+        results.sort(key=lambda x: x["score"], reverse=True)
+        return results
+
+    def _save_locked(self):
+        self.store.save()
+        self._unsaved = 0
+
+    def save(self):
+        with self._lock:
+            if self._unsaved:
+                self._save_locked()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "size": len(self.store),
+                "deleted": self.store.metadata.count(deleted=True),
+                "index_type": self.store.index_type,
+                "index_class": type(self.store.index).__name__,
+                "ivf_building": self._ivf_build is not None and self._ivf_build.is_alive(),
+                "unsaved": self._unsaved
+            }
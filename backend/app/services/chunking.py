@@ -0,0 +1,83 @@
+from typing import List
+import numpy as np
+
+POOLING_STRATEGIES = ("mean", "max", "topk")
+
+
+def chunk_text(text: str, max_words: int = 150, overlap: int = 30) -> List[str]:
+    """
+    Split text into overlapping word windows small enough for the encoder's
+    max sequence length. Windows start at fixed offsets, so appending text to a
+    document leaves its earlier chunks (and their cached vectors) unchanged.
+    """
+    words = text.split()
+    if not words:
+        return []
+    max_words = max(1, max_words)
+    stride = max(1, max_words - max(0, overlap))
+    chunks = []
+    for start in range(0, len(words), stride):
+        chunks.append(" ".join(words[start:start + max_words]))
+        if start + max_words >= len(words):
+            break
+    return chunks
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.atleast_2d(np.asarray(matrix, dtype=np.float64))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def mean_pool(chunk_vecs: np.ndarray) -> np.ndarray:
+    """Single document vector: the normalized mean of its normalized chunk vectors."""
+    chunk_vecs = np.asarray(chunk_vecs)
+    if chunk_vecs.shape[0] == 0:
+        return np.zeros(chunk_vecs.shape[-1], dtype=np.float32)
+    pooled = _normalize_rows(chunk_vecs).mean(axis=0)
+    norm = np.linalg.norm(pooled)
+    return (pooled / norm if norm else pooled).astype(np.float32)
+
+
+def pooled_similarity(
+    resume_chunks: np.ndarray,
+    jd_chunks: np.ndarray,
+    strategy: str = "max",
+    top_k: int = 3
+) -> float:
+    """
+    Combine chunk-to-chunk cosine similarities into one document score.
+    - "mean": cosine between the mean-pooled resume and JD vectors
+    - "max":  each JD chunk takes its best-matching resume chunk; averaged over JD chunks
+    - "topk": each JD chunk takes the mean of its top_k resume chunks; averaged over JD chunks
+    """
+    if strategy not in POOLING_STRATEGIES:
+        raise ValueError(f"Unknown pooling strategy: {strategy} (expected one of {POOLING_STRATEGIES})")
+    resume_chunks = np.asarray(resume_chunks)
+    jd_chunks = np.asarray(jd_chunks)
+    if resume_chunks.shape[0] == 0 or jd_chunks.shape[0] == 0:
+        return 0.0
+
+    if strategy == "mean":
+        return float(mean_pool(resume_chunks) @ mean_pool(jd_chunks))
+
+    sims = _normalize_rows(jd_chunks) @ _normalize_rows(resume_chunks).T  # (jd, resume)
+    if strategy == "max":
+        return float(sims.max(axis=1).mean())
+    k = min(max(1, top_k), sims.shape[1])
+    best = -np.partition(-sims, k - 1, axis=1)[:, :k]
+    return float(best.mean(axis=1).mean())
+
+
+def pooled_similarities(
+    resume_chunk_list: List[np.ndarray],
+    jd_chunks: np.ndarray,
+    strategy: str = "max",
+    top_k: int = 3
+) -> np.ndarray:
+    """pooled_similarity for many resumes against one JD."""
+    return np.array(
+        [pooled_similarity(chunks, jd_chunks, strategy, top_k) for chunks in resume_chunk_list],
+        dtype=np.float64
+    )
@@ -0,0 +1,350 @@
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import numpy as np
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for cache keys: NFC unicode, collapsed whitespace, trimmed."""
+    return _WHITESPACE.sub(' ', unicodedata.normalize("NFC", text)).strip()
+
+
+def make_key(model_name: str, text: str) -> str:
+    """Content address of an embedding: SHA-256 of (model name, normalized text)."""
+    payload = model_name.encode("utf-8") + b"\x00" + normalize_text(text).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _slug(model_name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+
+
+class _DiskTier:
+    """
+    Append-only persistent tier: a raw float32 matrix (memory-mapped for reads)
+    plus a text index of "<key> <row>" lines. Writers append under an exclusive
+    lock on a separate lock file; read-only processes pick up new rows by
+    re-reading the index tail.
+
+    Before each append the writer cuts off any torn trailing row or index
+    line left by a crash, so row numbers always count whole rows. Once the
+    matrix would pass max_bytes (0 = unbounded) the newest half of the rows is
+    copied into a new generation of files and meta.json is switched to it;
+    readers notice the new generation on their next refresh.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        model_name: str,
+        dimension: int,
+        read_only: bool = False,
+        max_bytes: int = 0
+    ):
+        self.directory = directory
+        self.slug = _slug(model_name)
+        self.model_name = model_name
+        self.read_only = read_only
+        self.dimension = dimension
+        self.row_bytes = dimension * 4
+        self.max_rows = max_bytes // self.row_bytes if max_bytes else 0
+        self.meta_path = os.path.join(directory, f"{self.slug}.meta.json")
+        self.lock_path = os.path.join(directory, f"{self.slug}.lock")
+        self.compactions = 0
+
+        if not read_only:
+            os.makedirs(directory, exist_ok=True)
+            if not os.path.exists(self.meta_path):
+                self._write_meta(0)
+
+        self._meta_stamp = None
+        self.generation = 0
+        self._reset(0)
+        if os.path.exists(self.meta_path):
+            self._check_meta()
+        if not read_only:
+            for path in (self.vectors_path, self.index_path):
+                open(path, "ab").close()
+        self.refresh()
+
+    def _paths(self, generation: int):
+        # Generation 0 keeps the original file names so existing stores stay readable
+        suffix = f".{generation}" if generation else ""
+        return (
+            os.path.join(self.directory, f"{self.slug}{suffix}.f32"),
+            os.path.join(self.directory, f"{self.slug}{suffix}.idx")
+        )
+
+    def _reset(self, generation: int):
+        self.generation = generation
+        self.vectors_path, self.index_path = self._paths(generation)
+        self.rows: Dict[str, int] = {}
+        self._index_offset = 0
+        self._vectors = None
+        self._mapped_rows = 0
+
+    def _write_meta(self, generation: int):
+        tmp = f"{self.meta_path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "model": self.model_name, "dimension": self.dimension, "dtype": "float32", "generation": generation
+            }, f)
+        os.replace(tmp, self.meta_path)
+
+    def _check_meta(self):
+        """Validate meta.json and follow a compaction done by another process."""
+        stat = os.stat(self.meta_path)
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._meta_stamp:
+            return
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        if meta.get("dimension") != self.dimension:
+            raise ValueError(f"Embedding cache dimension mismatch: {meta.get('dimension')} vs {self.dimension}")
+        self._meta_stamp = stamp
+        generation = meta.get("generation", 0)
+        if generation != self.generation:
+            self._reset(generation)
+
+    def refresh(self) -> bool:
+        """Read index lines appended since the last refresh. Returns True if anything new arrived."""
+        if os.path.exists(self.meta_path):
+            self._check_meta()
+        try:
+            if os.path.getsize(self.index_path) <= self._index_offset:
+                return False
+            with open(self.index_path, "rb") as f:
+                f.seek(self._index_offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            # Not created yet, or compacted away; the next refresh follows meta.json
+            self._meta_stamp = None
+            return False
+        # Only consume complete lines; a concurrent writer may be mid-append
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                self.rows[parts[0].decode("ascii")] = int(parts[1])
+        self._index_offset += len(complete)
+        return bool(complete)
+
+    def _map(self, min_rows: int):
+        if self._vectors is not None and self._mapped_rows >= min_rows:
+            return
+        total_rows = os.path.getsize(self.vectors_path) // self.row_bytes
+        if total_rows == 0:
+            return
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                  shape=(total_rows, self.dimension))
+        self._mapped_rows = total_rows
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.rows.get(key)
+        if row is None and self.refresh():
+            row = self.rows.get(key)
+        if row is None:
+            return None
+        try:
+            self._map(row + 1)
+        except OSError:
+            # The generation was compacted away between refresh and map
+            return None
+        if self._vectors is None or row >= self._mapped_rows:
+            return None
+        return np.array(self._vectors[row])
+
+    def _repair(self) -> int:
+        """Cut off a torn trailing row or index line (writer lock held). Returns the row count."""
+        size = os.path.getsize(self.vectors_path)
+        if size % self.row_bytes:
+            os.truncate(self.vectors_path, size - size % self.row_bytes)
+        with open(self.index_path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(max(0, end - 4096))
+                tail = f.read()
+                if not tail.endswith(b"\n"):
+                    f.truncate(end - len(tail) + tail.rfind(b"\n") + 1)
+        return size // self.row_bytes
+
+    def _compact(self, total_rows: int):
+        """Copy the newest max_rows // 2 rows into the next generation and switch meta.json to it."""
+        self.refresh()
+        self._map(total_rows)
+        keep = max(1, self.max_rows // 2)
+        first = max(0, total_rows - keep)
+        entries = sorted((row, key) for key, row in self.rows.items() if first <= row < total_rows)
+        vectors_path, index_path = self._paths(self.generation + 1)
+        with open(vectors_path, "wb") as vec_file, open(index_path, "wb") as index_file:
+            for new_row, (row, key) in enumerate(entries):
+                vec_file.write(np.ascontiguousarray(self._vectors[row]).tobytes())
+                index_file.write(f"{key} {new_row}\n".encode("ascii"))
+        old_paths = (self.vectors_path, self.index_path)
+        self._write_meta(self.generation + 1)
+        self._check_meta()
+        for path in old_paths:
+            # Readers that still map the old files keep their view until they refresh
+            os.unlink(path)
+        self.compactions += 1
+
+    def put(self, key: str, vector: np.ndarray):
+        if self.read_only or key in self.rows:
+            return
+        data = np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+        with open(self.lock_path, "ab") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # Another writer may have compacted since our last look
+                self._check_meta()
+                row = self._repair()
+                if self.max_rows and row >= self.max_rows:
+                    self._compact(row)
+                    row = self._repair()
+                with open(self.vectors_path, "ab") as vec_file:
+                    vec_file.write(data)
+                # Vector bytes land before the index line that points at them
+                with open(self.index_path, "ab") as index_file:
+                    index_file.write(f"{key} {row}\n".encode("ascii"))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self.rows[key] = row
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache.
+    Tier 1 is an in-memory LRU bounded by vector bytes; tier 2 is an optional
+    memory-mapped store on disk that survives restarts and can be shared by
+    several worker processes (opened read-only in all but one of them),
+    compacted to its newest half once it passes max_disk_bytes.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_bytes: int = 64 * 1024 * 1024,
+        persist_dir: Optional[str] = None,
+        read_only: bool = False,
+        max_disk_bytes: int = 0
+    ):
+        self.model_name = model_name
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.persist_dir = persist_dir
+        self.read_only = read_only
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._disk: Optional[_DiskTier] = None
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, text: str) -> str:
+        return make_key(self.model_name, text)
+
+    def _disk_tier(self, dimension: int) -> Optional[_DiskTier]:
+        # Opened on first use, once the embedding dimension is known
+        if self._disk is None and self.persist_dir:
+            try:
+                self._disk = _DiskTier(
+                    self.persist_dir, self.model_name, dimension, self.read_only, self.max_disk_bytes
+                )
+            except (OSError, ValueError) as e:
+                print(f"Embedding cache persistence disabled: {e}")
+                self.persist_dir = None
+        return self._disk
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return
+        if vector.nbytes > self.max_bytes:
+            return
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self.key(text)
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+            disk = self._disk
+            if disk is None and self.persist_dir:
+                # Learn the dimension from the store's metadata written by an earlier process
+                disk = self._open_existing_disk()
+            vector = disk.get(key) if disk is not None else None
+            if vector is not None:
+                vector.setflags(write=False)
+                self._remember(key, vector)
+                self.hits += 1
+                self.disk_hits += 1
+                return vector
+
+            self.misses += 1
+            return None
+
+    def _open_existing_disk(self) -> Optional[_DiskTier]:
+        meta_path = os.path.join(self.persist_dir, f"{_slug(self.model_name)}.meta.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            dimension = json.load(f)["dimension"]
+        return self._disk_tier(dimension)
+
+    def get_many(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        return [self.get(text) for text in texts]
+
+    def put(self, text: str, vector: np.ndarray):
+        key = self.key(text)
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._remember(key, vector)
+            if self.persist_dir and not self.read_only:
+                disk = self._disk_tier(vector.shape[-1])
+                if disk is not None:
+                    disk.put(key, vector)
+
+    def clear(self):
+        """Drop the in-memory tier (the persistent tier is left untouched)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "disk_entries": len(self._disk) if self._disk is not None else 0,
+            "disk_compactions": self._disk.compactions if self._disk is not None else 0
+        }
@@ -0,0 +1,106 @@
+import glob
+import os
+import re
+import time
+from typing import Dict, List, Optional
+import numpy as np
+
+# "torch":      the reference fp32 PyTorch SentenceTransformer
+# "torch-int8": the same model with nn.Linear layers dynamically quantized to int8
+# "onnx":       the model exported to ONNX Runtime
+# "onnx-int8":  the ONNX model with dynamically quantized int8 weights
+ENCODER_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+
+def _slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+
+
+def _quantized_file(local_dir: str, quantization: str) -> Optional[str]:
+    """Path (relative to local_dir) of an exported int8 ONNX file, if one exists."""
+    matches = glob.glob(os.path.join(local_dir, "onnx", f"model_*int8_{quantization}.onnx"))
+    return os.path.relpath(matches[0], local_dir) if matches else None
+
+
+def load_encoder(
+    model_name: str,
+    backend: str = "torch",
+    export_dir: str = "data/encoders",
+    quantization: str = "avx2"
+):
+    """
+    Load a SentenceTransformer running on the given backend. Every backend
+    exposes the same encode() API, so NLPEngine does not care which one it gets.
+    ONNX exports are written under export_dir on first use and reused afterwards.
+    The ONNX backends need `sentence-transformers[onnx]` (optimum + onnxruntime).
+    """
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend} (expected one of {ENCODER_BACKENDS})")
+
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+
+    if backend == "torch-int8":
+        import torch
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    local_dir = os.path.join(export_dir, _slug(model_name))
+    if backend == "onnx":
+        if os.path.exists(os.path.join(local_dir, "onnx", "model.onnx")):
+            return SentenceTransformer(local_dir, backend="onnx", device="cpu")
+        # Uses the ONNX file shipped with the model, or exports one
+        model = SentenceTransformer(model_name, backend="onnx", device="cpu")
+        model.save(local_dir)
+        return model
+
+    file_name = _quantized_file(local_dir, quantization)
+    if file_name is None:
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+        model = load_encoder(model_name, "onnx", export_dir, quantization)
+        export_dynamic_quantized_onnx_model(model, quantization, local_dir, file_suffix=f"qint8_{quantization}")
+        file_name = _quantized_file(local_dir, quantization)
+    return SentenceTransformer(local_dir, backend="onnx", device="cpu", model_kwargs={"file_name": file_name})
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float64)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def compare_encoders(reference, candidate, texts: List[str], batch_size: int = 32) -> Dict:
+    """
+    Equivalence check of a candidate encoder against the reference one.
+    - cosine: similarity between each text's reference and candidate vector
+    - similarity drift: change in text-to-text cosine scores, which is what
+      the semantic part of the match score is built from
+    Also reports encode time for both, so the fastest stable backend can be picked.
+    """
+    # Warm up both so one-off graph/session setup is not timed
+    reference.encode(texts[:1])
+    candidate.encode(texts[:1])
+
+    start = time.perf_counter()
+    ref = _normalize_rows(reference.encode(texts, batch_size=batch_size))
+    reference_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cand = _normalize_rows(candidate.encode(texts, batch_size=batch_size))
+    candidate_seconds = time.perf_counter() - start
+
+    cosines = np.sum(ref * cand, axis=1)
+    similarity_drift = np.abs(ref @ ref.T - cand @ cand.T)
+    return {
+        "texts": len(texts),
+        "mean_cosine": round(float(cosines.mean()), 6),
+        "min_cosine": round(float(cosines.min()), 6),
+        "max_similarity_drift": round(float(similarity_drift.max()), 6),
+        "mean_similarity_drift": round(float(similarity_drift.mean()), 6),
+        "reference_seconds": round(reference_seconds, 4),
+        "candidate_seconds": round(candidate_seconds, 4),
+        "speedup": round(reference_seconds / candidate_seconds, 2) if candidate_seconds else None
+    }
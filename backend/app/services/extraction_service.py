@@ -0,0 +1,203 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.core.executors import run_parsing
+from .parser import DocumentSource, ParsedDocument, ResumeParser
+
+
+class ExtractionService:
+    """
+    Runs ResumeParser extraction in isolated worker processes.
+
+    Every document gets a byte budget (checked before dispatch), a page budget
+    and a wall-clock timeout. At most `workers` documents are handed to the
+    pool at a time, so the timeout starts when a worker picks the document up,
+    not while it waits behind others. The worker stops on its own shortly
+    before the timeout and returns the pages read so far ("partial"); if it is
+    still busy when the timeout expires the pool is killed and replaced
+    ("timeout"). Documents that were running on a killed pool are retried once
+    on the fresh one and reported as "failed" if that breaks too.
+    Workers are recycled after a fixed number of documents to cap memory growth
+    (manually: max_tasks_per_child is not available on Python 3.10).
+    """
+
+    # Share of the timeout the worker may spend before stopping on its own
+    SOFT_BUDGET_RATIO = 0.8
+
+    def __init__(
+        self,
+        workers: int = 2,
+        timeout: float = 15.0,
+        max_pages: int = 10,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_tasks_per_worker: int = 50,
+        use_processes: bool = True
+    ):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_bytes = max_bytes
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.use_processes = use_processes
+
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tasks_on_pool = 0
+        self._killed_pools = weakref.WeakSet()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop = None
+
+        self.timeouts = 0
+        self.recycles = 0
+        self.retries = 0
+
+    def _slot(self) -> asyncio.Semaphore:
+        """One slot per worker, bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(self.workers)
+            self._slots_loop = loop
+        return self._slots
+
+    def _acquire_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            budget = self.max_tasks_per_worker * self.workers
+            if self._pool is not None and budget and self._tasks_on_pool >= budget:
+                # Retire the pool; documents already running on it finish normally
+                self._pool.shutdown(wait=False)
+                self._pool = None
+                self.recycles += 1
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                self._tasks_on_pool = 0
+            self._tasks_on_pool += 1
+            return self._pool
+
+    def _kill_pool(self, pool: ProcessPoolExecutor):
+        """
+        Terminate a pool whose worker is stuck; the next document gets a fresh one.
+        Idempotent: a pool already killed (or shut down) is left alone.
+        """
+        with self._lock:
+            if pool in self._killed_pools:
+                return
+            self._killed_pools.add(pool)
+            if self._pool is pool:
+                self._pool = None
+        # shutdown() clears _processes, so it may already be None
+        for process in list((getattr(pool, "_processes", None) or {}).values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, content: DocumentSource, kind: str) -> ParsedDocument:
+        """Extract raw bytes or a spooled file; a path is all that crosses to the worker process."""
+        size = os.path.getsize(content) if isinstance(content, str) else len(content)
+        if self.max_bytes and size > self.max_bytes:
+            if self.max_bytes >= 1024 * 1024:
+                limit = f"{self.max_bytes / (1024 * 1024):.0f} MB"
+            else:
+                limit = f"{self.max_bytes / 1024:.0f} KB"
+            return ParsedDocument(
+                text="",
+                kind=kind,
+                status="too_large",
+                detail=f"File exceeds the {limit} extraction limit."
+            )
+
+        if kind == "text":
+            # Plain text only needs decoding; not worth a trip to a worker
+            return ResumeParser.parse_document(content, kind)
+
+        soft_budget = self.timeout * self.SOFT_BUDGET_RATIO if self.timeout else None
+        args = (content, kind, self.max_pages, soft_budget)
+
+        if not self.use_processes:
+            # Thread/inline parsing: only the in-worker soft budget applies
+            return await run_parsing(ResumeParser.parse_document, *args)
+
+        try:
+            return await self._extract_in_pool(args, kind)
+        except BrokenProcessPool:
+            # Another document's timeout took this pool down; retry once on a fresh one
+            self.retries += 1
+        try:
+            return await self._extract_in_pool(args, kind)
+        except BrokenProcessPool:
+            return ParsedDocument(
+                text="",
+                kind=kind,
+                status="failed",
+                detail="The extraction worker stopped before finishing this document."
+            )
+
+    async def _extract_in_pool(self, args: tuple, kind: str) -> ParsedDocument:
+        loop = asyncio.get_running_loop()
+        async with self._slot():
+            pool = self._acquire_pool()
+            try:
+                future = loop.run_in_executor(pool, ResumeParser.parse_document, *args)
+                return await asyncio.wait_for(future, timeout=self.timeout or None)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                self._kill_pool(pool)
+                return ParsedDocument(
+                    text="",
+                    kind=kind,
+                    status="timeout",
+                    detail=f"Extraction did not finish within {self.timeout:g} seconds."
+                )
+            except BrokenProcessPool:
+                self._kill_pool(pool)
+                raise
+
+    async def warmup(self):
+        """
+        Spawn the worker processes ahead of the first upload, so interpreter
+        start-up and parser imports do not land on the first requests.
+        """
+        if not self.use_processes:
+            return
+        loop = asyncio.get_running_loop()
+        pool = self._acquire_pool()
+        await asyncio.gather(*(
+            loop.run_in_executor(pool, ResumeParser.detect_kind, "warmup.pdf")
+            for _ in range(self.workers)
+        ))
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "tasks_on_pool": self._tasks_on_pool,
+            "timeouts": self.timeouts,
+            "recycles": self.recycles,
+            "retries": self.retries
+        }
+
+
+@lru_cache()
+def get_extraction_service() -> ExtractionService:
+    return ExtractionService(
+        workers=settings.parse_workers,
+        timeout=settings.parse_timeout_seconds,
+        max_pages=settings.parse_max_pages,
+        max_bytes=settings.parse_max_bytes,
+        max_tasks_per_worker=settings.parse_worker_max_tasks,
+        use_processes=settings.parse_executor == "process"
+    )
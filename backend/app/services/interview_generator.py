@@ -1,104 +1,178 @@
-from typing import List, Dict
-
-# Static Question Bank
-# In a production system, this would be a database or LLM call.
-QUESTION_BANK = {
-    "React": [
-        "Explain the Virtual DOM and how it improves performance.",
-        "What are Hooks? Compare useEffect vs useLayoutEffect.",
-        "How do you optimize a React application for performance?",
-        "Explain the concept of Higher-Order Components."
-    ],
-    "Node.js": [
-        "Explain the Event Loop in Node.js.",
-        "Difference between process.nextTick() and setImmediate().",
-        "How does Node.js handle concurrency?",
-        "Explain Streams and Buffers in Node.js."
-    ],
-    "Python": [
-        "Explain the difference between list and tuple.",
-        "What are decorators and how do you use them?",
-        "Explain the Global Interpreter Lock (GIL).",
-        "Difference between range() and xrange() in Python 2 vs 3."
-    ],
-    "SQL": [
-        "Difference between INNER JOIN and LEFT JOIN.",
-        "Explain ACID properties in databases.",
-        "How do you optimize a slow SQL query?",
-        "What is normalization? Explain 1NF, 2NF, 3NF."
-    ],
-    "Docker": [
-        "Difference between an Image and a Container.",
-        "Explain the purpose of Docker Compose.",
-        "How do you optimize Docker image size?",
-        "What is a multi-stage build?"
-    ],
-    "AWS": [
-        "Difference between EC2 and Lambda.",
-        "Explain S3 consistency models.",
-        "What is an IAM Role vs IAM User?",
-        "How do you secure an S3 bucket?"
-    ],
-    "System Design": [
-        "How would you design a URL shortener like Bit.ly?",
-        "Design a rate limiter.",
-        "How do you handle database scaling (Sharding vs Replication)?",
-        "Design a chat application like WhatsApp."
-    ],
-    "Behavioral": [
-        "Tell me about a time you failed.",
-        "How do you handle conflicts in a team?",
-        "Describe a challenging project you worked on.",
-        "Where do you see yourself in 5 years?"
-    ]
-}
+import json
+import os
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app.core.config import settings
+from .skill_ontology import SkillOntology, get_skill_ontology
+
+DEFAULT_QUESTION_BANK = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "question_bank.json")
+
+DIFFICULTIES = ("easy", "medium", "hard")
+
+# Level assumed for questions the bank file leaves unlabelled
+DEFAULT_DIFFICULTY = "medium"
+
+
+class QuestionBank:
+    """
+    Interview questions indexed by canonical skill.
+
+    Each entry's questions are stored once, with per-difficulty position lists
+    built at load time. The canonical form of every skill name and alias
+    (through the skill ontology, so "k8s" finds a "Kubernetes" entry) points
+    at its entry, so finding a skill's questions is one dict lookup and
+    rotation or difficulty filtering is an index into a precomputed list.
+    """
+
+    def __init__(self, entries: Iterable[dict], ontology: SkillOntology):
+        self.ontology = ontology
+        self.skills: List[str] = []
+        self.questions: List[List[Tuple[str, str]]] = []
+        self._by_difficulty: List[Dict[str, List[int]]] = []
+        self._index: Dict[str, int] = {}
+
+        for entry in entries:
+            questions = [
+                (q["text"], (q.get("difficulty") or DEFAULT_DIFFICULTY).lower())
+                for q in entry.get("questions", ()) if q.get("text")
+            ]
+            if not questions:
+                continue
+            position = len(self.skills)
+            self.skills.append(entry["skill"])
+            self.questions.append(questions)
+            by_difficulty: Dict[str, List[int]] = {}
+            for i, (_, difficulty) in enumerate(questions):
+                by_difficulty.setdefault(difficulty, []).append(i)
+            self._by_difficulty.append(by_difficulty)
+            for key in [entry["skill"], *entry.get("aliases", ())]:
+                # The first entry to claim a key keeps it
+                self._index.setdefault(ontology.canonical(key), position)
+
+    def __len__(self) -> int:
+        return len(self.skills)
+
+    def lookup(self, skill: str) -> Optional[int]:
+        """Entry position for a skill or any alias of it."""
+        return self._index.get(self.ontology.canonical(skill))
+
+    def pick(
+        self,
+        position: int,
+        offset: int = 0,
+        difficulties: Optional[Iterable[str]] = None
+    ) -> Optional[Tuple[str, str]]:
+        """
+        (question, difficulty) at `offset` among the entry's questions, wrapping
+        around; with difficulties, only questions of those levels count.
+        """
+        questions = self.questions[position]
+        if difficulties is None:
+            return questions[offset % len(questions)]
+        by_difficulty = self._by_difficulty[position]
+        allowed = [i for difficulty in difficulties for i in by_difficulty.get(difficulty, ())]
+        if not allowed:
+            return None
+        if len(difficulties) > 1:
+            allowed.sort()
+        return questions[allowed[offset % len(allowed)]]
+
+    @classmethod
+    def load(cls, path: str, ontology: SkillOntology) -> "QuestionBank":
+        """
+        Load a JSON bank:
+        {"skills": [{"skill", "aliases", "questions": [{"text", "difficulty"}]}, ...]}
+        """
+        with open(path) as f:
+            return cls(json.load(f)["skills"], ontology)
+
+
+@lru_cache()
+def get_question_bank() -> QuestionBank:
+    """The bank at QUESTION_BANK_PATH, or the built-in one, indexed once per process."""
+    ontology = get_skill_ontology()
+    if settings.question_bank_path:
+        try:
+            return QuestionBank.load(settings.question_bank_path, ontology)
+        except Exception as e:
+            print(f"Could not load question bank from {settings.question_bank_path}: {e}. Using built-in questions.")
+    return QuestionBank.load(DEFAULT_QUESTION_BANK, ontology)
+
+
+def parse_difficulties(difficulty: Union[str, Iterable[str], None]) -> Optional[Tuple[str, ...]]:
+    """Difficulty filter levels from "hard", "easy,medium" or a list; ValueError on unknown levels."""
+    if difficulty is None:
+        return None
+    if isinstance(difficulty, str):
+        difficulty = difficulty.split(",")
+    levels = tuple(d.strip().lower() for d in difficulty if d.strip())
+    unknown = [d for d in levels if d not in DIFFICULTIES]
+    if unknown:
+        raise ValueError(f"Unknown difficulty: {', '.join(unknown)}. Choose from {', '.join(DIFFICULTIES)}.")
+    return levels or None
+
 
 class InterviewGenerator:
     @staticmethod
-    def generate_questions(missing_skills: List[str], job_skills: List[str]) -> List[Dict[str, str]]:
+    def generate_questions(
+        missing_skills: List[str],
+        job_skills: Optional[List[str]] = None,
+        context=None,
+        rotation: int = 0,
+        difficulty: Union[str, Iterable[str], None] = None
+    ) -> List[Dict[str, str]]:
         """
         Generate a tailored interview prep list.
         Prioritizes missing skills (Weaknesses) and key job skills (Strengths).
-        Uses deterministic selection (first matching question per skill).
+        Selection is deterministic: a skill's first matching question for a
+        weakness, its second for a strength. Raising `rotation` shifts every
+        pick to later questions, and a bank entry hit by several skills moves
+        on instead of repeating itself. `difficulty` ("hard", "easy,medium",
+        or a list) keeps only questions of those levels. Each question reports
+        its own level from the bank ("N/A" for behavioral ones).
+        JD skills are read from the request's AnalysisContext when one is given.
         """
+        if job_skills is None:
+            job_skills = context.jd_skills if context is not None else []
+        bank = get_question_bank()
+        difficulties = parse_difficulties(difficulty)
+        used: Dict[int, int] = {}
         questions = []
-        
+
+        def add(skill: str, category: str, offset: int):
+            position = bank.lookup(skill)
+            if position is None:
+                return
+            picked = bank.pick(position, rotation + offset + used.get(position, 0), difficulties)
+            if picked is None:
+                return
+            used[position] = used.get(position, 0) + 1
+            questions.append({
+                "category": category,
+                "skill": skill,
+                "question": picked[0],
+                "difficulty": picked[1].title()
+            })
+
         # 1. Target Weaknesses (Missing Skills)
         for skill in missing_skills:
-            for key in QUESTION_BANK:
-                if key.lower() in skill.lower() or skill.lower() in key.lower():
-                    q_list = QUESTION_BANK[key]
-                    questions.append({
-                        "category": "Weakness / Missing Skill",
-                        "skill": skill,
-                        "question": q_list[0],  # Deterministic: always first question
-                        "difficulty": "Hard"
-                    })
-                    break
-        
+            add(skill, "Weakness / Missing Skill", 0)
+
         # 2. Verify Strengths (Job Skills that are matches)
         present_job_skills = set(job_skills) - set(missing_skills)
-        
         for skill in sorted(present_job_skills):  # sorted for deterministic order
-             for key in QUESTION_BANK:
-                if key.lower() in skill.lower() or skill.lower() in key.lower():
-                    q_list = QUESTION_BANK[key]
-                    questions.append({
-                        "category": "Strength / Verification",
-                        "skill": skill,
-                        "question": q_list[1] if len(q_list) > 1 else q_list[0],  # Second question for variety
-                        "difficulty": "Medium"
-                    })
-                    break
-        
+            add(skill, "Strength / Verification", 1)  # Second question for variety
+
         # 3. Always add Behavioral if we have few questions
-        if len(questions) < 5:
+        behavioral = bank.lookup("Behavioral")
+        if len(questions) < 5 and behavioral is not None:
             questions.append({
                 "category": "Behavioral",
-                 "skill": "Soft Skills",
-                 "question": QUESTION_BANK["Behavioral"][0],  # Deterministic
-                 "difficulty": "N/A"
+                "skill": "Soft Skills",
+                "question": bank.pick(behavioral, rotation)[0],
+                "difficulty": "N/A"
             })
-            
+
         # Limit to 7 questions
         return questions[:7]
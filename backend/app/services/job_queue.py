@@ -0,0 +1,370 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.metrics import JOBS, JOB_SECONDS, JOB_WAIT_SECONDS
+
+JOB_STATES = ("queued", "running", "succeeded", "failed")
+
+
+class PermanentJobError(Exception):
+    """A job failure that retrying cannot fix (e.g. an unreadable upload)."""
+
+
+class JobQueue:
+    """
+    Persistent local work queue in SQLite.
+
+    Jobs carry JSON parameters plus uploaded files (stored as BLOBs so the
+    request can return before parsing). Workers claim the highest-priority
+    job that is due, oldest first. Failed attempts are retried with
+    exponential backoff up to max_attempts; finished jobs keep their result
+    until result_ttl expires.
+
+    A claimed job is leased to this queue instance (its owner) and the lease
+    is kept alive by heartbeat(). Jobs whose lease has run out (their process
+    died or hung) are re-queued by requeue_expired(); a job that keeps taking
+    its process down uses up an attempt each time and eventually fails.
+    Several processes can share one database without taking each other's jobs.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_attempts: int = 3,
+        retry_backoff: float = 2.0,
+        result_ttl: float = 3600.0,
+        lease_seconds: float = 60.0
+    ):
+        self.path = path or ":memory:"
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self.result_ttl = result_ttl
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                owner TEXT,
+                heartbeat_at REAL,
+                finished_at REAL,
+                expires_at REAL,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, priority DESC, available_at, created_at);
+            CREATE TABLE IF NOT EXISTS job_files (
+                job_id TEXT NOT NULL REFERENCES jobs (id) ON DELETE CASCADE,
+                position INTEGER NOT NULL,
+                field TEXT NOT NULL,
+                filename TEXT NOT NULL,
+                content BLOB NOT NULL,
+                PRIMARY KEY (job_id, position)
+            );
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.commit()
+        self.requeue_expired()
+
+    def submit(
+        self,
+        kind: str,
+        params: dict,
+        files: Optional[List[Tuple[str, str, bytes]]] = None,
+        priority: int = 0
+    ) -> str:
+        """Queue a job with (field, filename, content) files. Higher priority runs first."""
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, priority, status, params, max_attempts, available_at, created_at) "
+                "VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, kind, int(priority), json.dumps(params), self.max_attempts, now, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO job_files (job_id, position, field, filename, content) VALUES (?, ?, ?, ?, ?)",
+                ((job_id, i, field, filename, content) for i, (field, filename, content) in enumerate(files or []))
+            )
+        return job_id
+
+    def claim(self) -> Optional[dict]:
+        """Lease the next due job to this queue and return it, or None when nothing is due."""
+        now = time.time()
+        with self._lock, self._conn:
+            # One statement picks and leases the job, so two processes cannot claim the same one
+            row = self._conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ?, owner = ?, "
+                "heartbeat_at = ? WHERE status = 'queued' AND id = ("
+                "SELECT id FROM jobs WHERE status = 'queued' AND available_at <= ? "
+                "ORDER BY priority DESC, available_at, created_at LIMIT 1"
+                ") RETURNING id",
+                (now, self.owner, now, now)
+            ).fetchone()
+        if row is None:
+            return None
+        return self.get(row[0])
+
+    def files(self, job_id: str) -> List[Tuple[str, str, bytes]]:
+        with self._lock:
+            return [
+                (field, filename, bytes(content))
+                for field, filename, content in self._conn.execute(
+                    "SELECT field, filename, content FROM job_files WHERE job_id = ? ORDER BY position",
+                    (job_id,)
+                )
+            ]
+
+    def complete(self, job_id: str, result: dict):
+        """Store the result; uploads are no longer needed once a job has finished."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'succeeded', result = ?, error = NULL, owner = NULL, finished_at = ?, "
+                "expires_at = ? WHERE id = ?",
+                (json.dumps(result), now, now + self.result_ttl, job_id)
+            )
+            self._conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+
+    def fail(self, job_id: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt. The job is re-queued with exponential backoff
+        while attempts remain (and retry is set), otherwise it fails for good.
+        Returns the new status.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return "missing"
+            attempts, max_attempts = row
+            if retry and attempts < max_attempts:
+                delay = self.retry_backoff * (2 ** (attempts - 1))
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL, error = ?, available_at = ? WHERE id = ?",
+                    (error, now + delay, job_id)
+                )
+                return "queued"
+            self._conn.execute(
+                "UPDATE jobs SET status = 'failed', owner = NULL, error = ?, finished_at = ?, expires_at = ? WHERE id = ?",
+                (error, now, now + self.result_ttl, job_id)
+            )
+            self._conn.execute("DELETE FROM job_files WHERE job_id = ?", (job_id,))
+            return "failed"
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Job state without its files; expired jobs are reported as missing."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, kind, priority, status, params, attempts, max_attempts, created_at, "
+                "started_at, finished_at, expires_at, result, error FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None or (row[10] is not None and row[10] <= time.time()):
+            return None
+        return {
+            "job_id": row[0],
+            "kind": row[1],
+            "priority": row[2],
+            "status": row[3],
+            "params": json.loads(row[4]),
+            "attempts": row[5],
+            "max_attempts": row[6],
+            "created_at": row[7],
+            "started_at": row[8],
+            "finished_at": row[9],
+            "expires_at": row[10],
+            "result": json.loads(row[11]) if row[11] is not None else None,
+            "error": row[12]
+        }
+
+    def heartbeat(self) -> int:
+        """Renew the lease on every job this queue is running."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE jobs SET heartbeat_at = ? WHERE status = 'running' AND owner = ?",
+                (time.time(), self.owner)
+            ).rowcount
+
+    def requeue_expired(self) -> int:
+        """Re-queue running jobs whose lease ran out, whichever process held them."""
+        return self._requeue(
+            "heartbeat_at IS NULL OR heartbeat_at < ?", (time.time() - self.lease_seconds,),
+            "The worker running this job stopped responding."
+        )
+
+    def release(self) -> int:
+        """Re-queue the jobs this queue is running (e.g. on shutdown)."""
+        return self._requeue("owner = ?", (self.owner,), "The job was interrupted by a shutdown.")
+
+    def _requeue(self, condition: str, args: tuple, error: str) -> int:
+        """
+        Put interrupted running jobs back in the queue. The interrupted run
+        counts as an attempt: jobs with none left fail instead.
+        """
+        now = time.time()
+        with self._lock, self._conn:
+            failed = [row[0] for row in self._conn.execute(
+                "UPDATE jobs SET status = 'failed', owner = NULL, error = ?, finished_at = ?, expires_at = ? "
+                f"WHERE status = 'running' AND attempts >= max_attempts AND ({condition}) RETURNING id",
+                (error, now, now + self.result_ttl, *args)
+            ).fetchall()]
+            self._conn.executemany("DELETE FROM job_files WHERE job_id = ?", ((job_id,) for job_id in failed))
+            requeued = self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, error = ?, available_at = ? "
+                f"WHERE status = 'running' AND ({condition})",
+                (error, now, *args)
+            ).rowcount
+        return len(failed) + requeued
+
+    def purge_expired(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).rowcount
+
+    def stats(self) -> Dict:
+        """Job counts by state and the age of the oldest queued job (seconds)."""
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+            oldest = self._conn.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        return {
+            **{state: counts.get(state, 0) for state in JOB_STATES},
+            "oldest_queued_age": round(time.time() - oldest, 3) if oldest is not None else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+JobHandler = Callable[[dict, List[Tuple[str, str, bytes]]], Awaitable[dict]]
+
+
+class JobWorkers:
+    """
+    A fixed number of asyncio workers draining a JobQueue in the app's event loop.
+    Handlers are coroutines (kind -> handler(params, files) -> result dict) that
+    dispatch their CPU-bound work to the existing executors; queue calls run in
+    threads so SQLite never blocks the loop. PermanentJobError fails a job
+    without retries, as does running past job_timeout seconds (0 = no limit);
+    any other exception is retried with backoff. A background task renews the
+    leases of running jobs and re-queues jobs whose lease expired elsewhere.
+    """
+
+    POLL_INTERVAL = 0.5
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, JobHandler], workers: int = 2, job_timeout: float = 0):
+        self.queue = queue
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.job_timeout = job_timeout
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_purge = 0.0
+
+    def start(self):
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._keep_leases()))
+
+    def notify(self):
+        """Wake idle workers after a submit instead of waiting for the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Jobs cut off mid-run go back to the queue for the next start
+        await asyncio.to_thread(self.queue.release)
+
+    async def _keep_leases(self):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            try:
+                await asyncio.to_thread(self.queue.heartbeat)
+                if await asyncio.to_thread(self.queue.requeue_expired):
+                    self.notify()
+            except Exception as e:
+                print(f"Job lease upkeep failed: {e}")
+
+    async def _idle(self):
+        if time.monotonic() - self._last_purge > self.PURGE_INTERVAL:
+            self._last_purge = time.monotonic()
+            await asyncio.to_thread(self.queue.purge_expired)
+        self._wakeup.clear()
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _work(self):
+        while True:
+            job = await asyncio.to_thread(self.queue.claim)
+            if job is None:
+                await self._idle()
+                continue
+            await self.run_job(job)
+
+    async def run_job(self, job: dict):
+        kind = job["kind"]
+        JOB_WAIT_SECONDS.observe(job["started_at"] - job["created_at"], kind=kind)
+        start = time.perf_counter()
+        try:
+            handler = self.handlers.get(kind)
+            if handler is None:
+                raise PermanentJobError(f"No handler for job kind '{kind}'.")
+            files = await asyncio.to_thread(self.queue.files, job["job_id"])
+            run = handler(job["params"], files)
+            result = await (asyncio.wait_for(run, self.job_timeout) if self.job_timeout else run)
+            await asyncio.to_thread(self.queue.complete, job["job_id"], result)
+            outcome = "succeeded"
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            # A job that ran out of time once would do so again
+            outcome = await asyncio.to_thread(
+                self.queue.fail, job["job_id"], f"Job exceeded its {self.job_timeout:g}s time limit.", False
+            )
+        except PermanentJobError as e:
+            outcome = await asyncio.to_thread(self.queue.fail, job["job_id"], str(e), False)
+        except Exception as e:
+            print(f"Job {job['job_id']} ({kind}) attempt {job['attempts']} failed: {e}")
+            outcome = await asyncio.to_thread(self.queue.fail, job["job_id"], str(e))
+            if outcome == "queued":
+                outcome = "retried"
+        JOB_SECONDS.observe(time.perf_counter() - start, kind=kind)
+        JOBS.inc(kind=kind, outcome=outcome)
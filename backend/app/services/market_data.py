@@ -1,87 +1,207 @@
-import random
-from typing import Dict, List
-
-# Static database of market data for common tech roles
-MARKET_DATA = {
-    "software engineer": {
-        "salary_range": "$90k - $160k",
-        "demand_level": "High",
-        "demand_growth": "+12%",
-        "top_skills": ["Python", "Java", "Docker", "AWS", "React"],
-        "avg_tenure": "2.1 years"
-    },
-    "frontend developer": {
-        "salary_range": "$80k - $140k",
-        "demand_level": "Medium-High",
-        "demand_growth": "+8%",
-        "top_skills": ["React", "TypeScript", "Tailwind", "Next.js", "Figma"],
-        "avg_tenure": "1.8 years"
-    },
-    "backend developer": {
-        "salary_range": "$95k - $165k",
-        "demand_level": "High",
-        "demand_growth": "+15%",
-        "top_skills": ["Python", "Go", "PostgreSQL", "Redis", "Kubernetes"],
-        "avg_tenure": "2.3 years"
-    },
-    "data scientist": {
-        "salary_range": "$110k - $190k",
-        "demand_level": "Very High",
-        "demand_growth": "+22%",
-        "top_skills": ["Python", "PyTorch", "SQL", "Machine Learning", "AWS"],
-        "avg_tenure": "2.5 years"
-    },
-    "product manager": {
-        "salary_range": "$100k - $180k",
-        "demand_level": "Medium",
-        "demand_growth": "+5%",
-        "top_skills": ["Agile", "Jira", "Strategy", "User Research", "SQL"],
-        "avg_tenure": "2.0 years"
-    },
-    "devops engineer": {
-        "salary_range": "$115k - $185k",
-        "demand_level": "High",
-        "demand_growth": "+18%",
-        "top_skills": ["AWS", "Terraform", "Kubernetes", "CI/CD", "Python"],
-        "avg_tenure": "2.2 years"
-    },
-    "full stack developer": {
-        "salary_range": "$100k - $170k",
-        "demand_level": "High",
-        "demand_growth": "+14%",
-        "top_skills": ["React", "Node.js", "TypeScript", "SQL", "AWS"],
-        "avg_tenure": "2.0 years"
-    }
-}
+import json
+import os
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from .skill_matcher import SkillMatcher
+
+DEFAULT_MARKET_DATA = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "market_data.json")
+
+# Role columns copied into every market_analysis result
+ROLE_FIELDS = ("demand_level", "demand_growth", "top_skills", "avg_tenure")
+
+
+class MarketDataset:
+    """
+    Market data per role, loaded from a columnar JSON file:
+
+        {"default_role", "default_region",
+         "roles": {"role": [...], "patterns": [[...]], "demand_level": [...], ...},
+         "salaries": {"role": [...], "region": [...], "salary_range": [...]}}
+
+    Each table is a dict of equal-length columns. Loading indexes role
+    name -> row and (role row, region) -> salary, so lookups never scan.
+    Row order is the tie-break order for role detection.
+    """
+
+    def __init__(self, data: dict):
+        roles = data["roles"]
+        self.roles: List[str] = [role.lower() for role in roles["role"]]
+        self.patterns: List[List[str]] = roles.get("patterns") or [[] for _ in self.roles]
+        self.columns: Dict[str, list] = {field: roles[field] for field in ROLE_FIELDS if field in roles}
+        self._row: Dict[str, int] = {}
+        for i, role in enumerate(self.roles):
+            self._row.setdefault(role, i)
+
+        self.default_region: str = data.get("default_region", "US")
+        self.default_role: str = data.get("default_role", self.roles[-1]).lower()
+        salaries = data.get("salaries", {})
+        self._salary: Dict[tuple, str] = {}
+        for role, region, salary in zip(salaries.get("role", ()), salaries.get("region", ()), salaries.get("salary_range", ())):
+            row = self._row.get(role.lower())
+            if row is not None:
+                self._salary[(row, region.upper())] = salary
+
+    def __len__(self) -> int:
+        return len(self.roles)
+
+    def row(self, role: str) -> Optional[int]:
+        return self._row.get(role.lower())
+
+    def get(self, row: int, region: Optional[str] = None) -> Dict:
+        """Market data for a role row; salary for the region, else the default region."""
+        region = (region or self.default_region).upper()
+        salary = self._salary.get((row, region))
+        if salary is None:
+            region = self.default_region.upper()
+            salary = self._salary.get((row, region), "N/A")
+        return {
+            "role": self.roles[row].title(),
+            "region": region,
+            "salary_range": salary,
+            **{field: values[row] for field, values in self.columns.items()}
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "MarketDataset":
+        with open(path) as f:
+            return cls(json.load(f))
+
+
+class RoleDetector:
+    """
+    Role detection compiled once per dataset.
+
+    Every role name and pattern goes into one Aho-Corasick SkillMatcher, so a
+    text is scanned in a single pass and patterns only match on word
+    boundaries ("sre" does not fire inside "presreading"). The role with the
+    most hits wins, ties going to the earlier dataset row. When nothing
+    matches and role centroids are loaded (unit vectors, one row per role),
+    the text embedding is compared with all of them in one matrix multiply.
+    """
+
+    def __init__(self, dataset: MarketDataset, centroids: Optional[np.ndarray] = None, min_similarity: float = 0.4):
+        self._pattern_rows: Dict[str, int] = {}
+        for row, role in enumerate(dataset.roles):
+            for pattern in [role, *dataset.patterns[row]]:
+                # The first role to claim a pattern keeps it
+                self._pattern_rows.setdefault(" ".join(pattern.lower().split()), row)
+        self.matcher = SkillMatcher(self._pattern_rows)
+        self.centroids = centroids
+        self.min_similarity = min_similarity
+
+    def detect_keywords(self, text: str) -> Optional[int]:
+        if not text:
+            return None
+        hits: Dict[int, int] = {}
+        for _, _, phrase in self.matcher.find_all(text):
+            row = self._pattern_rows[phrase]
+            hits[row] = hits.get(row, 0) + 1
+        if not hits:
+            return None
+        return max(hits, key=lambda row: (hits[row], -row))
+
+    def detect_embedding(self, vec: Optional[np.ndarray]) -> Optional[int]:
+        if self.centroids is None or vec is None:
+            return None
+        norm = np.linalg.norm(vec)
+        if not norm:
+            return None
+        similarities = self.centroids @ (np.asarray(vec, dtype=np.float32) / norm)
+        best = int(np.argmax(similarities))
+        return best if similarities[best] >= self.min_similarity else None
+
+
+def compute_role_centroids(dataset: MarketDataset, encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+    """
+    One unit vector per role: the mean embedding of its name, its patterns and
+    a sentence listing its top skills. `encode` maps texts to a 2-D array.
+    """
+    texts, owners = [], []
+    top_skills = dataset.columns.get("top_skills")
+    for row, role in enumerate(dataset.roles):
+        role_texts = [role, *dataset.patterns[row]]
+        if top_skills:
+            role_texts.append(f"{role.title()} with experience in {', '.join(top_skills[row])}.")
+        texts.extend(role_texts)
+        owners.extend([row] * len(role_texts))
+
+    vectors = np.asarray(encode(texts), dtype=np.float32)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    centroids = np.zeros((len(dataset), vectors.shape[1]), dtype=np.float32)
+    np.add.at(centroids, np.asarray(owners), vectors)
+    centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids
+
+
+def save_role_centroids(path: str, dataset: MarketDataset, centroids: np.ndarray, model: str):
+    np.savez(path, centroids=centroids, roles=np.array(dataset.roles), model=np.array(model))
+
+
+def load_role_centroids(path: str, dataset: MarketDataset, model: str) -> Optional[np.ndarray]:
+    """Centroids from save_role_centroids, or None when they belong to another dataset or model."""
+    with np.load(path) as data:
+        if list(data["roles"]) != dataset.roles:
+            print(f"Role centroids in {path} do not match the market dataset; ignoring them.")
+            return None
+        if str(data["model"]) != model:
+            print(f"Role centroids in {path} were built with {data['model']}, not {model}; ignoring them.")
+            return None
+        return data["centroids"].astype(np.float32)
+
+
+@lru_cache()
+def get_market_dataset() -> MarketDataset:
+    """The dataset at MARKET_DATA_PATH, or the built-in one, indexed once per process."""
+    if settings.market_data_path:
+        try:
+            return MarketDataset.load(settings.market_data_path)
+        except Exception as e:
+            print(f"Could not load market data from {settings.market_data_path}: {e}. Using built-in data.")
+    return MarketDataset.load(DEFAULT_MARKET_DATA)
+
+
+@lru_cache()
+def get_role_detector() -> RoleDetector:
+    dataset = get_market_dataset()
+    centroids = None
+    if settings.market_role_centroids_path:
+        try:
+            centroids = load_role_centroids(settings.market_role_centroids_path, dataset, settings.embedding_model)
+        except Exception as e:
+            print(f"Could not load role centroids from {settings.market_role_centroids_path}: {e}")
+    return RoleDetector(dataset, centroids, settings.market_role_min_similarity)
+
 
 class MarketDataService:
     @staticmethod
-    def get_market_data(resume_text: str, job_description: str = "") -> Dict:
+    def get_market_data(
+        resume_text: str = "",
+        job_description: str = "",
+        context=None,
+        region: Optional[str] = None
+    ) -> Dict:
         """
-        Determines the role from resume/JD and returns market data.
+        Determines the role and returns its market data for a region
+        (MARKET_REGION by default). The JD decides the role; the resume is
+        only consulted when the JD names none. Without a keyword hit, role
+        centroids (when configured) are matched against the JD embedding,
+        then the dataset's default role is used.
         """
-        text_to_search = (job_description + " " + resume_text).lower()
-        
-        # Simple keyword matching to find the role
-        detected_role = "software engineer" # Default
-        
-        # Check specific roles first (longer matches first)
-        if "data scientist" in text_to_search:
-            detected_role = "data scientist"
-        elif "product manager" in text_to_search:
-            detected_role = "product manager"
-        elif "devops" in text_to_search or "sre" in text_to_search:
-            detected_role = "devops engineer"
-        elif "frontend" in text_to_search or "front-end" in text_to_search:
-            detected_role = "frontend developer"
-        elif "backend" in text_to_search or "back-end" in text_to_search:
-            detected_role = "backend developer"
-        elif "full stack" in text_to_search or "fullstack" in text_to_search:
-            detected_role = "full stack developer"
-
-        data = MARKET_DATA.get(detected_role, MARKET_DATA["software engineer"])
-        
-        return {
-            "role": detected_role.title(),
-            **data
-        }
+        if context is not None:
+            resume_text, job_description = context.resume_text, context.jd_text
+        dataset = get_market_dataset()
+        detector = get_role_detector()
+
+        row = detector.detect_keywords(job_description)
+        if row is None:
+            row = detector.detect_keywords(resume_text)
+        if row is None and detector.centroids is not None and context is not None and job_description:
+            row = detector.detect_embedding(context.jd_vec)
+        if row is None:
+            row = dataset.row(dataset.default_role) or 0
+
+        return dataset.get(row, region or settings.market_region)
@@ -0,0 +1,127 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+
+class MetadataStore:
+    """
+    SQLite-backed metadata for VectorStore entries.
+    Rows are written incrementally (no full rewrite on save) and read by ID on
+    demand, so memory use does not grow with the size of the pool. Deleted rows
+    are kept as tombstones until the owning index is compacted.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or ":memory:"
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                external_id TEXT UNIQUE,
+                meta TEXT NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def insert_many(self, metas: List[dict], external_ids: Optional[List[Optional[str]]] = None) -> List[int]:
+        """Insert rows and return their new integer IDs (in input order)."""
+        external_ids = external_ids or [None] * len(metas)
+        now = time.time()
+        ids = []
+        with self._lock, self._conn:
+            for meta, external_id in zip(metas, external_ids):
+                cursor = self._conn.execute(
+                    "INSERT INTO entries (external_id, meta, updated_at) VALUES (?, ?, ?)",
+                    (external_id, json.dumps(meta), now)
+                )
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def insert_with_ids(self, rows: Iterable[tuple]):
+        """Insert (id, meta) rows with explicit IDs (used when migrating legacy stores)."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (id, meta, updated_at) VALUES (?, ?, ?)",
+                ((int(i), json.dumps(meta), now) for i, meta in rows)
+            )
+
+    def get_many(self, ids: Iterable[int], include_deleted: bool = False) -> Dict[int, dict]:
+        """Fetch live rows by ID: {id: {"external_id": ..., "meta": {...}}}."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        query = f"SELECT id, external_id, meta FROM entries WHERE id IN ({placeholders})"
+        if not include_deleted:
+            query += " AND deleted = 0"
+        with self._lock:
+            rows = self._conn.execute(query, ids).fetchall()
+        return {row[0]: {"external_id": row[1], "meta": json.loads(row[2])} for row in rows}
+
+    def resolve(self, external_ids: Iterable[str]) -> Dict[str, int]:
+        """Map external IDs to internal IDs (live rows only)."""
+        external_ids = list(external_ids)
+        if not external_ids:
+            return {}
+        placeholders = ",".join("?" * len(external_ids))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT external_id, id FROM entries WHERE deleted = 0 AND external_id IN ({placeholders})",
+                external_ids
+            ).fetchall()
+        return dict(rows)
+
+    def mark_deleted(self, ids: Iterable[int]) -> int:
+        """Tombstone rows; their external IDs are released for reuse."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return 0
+        placeholders = ",".join("?" * len(ids))
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE entries SET deleted = 1, external_id = NULL, updated_at = ? "
+                f"WHERE deleted = 0 AND id IN ({placeholders})",
+                [time.time(), *ids]
+            )
+        return cursor.rowcount
+
+    def ids(self) -> List[int]:
+        """IDs of all live rows."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM entries WHERE deleted = 0")]
+
+    def delete(self, ids: Iterable[int]) -> int:
+        """Remove rows outright (no tombstone)."""
+        with self._lock, self._conn:
+            return self._conn.executemany("DELETE FROM entries WHERE id = ?", ((int(i),) for i in ids)).rowcount
+
+    def deleted_ids(self) -> List[int]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM entries WHERE deleted = 1")]
+
+    def purge_deleted(self) -> int:
+        with self._lock, self._conn:
+            return self._conn.execute("DELETE FROM entries WHERE deleted = 1").rowcount
+
+    def count(self, deleted: bool = False) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM entries WHERE deleted = ?", (1 if deleted else 0,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,20 @@
+import time
 import spacy
-from sentence_transformers import SentenceTransformer
 import numpy as np
-from typing import List
+from typing import Dict, List
+from .skill_matcher import get_skill_matcher
+from .skill_ontology import get_skill_ontology
+from .embedding_cache import EmbeddingCache
+from .encoders import load_encoder
+from .chunking import chunk_text, mean_pool, pooled_similarities
+from app.core.config import settings
 
 class NLPEngine:
     def __init__(self):
         print("Loading NLP models...")
+        # Seconds spent loading each model, reported by the readiness endpoint
+        self.load_timings: Dict[str, float] = {}
+        start = time.perf_counter()
         # Load spaCy model for NER
         try:
             self.nlp = spacy.load("en_core_web_sm")
@@ -14,19 +23,140 @@ class NLPEngine:
             from spacy.cli import download
             download("en_core_web_sm")
             self.nlp = spacy.load("en_core_web_sm")
+        self.load_timings["spacy"] = time.perf_counter() - start
 
         # Load Sentence Transformer for embeddings
-        self.encoder = SentenceTransformer('all-MiniLM-L6-v2')
+        start = time.perf_counter()
+        self.model_name = settings.embedding_model
+        self.encoder_backend = settings.encoder_backend
+        try:
+            self.encoder = load_encoder(
+                self.model_name,
+                backend=self.encoder_backend,
+                export_dir=settings.encoder_export_dir,
+                quantization=settings.encoder_quantization
+            )
+        except Exception as e:
+            # Typically the optional ONNX dependencies (optimum, onnxruntime) are missing
+            print(f"Encoder backend '{self.encoder_backend}' unavailable ({e}). Falling back to torch.")
+            self.encoder_backend = "torch"
+            self.encoder = load_encoder(self.model_name)
+        self.load_timings["encoder"] = time.perf_counter() - start
+        # Vectors from different backends drift slightly, so each backend gets its own cache namespace
+        cache_model = self.model_name if self.encoder_backend == "torch" else f"{self.model_name}@{self.encoder_backend}"
+        self.embedding_cache = EmbeddingCache(
+            model_name=cache_model,
+            max_bytes=settings.embedding_cache_max_bytes,
+            persist_dir=settings.embedding_cache_dir,
+            read_only=settings.embedding_cache_read_only,
+            max_disk_bytes=settings.embedding_cache_max_disk_bytes
+        )
+        self.embedding_mode = settings.embedding_mode
+        self.chunk_pooling = settings.chunk_pooling
         print("NLP models loaded.")
 
+    def warmup(self) -> Dict[str, float]:
+        """
+        Run dummy work through each model so lazy initialisation, kernel
+        selection and buffer allocation happen before the first real request.
+        Bypasses the embedding cache so the encoder itself is exercised.
+        Returns seconds spent per model.
+        """
+        samples = [
+            "Senior software engineer with Python, React and AWS experience.",
+            "Led a team of 5 engineers to deploy ML models on Kubernetes, reducing latency by 40%.",
+            "We are looking for a backend developer familiar with Docker and PostgreSQL."
+        ]
+        timings = {}
+
+        start = time.perf_counter()
+        for doc in self.nlp.pipe(samples):
+            self.extract_entities(doc.text, doc=doc)
+        self.extract_skills(" ".join(samples))
+        timings["spacy"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.encoder.encode(samples[0])
+        self.encoder.encode(samples, batch_size=len(samples))
+        timings["encoder"] = time.perf_counter() - start
+        return timings
+
+    @property
+    def chunked(self) -> bool:
+        return self.embedding_mode == "chunked"
+
     def get_embedding(self, text: str) -> np.ndarray:
-        """Generate vector embedding for text."""
+        """Generate vector embedding for text (served from the embedding cache when possible)."""
+        cached = self.embedding_cache.get(text)
+        if cached is not None:
+            return cached
         message_embedding = self.encoder.encode(text)
+        self.embedding_cache.put(text, message_embedding)
         return message_embedding
 
-    def extract_entities(self, text: str) -> dict:
+    def get_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        Generate embeddings for many texts in a single encoder batch.
+        Cached texts are skipped; only the misses are sent to the encoder.
+        """
+        if not texts:
+            return np.zeros((0, self.encoder.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        vectors = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, vectors) if v is None))
+        if missing:
+            encoded = dict(zip(missing, self.encoder.encode(missing, batch_size=batch_size)))
+            for text, vec in encoded.items():
+                self.embedding_cache.put(text, vec)
+            vectors = [v if v is not None else encoded[t] for t, v in zip(texts, vectors)]
+        return np.stack(vectors)
+
+    def chunk_text(self, text: str) -> List[str]:
+        return chunk_text(text, settings.chunk_max_words, settings.chunk_overlap_words)
+
+    def get_chunk_embeddings(self, texts: List[str], batch_size: int = 32) -> List[np.ndarray]:
+        """
+        Chunk every text and encode all chunks in one batch.
+        Returns one (n_chunks, dim) matrix per text. Chunks go through the
+        embedding cache, so a resume seen before only costs its lookup.
+        """
+        chunk_lists = [self.chunk_text(text) for text in texts]
+        vecs = self.get_embeddings([c for chunks in chunk_lists for c in chunks], batch_size=batch_size)
+        out, offset = [], 0
+        for chunks in chunk_lists:
+            out.append(vecs[offset:offset + len(chunks)])
+            offset += len(chunks)
+        return out
+
+    def chunked_similarities(self, texts: List[str], jd_chunks: np.ndarray, batch_size: int = 32) -> np.ndarray:
+        """Pooled chunk similarity of each text against pre-encoded JD chunks."""
+        return pooled_similarities(
+            self.get_chunk_embeddings(texts, batch_size=batch_size),
+            jd_chunks,
+            strategy=self.chunk_pooling,
+            top_k=settings.chunk_top_k
+        )
+
+    def get_document_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """
+        One vector per document for indexing: the full-text embedding, or in
+        chunked mode the mean of the chunk vectors (so no part of a long resume is dropped).
+        """
+        if not self.chunked:
+            return self.get_embeddings(texts, batch_size=batch_size)
+        if not texts:
+            return np.zeros((0, self.encoder.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.stack([mean_pool(chunks) for chunks in self.get_chunk_embeddings(texts, batch_size=batch_size)])
+
+    def get_document_embedding(self, text: str) -> np.ndarray:
+        if not self.chunked:
+            return self.get_embedding(text)
+        return self.get_document_embeddings([text])[0]
+
+    def extract_entities(self, text: str, doc=None) -> dict:
         """Extract named entities (ORG, PERSON, GPE, etc.)."""
-        doc = self.nlp(text)
+        if doc is None:
+            doc = self.nlp(text)
         entities = {}
         for ent in doc.ents:
             if ent.label_ not in entities:
@@ -42,32 +172,23 @@ class NLPEngine:
             return 0.0
         return np.dot(vec1, vec2) / (norm1 * norm2)
 
+    def compute_similarities(self, matrix: np.ndarray, vec: np.ndarray) -> np.ndarray:
+        """Compute cosine similarity between every row of a matrix and one vector."""
+        matrix = np.atleast_2d(matrix)
+        row_norms = np.linalg.norm(matrix, axis=1)
+        vec_norm = np.linalg.norm(vec)
+        denom = row_norms * vec_norm
+        sims = np.zeros(matrix.shape[0], dtype=np.float64)
+        nonzero = denom > 0
+        sims[nonzero] = (matrix[nonzero] @ vec) / denom[nonzero]
+        return sims
+
     def extract_skills(self, text: str) -> List[str]:
         """
         Extract skills using a predefined whitelist (keyword matching).
         This is much more accurate than generic noun chunking.
+        Uses the compiled SkillMatcher, so no spaCy pass is needed and
+        multi-word skills of any length ("ruby on rails") are found.
+        Synonyms are reported once, under their canonical name ("k8s" -> "kubernetes").
         """
-        from .skills_data import SKILL_DB
-        
-        doc = self.nlp(text.lower())
-        skills = set()
-        
-        # 1. Direct Token Match
-        for token in doc:
-            if token.text in SKILL_DB:
-                skills.add(token.text)
-                
-        # 2. Phrase Matching (Simple N-gram lookahead for multi-word skills like "node.js" or "spring boot")
-        # Converting text to list of words for simple sliding window
-        words = [token.text for token in doc]
-        for i in range(len(words) - 1):
-            bigram = f"{words[i]} {words[i+1]}"
-            if bigram in SKILL_DB:
-                skills.add(bigram)
-                
-        # 3. Handle special cases manually (e.g., C++, C# which might be split)
-        if "c++" in text.lower(): skills.add("c++")
-        if "c#" in text.lower(): skills.add("c#")
-        if ".net" in text.lower(): skills.add(".net")
-
-        return list(skills)
+        return get_skill_ontology().canonicalize(get_skill_matcher().extract(text))
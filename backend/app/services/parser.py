@@ -1,26 +1,240 @@
 import io
 import re
-from pdfminer.high_level import extract_text as extract_pdf_text
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import BinaryIO, Dict, Optional, Tuple, Union
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from app.core.config import settings
 # from docx import Document
 
+# Raw upload bytes, or the path of an upload spooled to disk
+DocumentSource = Union[bytes, str]
+
+# Bump whenever extraction or cleaning changes so stale cache entries are ignored
+PARSER_VERSION = "1"
+
+
+@dataclass(frozen=True)
+class ParsedDocument:
+    text: str
+    sections: Dict[str, str] = field(default_factory=dict)
+    kind: str = "text"
+    # "success" | "partial" | "timeout" | "too_large" | "failed"
+    status: str = "success"
+    detail: str = ""
+    # "pages" or "time" when extraction stopped early because of a budget
+    truncated_by: str = ""
+
+    @property
+    def size(self) -> int:
+        return len(self.text) + sum(len(v) for v in self.sections.values())
+
+    @property
+    def cacheable(self) -> bool:
+        # Time-truncated output depends on machine load, so it is never reused
+        return bool(self.text) and self.truncated_by != "time"
+
+
+class ParseCache:
+    """
+    LRU of parsed uploads keyed by SHA-256 of the raw bytes, the document kind
+    and PARSER_VERSION. Bounded by the total size of the cached text.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, ParsedDocument]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(content: Optional[bytes], kind: str, digest: Optional[str] = None) -> str:
+        """Cache key from the raw bytes, or from their SHA-256 hex digest when it was computed while reading."""
+        digest = digest or hashlib.sha256(content).hexdigest()
+        return f"{PARSER_VERSION}:{kind}:{digest}"
+
+    def get(self, key: str) -> Optional[ParsedDocument]:
+        with self._lock:
+            doc = self._entries.get(key)
+            if doc is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return doc
+
+    def put(self, key: str, doc: ParsedDocument):
+        with self._lock:
+            if key in self._entries or doc.size > self.max_bytes:
+                return
+            self._entries[key] = doc
+            self._bytes += doc.size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+
 class ResumeParser:
+    cache = ParseCache(settings.parse_cache_max_bytes)
+
+    @staticmethod
+    def detect_kind(filename: str) -> str:
+        """Map an upload filename to the parser that handles it."""
+        filename = (filename or "").lower()
+        if filename.endswith(".pdf"):
+            return "pdf"
+        if filename.endswith(".docx"):
+            return "docx"
+        return "text"
+
     @staticmethod
-    def parse_pdf(file_bytes: bytes) -> str:
-        """Extract text from PDF bytes."""
+    def parse_document(
+        content: DocumentSource,
+        kind: str,
+        max_pages: int = 0,
+        time_budget: Optional[float] = None
+    ) -> ParsedDocument:
+        """
+        Extract text and sections from raw upload bytes or a spooled file path (uncached).
+        PDFs stop early after max_pages pages or once time_budget seconds have
+        elapsed, returning what was read so far with status "partial".
+        """
+        truncated_by = ""
+        if kind == "pdf":
+            deadline = time.monotonic() + time_budget if time_budget else None
+            text, truncated_by = ResumeParser.extract_pdf(content, max_pages=max_pages, deadline=deadline)
+        elif kind == "docx":
+            text = ResumeParser.parse_docx(content)
+        else:
+            with ResumeParser.open_source(content) as f:
+                text = f.read().decode("utf-8", errors="ignore")
+
+        if not text:
+            status, detail = "failed", "No text could be extracted."
+        elif truncated_by == "pages":
+            status, detail = "partial", f"Only the first {max_pages} pages were analyzed."
+        elif truncated_by == "time":
+            status, detail = "partial", "Extraction hit its time budget; only the pages read so far were analyzed."
+        else:
+            status, detail = "success", ""
+
+        return ParsedDocument(
+            text=text,
+            sections=ResumeParser.extract_sections(text),
+            kind=kind,
+            status=status,
+            detail=detail,
+            truncated_by=truncated_by
+        )
+
+    @staticmethod
+    def parse_upload(content: bytes, filename: str) -> ParsedDocument:
+        """
+        Parse an uploaded file, reusing the result for byte-identical uploads
+        (the same resume resubmitted, or the same file sent as resume and JD).
+        """
+        kind = ResumeParser.detect_kind(filename)
+        key = ParseCache.key(content, kind)
+        doc = ResumeParser.cache.get(key)
+        if doc is None:
+            doc = ResumeParser.parse_document(content, kind, max_pages=settings.parse_max_pages)
+            # Failed extractions are not cached so a retry gets a fresh attempt
+            if doc.cacheable:
+                ResumeParser.cache.put(key, doc)
+        return doc
+
+    @staticmethod
+    async def parse_upload_async(content: DocumentSource, filename: str, digest: Optional[str] = None) -> ParsedDocument:
+        """
+        parse_upload for the request path: the cache is checked in-process and
+        misses go through the ExtractionService (isolated workers, budgets, timeouts).
+        A spooled upload is passed as its path plus the SHA-256 digest taken while
+        it was read, so the bytes are neither loaded nor copied to the worker.
+        """
+        from .extraction_service import get_extraction_service
+
+        kind = ResumeParser.detect_kind(filename)
+        key = ParseCache.key(content if digest is None else None, kind, digest)
+        doc = ResumeParser.cache.get(key)
+        if doc is None:
+            doc = await get_extraction_service().extract(content, kind)
+            if doc.cacheable:
+                ResumeParser.cache.put(key, doc)
+        return doc
+
+    @staticmethod
+    def open_source(source: DocumentSource) -> BinaryIO:
+        # BytesIO over bytes shares the buffer instead of copying it
+        return open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+
+    @staticmethod
+    def extract_pdf(
+        file_bytes: DocumentSource,
+        max_pages: int = 0,
+        deadline: Optional[float] = None
+    ) -> Tuple[str, str]:
+        """
+        Page-by-page PDF extraction with optional budgets.
+        Returns (cleaned text, truncated_by) where truncated_by is "", "pages" or "time".
+        """
+        truncated_by = ""
         try:
-            with io.BytesIO(file_bytes) as f:
-                text = extract_pdf_text(f)
-            return ResumeParser._clean_text(text)
+            with ResumeParser.open_source(file_bytes) as f, io.StringIO() as out:
+                rsrcmgr = PDFResourceManager()
+                device = TextConverter(rsrcmgr, out, laparams=LAParams())
+                interpreter = PDFPageInterpreter(rsrcmgr, device)
+                for page_number, page in enumerate(PDFPage.get_pages(f)):
+                    if max_pages and page_number >= max_pages:
+                        truncated_by = "pages"
+                        break
+                    if deadline is not None and time.monotonic() > deadline:
+                        truncated_by = "time"
+                        break
+                    interpreter.process_page(page)
+                device.close()
+                text = out.getvalue()
+            return ResumeParser._clean_text(text), truncated_by
         except Exception as e:
             print(f"Error parsing PDF: {e}")
-            return ""
+            return "", ""
+
+    @staticmethod
+    def parse_pdf(file_bytes: DocumentSource) -> str:
+        """Extract text from PDF bytes (or a file path)."""
+        text, _ = ResumeParser.extract_pdf(file_bytes)
+        return text
 
     @staticmethod
-    def parse_docx(file_bytes: bytes) -> str:
-        """Extract text from DOCX bytes."""
+    def parse_docx(file_bytes: DocumentSource) -> str:
+        """Extract text from DOCX bytes (or a file path)."""
         try:
             from docx import Document
-            with io.BytesIO(file_bytes) as f:
+            with ResumeParser.open_source(file_bytes) as f:
                 doc = Document(f)
                 text = "\n".join([para.text for para in doc.paragraphs])
             return ResumeParser._clean_text(text)
@@ -0,0 +1,104 @@
+from typing import Dict, List, Tuple
+
+from .parser import ParsedDocument
+from .scorer import Scorer
+from .bullet_analyzer import BulletAnalyzer
+from app.core.config import settings
+from app.core.metrics import stage
+
+
+class CandidateRanker:
+    @staticmethod
+    def rank(
+        nlp_engine,
+        candidates: List[Tuple[str, ParsedDocument]],
+        jd_text: str,
+        include_details: bool = False
+    ) -> Dict:
+        """
+        Score many parsed resumes against one JD and return them best-first.
+        The JD is embedded and skill-extracted once, resumes are embedded in
+        batched encoder calls (whole or chunked, per EMBEDDING_MODE), and
+        scoring runs through Scorer.calculate_scores.
+        Trajectory and bullet analysis are only computed when include_details is set;
+        bullets from all resumes are then tagged in one spaCy stream.
+        """
+        readable = [(name, doc) for name, doc in candidates if doc.text]
+        unreadable = [(name, doc) for name, doc in candidates if not doc.text]
+        texts = [doc.text for _, doc in readable]
+
+        with stage("skills"):
+            jd_skills = nlp_engine.extract_skills(jd_text)
+            resume_skills_list = [nlp_engine.extract_skills(text) for text in texts]
+
+        with stage("embedding"):
+            jd_vec, jd_chunks = None, None
+            if nlp_engine.chunked:
+                jd_chunks = nlp_engine.get_chunk_embeddings([jd_text])[0]
+            else:
+                jd_vec = nlp_engine.get_embedding(jd_text)
+
+            if not texts:
+                semantic_scores = []
+            elif jd_chunks is not None:
+                semantic_scores = nlp_engine.chunked_similarities(texts, jd_chunks, batch_size=settings.embedding_batch_size)
+            else:
+                resume_vecs = nlp_engine.get_embeddings(texts, batch_size=settings.embedding_batch_size)
+                semantic_scores = nlp_engine.compute_similarities(resume_vecs, jd_vec)
+
+        with stage("scoring"):
+            scores = Scorer.calculate_scores(semantic_scores, resume_skills_list, jd_skills)
+
+        bullet_analyses = [None] * len(texts)
+        if include_details:
+            with stage("bullets"):
+                bullet_analyses = BulletAnalyzer.analyze_bullets_batch(
+                    texts, nlp_engine=nlp_engine, batch_size=settings.embedding_batch_size
+                )
+
+        results = []
+        for (name, doc), resume_skills, scoring_result, bullet_analysis in zip(
+            readable, resume_skills_list, scores, bullet_analyses
+        ):
+            entry = {
+                "filename": name,
+                "score": scoring_result["total_score"],
+                "section_scores": scoring_result["section_scores"],
+                "missing_skills": scoring_result["missing_skills"],
+                "present_skills": scoring_result["present_skills"],
+                "resume_parsing_status": doc.status
+            }
+            if include_details:
+                with stage("trajectory"):
+                    trajectory = Scorer.calculate_trajectory(
+                        nlp_engine=nlp_engine,
+                        base_resume_text=doc.text,
+                        job_description=jd_text,
+                        missing_skills=scoring_result["missing_skills"],
+                        current_score=scoring_result["total_score"],
+                        jd_vec=jd_vec,
+                        resume_skills=resume_skills,
+                        jd_skills=jd_skills,
+                        jd_chunks=jd_chunks
+                    )
+                entry["details"] = {"trajectory": trajectory, "bullet_analysis": bullet_analysis}
+            results.append(entry)
+
+        # Stable sort keeps upload order among ties
+        results.sort(key=lambda x: x["score"], reverse=True)
+
+        for name, doc in unreadable:
+            results.append({
+                "filename": name,
+                "score": 0,
+                "resume_parsing_status": doc.status
+            })
+
+        for rank, entry in enumerate(results, start=1):
+            entry["rank"] = rank
+
+        return {
+            "total_candidates": len(candidates),
+            "job_skills": sorted(set(s.lower() for s in jd_skills)),
+            "results": results
+        }
@@ -1,4 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+import numpy as np
+
+from .skill_bitsets import SkillBitMatrix
+from .skill_ontology import get_skill_ontology
 
 class Scorer:
     @staticmethod
@@ -18,9 +22,10 @@ class Scorer:
         """
         
         # 1. Skill Match Score
-        # Normalize skills
-        r_skills = set(s.lower() for s in resume_skills)
-        j_skills = set(s.lower() for s in job_skills)
+        # Normalize skills; synonyms ("k8s", "kubernetes") count as one skill
+        ontology = get_skill_ontology()
+        r_skills = set(ontology.canonicalize(resume_skills))
+        j_skills = set(ontology.canonicalize(job_skills))
         
         if not j_skills:
             skill_score = 100.0 if r_skills else 0.0
@@ -58,6 +63,57 @@ class Scorer:
             "present_skills": present_skills
         }
     
+    @staticmethod
+    def calculate_scores(
+        semantic_scores: np.ndarray,
+        resume_skills_list: List[List[str]],
+        job_skills: List[str]
+    ) -> List[Dict]:
+        """
+        Batch version of calculate_score: one JD against many resumes.
+        Skills are packed into a SkillBitMatrix (interned IDs as bits over the
+        JD's skills), so overlap counts and missing-skill masks for every
+        candidate are a few NumPy operations, as is the score arithmetic.
+        Each returned dict matches what calculate_score gives for that pair;
+        skill lists come back in JD order.
+        """
+        ontology = get_skill_ontology()
+        sem_scores_100 = np.maximum(0.0, np.asarray(semantic_scores, dtype=np.float64)) * 100.0
+        matrix = SkillBitMatrix(ontology, job_skills, resume_skills_list)
+
+        if not matrix.width:
+            present_lists = [ontology.canonicalize(skills) for skills in resume_skills_list]
+            missing_lists = [[] for _ in resume_skills_list]
+            skill_scores = np.array([100.0 if present else 0.0 for present in present_lists])
+        else:
+            present_lists = matrix.names(matrix.bits)
+            missing_lists = matrix.names(matrix.missing_bits())
+            skill_scores = (matrix.intersection_counts() / matrix.width) * 100.0
+
+        final_scores = (0.6 * sem_scores_100) + (0.4 * skill_scores)
+
+        return [
+            {
+                "total_score": int(round(final_scores[i])),
+                "section_scores": {
+                    "semantic": int(round(sem_scores_100[i])),
+                    "skills": int(round(skill_scores[i]))
+                },
+                "missing_skills": missing_lists[i],
+                "present_skills": present_lists[i]
+            }
+            for i in range(len(resume_skills_list))
+        ]
+
+    @staticmethod
+    def score_context(context) -> Dict:
+        """Run calculate_score on the skills and similarity memoized in an AnalysisContext."""
+        return Scorer.calculate_score(
+            semantic_score=context.semantic_score,
+            resume_skills=context.resume_skills,
+            job_skills=context.jd_skills
+        )
+
     @staticmethod
     def generate_recommendations(missing_skills: List[str], score: float) -> List[str]:
         recommendations = []
@@ -73,42 +129,29 @@ class Scorer:
         if not missing_skills:
             return recommendations
 
-        # 2. Category-based specific advice
-        try:
-            from .skills_data import SKILL_CATEGORIES
+        # 2. Category-based specific advice (skill -> category reverse index)
+        categories_missing = get_skill_ontology().group_by_category(missing_skills)
+
+        # Generate advice based on top missing categories
+        if "DevOps & Cloud" in categories_missing:
+            tools = ", ".join(categories_missing["DevOps & Cloud"][:3])
+            recommendations.append(f"☁️ Cloud Gap: The role requires cloud/DevOps skills ({tools}). Consider a mini-project deploying an app to AWS/GCP.")
             
-            missing_set = set(missing_skills)
-            categories_missing = {}
-
-            for category, skills in SKILL_CATEGORIES.items():
-                overlap = missing_set.intersection(skills)
-                if overlap:
-                    categories_missing[category] = list(overlap)
-
-            # Generate advice based on top missing categories
-            if "DevOps & Cloud" in categories_missing:
-                tools = ", ".join(categories_missing["DevOps & Cloud"][:3])
-                recommendations.append(f"☁️ Cloud Gap: The role requires cloud/DevOps skills ({tools}). Consider a mini-project deploying an app to AWS/GCP.")
-                
-            if "AI/ML" in categories_missing:
-                 tools = ", ".join(categories_missing["AI/ML"][:3])
-                 recommendations.append(f"🤖 AI/ML Gap: Missing key data stack skills ({tools}). Highlight any data processing or modeling experience.")
+        if "AI/ML" in categories_missing:
+             tools = ", ".join(categories_missing["AI/ML"][:3])
+             recommendations.append(f"🤖 AI/ML Gap: Missing key data stack skills ({tools}). Highlight any data processing or modeling experience.")
+        
+        if "Frontend" in categories_missing:
+            tools = ", ".join(categories_missing["Frontend"][:3])
+            recommendations.append(f"🎨 Frontend Gap: Key frameworks missing ({tools}). ensure they are listed in your 'Skills' section if you know them.")
             
-            if "Frontend" in categories_missing:
-                tools = ", ".join(categories_missing["Frontend"][:3])
-                recommendations.append(f"🎨 Frontend Gap: Key frameworks missing ({tools}). ensure they are listed in your 'Skills' section if you know them.")
-                
-            if "Database" in categories_missing:
-                tools = ", ".join(categories_missing["Database"][:3])
-                recommendations.append(f"🗄️ Database Gap: Mention your experience with specific DBs ({tools}) to show backend depth.")
-
-            # 3. Soft Skills check
-            if "Soft Skills" in categories_missing:
-                 recommendations.append("Soft Skills: Don't forget to weave leadership and communication keywords into your bullet points.")
-
-        except ImportError:
-            # Fallback if skills_data not found in context (e.g. tests)
-            pass
+        if "Database" in categories_missing:
+            tools = ", ".join(categories_missing["Database"][:3])
+            recommendations.append(f"🗄️ Database Gap: Mention your experience with specific DBs ({tools}) to show backend depth.")
+
+        # 3. Soft Skills check
+        if "Soft Skills" in categories_missing:
+             recommendations.append("Soft Skills: Don't forget to weave leadership and communication keywords into your bullet points.")
 
         return recommendations
 
@@ -118,59 +161,86 @@ class Scorer:
         base_resume_text: str,
         job_description: str,
         missing_skills: List[str],
-        current_score: float
+        current_score: float,
+        jd_vec: Optional[np.ndarray] = None,
+        resume_skills: Optional[List[str]] = None,
+        jd_skills: Optional[List[str]] = None,
+        context=None,
+        jd_chunks: Optional[np.ndarray] = None
     ) -> List[Dict]:
         """
         Simulate how learning specific missing skills impacts the score.
         Returns a list of improvements: { "skill": "React", "new_score": 75, "boost": 15 }
+
+        All augmented resumes are encoded in one batch and scored together.
+        Pass the JD vector and skill lists the caller already computed to avoid
+        re-embedding the JD and re-extracting skills, or an AnalysisContext that
+        memoizes them for the request.
+        With jd_chunks (chunked embedding mode) the augmented resumes are scored
+        by pooled chunk similarity; their unchanged leading chunks hit the cache.
         """
-        trajectory = []
-        
         # Limit simulation to top 5 impactful skills to save compute
         skills_to_sim = missing_skills[:5]
-        
-        # Pre-compute JD embedding once
-        jd_vec = nlp_engine.get_embedding(job_description)
-        jd_skills = nlp_engine.extract_skills(job_description) # Re-extract to be safe/consistent
-        
-        for skill in skills_to_sim:
-            # 1. Augment Text
-            # We append the skill to the text to simulate "learning" it
-            augmented_text = base_resume_text + f" I have advanced experience with {skill}."
-            
-            # 2. Re-calculate Embeddings
-            aug_vec = nlp_engine.get_embedding(augmented_text)
-            
-            # 3. Re-calculate Similarity
-            new_sem_score = nlp_engine.compute_similarity(aug_vec, jd_vec)
-            
-            # 4. Re-calculate Skill Score
-            # We assume we now HAVE this skill
-            temp_resume_skills = nlp_engine.extract_skills(base_resume_text) + [skill]
-            
-            # Reuse core scoring logic (lighter version)
-            r_skills = set(s.lower() for s in temp_resume_skills)
-            j_skills = set(s.lower() for s in jd_skills)
-            
-            if not j_skills:
-                new_skill_score = 100.0 if r_skills else 0.0
-            else:
-                intersection = r_skills.intersection(j_skills)
-                new_skill_score = (len(intersection) / len(j_skills)) * 100.0
-            
-            sem_score_100 = max(0.0, float(new_sem_score)) * 100.0
-            new_final_score = (0.6 * sem_score_100) + (0.4 * new_skill_score)
-            new_final_score = int(round(new_final_score))
-            
-            boost = new_final_score - int(round(current_score))
-            
+        if not skills_to_sim:
+            return []
+
+        if context is not None:
+            jd_vec = context.jd_vec if jd_vec is None else jd_vec
+            jd_skills = context.jd_skills if jd_skills is None else jd_skills
+            resume_skills = context.resume_skills if resume_skills is None else resume_skills
+            if jd_chunks is None and context.chunked:
+                jd_chunks = context.jd_chunk_vecs
+
+        if jd_vec is None and jd_chunks is None:
+            jd_vec = nlp_engine.get_embedding(job_description)
+        if jd_skills is None:
+            jd_skills = nlp_engine.extract_skills(job_description)
+        if resume_skills is None:
+            resume_skills = nlp_engine.extract_skills(base_resume_text)
+
+        # 1. Augment Text
+        # We append the skill to the text to simulate "learning" it
+        augmented_texts = [
+            base_resume_text + f" I have advanced experience with {skill}."
+            for skill in skills_to_sim
+        ]
+
+        # 2. Re-calculate Embeddings and Similarity (one batch)
+        if jd_chunks is not None:
+            new_sem_scores = nlp_engine.chunked_similarities(augmented_texts, jd_chunks)
+        else:
+            aug_vecs = nlp_engine.get_embeddings(augmented_texts)
+            new_sem_scores = nlp_engine.compute_similarities(aug_vecs, jd_vec)
+
+        # 3. Re-calculate Skill Score
+        # We assume we now HAVE this skill
+        ontology = get_skill_ontology()
+        r_skills = set(ontology.canonicalize(resume_skills))
+        j_skills = set(ontology.canonicalize(jd_skills))
+
+        if not j_skills:
+            new_skill_scores = np.full(len(skills_to_sim), 100.0)
+        else:
+            base_overlap = len(r_skills.intersection(j_skills))
+            gained = np.array([
+                1 if (skill in j_skills and skill not in r_skills) else 0
+                for skill in map(ontology.canonical, skills_to_sim)
+            ])
+            new_skill_scores = ((base_overlap + gained) / len(j_skills)) * 100.0
+
+        sem_scores_100 = np.maximum(0.0, new_sem_scores.astype(np.float64)) * 100.0
+        new_final_scores = (0.6 * sem_scores_100) + (0.4 * new_skill_scores)
+        boosts = [int(round(score)) - int(round(current_score)) for score in new_final_scores]
+
+        trajectory = []
+        for skill, new_final_score, boost in zip(skills_to_sim, new_final_scores, boosts):
             if boost > 0:
                 trajectory.append({
                     "skill": skill,
-                    "new_score": new_final_score,
+                    "new_score": int(round(new_final_score)),
                     "boost": boost
                 })
-                
+
         # Sort by impact
         trajectory.sort(key=lambda x: x["boost"], reverse=True)
         return trajectory
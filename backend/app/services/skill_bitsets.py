@@ -0,0 +1,90 @@
+from itertools import chain
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from .skill_ontology import SkillOntology
+
+# Set bits per byte value (np.bitwise_count needs NumPy 2)
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Set bits per row of a packed uint8 matrix."""
+    return _POPCOUNT[bits].sum(axis=-1, dtype=np.int64)
+
+
+class SkillBitMatrix:
+    """
+    Candidate skills against one JD as a packed bit matrix.
+
+    Skills are resolved to their interned ontology IDs (skills the ontology
+    does not know get IDs past its end for this batch). The JD's distinct
+    skills become the columns, in JD order, and each candidate is one row of
+    np.packbits bits, so intersection counts, coverage and missing-skill masks
+    for every candidate come from a handful of array operations. Candidate
+    skills outside the JD are dropped; they never affect the score.
+    """
+
+    def __init__(self, ontology: SkillOntology, job_skills: Iterable[str], candidate_skills: Sequence[Sequence[str]]):
+        extra: Dict[str, int] = {}
+
+        def job_id(term: str) -> int:
+            skill_id = ontology.id_of(term)
+            if skill_id is None:
+                skill_id = extra.setdefault(ontology.canonical(term), len(ontology) + len(extra))
+            return skill_id
+
+        seen: Dict[str, int] = {}
+
+        def candidate_id(term: str) -> int:
+            # Candidates repeat the same skill strings; resolve each one once per batch
+            skill_id = seen.get(term)
+            if skill_id is None:
+                skill_id = ontology.id_of(term)
+                if skill_id is None:
+                    skill_id = extra.get(ontology.canonical(term), -1)
+                seen[term] = skill_id
+            return skill_id
+
+        columns: Dict[int, str] = {}
+        for term in job_skills:
+            columns.setdefault(job_id(term), ontology.canonical(term))
+        job_ids = list(columns)
+        self.columns: List[str] = list(columns.values())
+        self.width = len(job_ids)
+
+        # ID -> column lookup; -1 for skills the JD does not ask for
+        lookup = np.full(len(ontology) + len(extra) + 1, -1, dtype=np.int64)
+        lookup[job_ids] = np.arange(self.width)
+
+        lengths = [len(skills) for skills in candidate_skills]
+        ids = np.fromiter(map(candidate_id, chain.from_iterable(candidate_skills)), dtype=np.int64, count=sum(lengths))
+        row_index = np.repeat(np.arange(len(lengths)), lengths)
+        cols = lookup[ids]  # skills unknown to the batch (-1) hit the sentinel slot and stay -1
+        hit = cols >= 0
+
+        dense = np.zeros((len(lengths), self.width), dtype=bool)
+        dense[row_index[hit], cols[hit]] = True
+        self.bits = np.packbits(dense, axis=1)
+        self.job_bits = np.packbits(np.ones(self.width, dtype=bool))
+
+    def intersection_counts(self) -> np.ndarray:
+        return popcount(self.bits)
+
+    def coverage(self) -> np.ndarray:
+        """Share of the JD's skills each candidate has (0-1); zeros when the JD lists none."""
+        if not self.width:
+            return np.zeros(len(self.bits))
+        return self.intersection_counts() / self.width
+
+    def missing_bits(self) -> np.ndarray:
+        return ~self.bits & self.job_bits
+
+    def names(self, bits: np.ndarray) -> List[List[str]]:
+        """Column names set in each packed row, in JD order."""
+        rows, cols = np.nonzero(np.unpackbits(bits, axis=1, count=self.width))
+        names: List[List[str]] = [[] for _ in range(len(bits))]
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            names[row].append(self.columns[col])
+        return names
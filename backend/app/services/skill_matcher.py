@@ -0,0 +1,112 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, List, Set, Tuple
+
+from .skill_ontology import get_skill_ontology
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace runs so multi-word phrases match across line breaks."""
+    return _WHITESPACE.sub(' ', text.lower())
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a fixed phrase list.
+    Finds every phrase (single words, "ruby on rails", "c++", ".net", ...) in one
+    linear pass over raw text. A match only counts when it sits on word
+    boundaries, so "go" does not fire inside "google" and "java" does not fire
+    inside "javascript". Boundaries are only enforced on sides where the phrase
+    itself starts/ends with a word character, which keeps "c++" and ".net"
+    (e.g. inside "asp.net") matching the way they always have.
+    """
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto = [{}]
+        self._fail = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        self.size = 0
+
+        for phrase in phrases:
+            self._add(_normalize(phrase).strip())
+        self._build_failure_links()
+
+    def _add(self, phrase: str):
+        if not phrase:
+            return
+        node = 0
+        for ch in phrase:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            node = nxt
+        if phrase not in self._out[node]:
+            self._out[node] = self._out[node] + (phrase,)
+            self.size += 1
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit phrases that end at the failure state (suffix matches)
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Return (start, end, phrase) for every boundary-respecting match.
+        Offsets refer to the normalized (lowercased, whitespace-collapsed) text.
+        """
+        normalized = _normalize(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        length = len(normalized)
+        matches = []
+        node = 0
+
+        for i, ch in enumerate(normalized):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if not out[node]:
+                continue
+            end = i + 1
+            for phrase in out[node]:
+                start = end - len(phrase)
+                if _is_word_char(phrase[0]) and start > 0 and _is_word_char(normalized[start - 1]):
+                    continue
+                if _is_word_char(phrase[-1]) and end < length and _is_word_char(normalized[end]):
+                    continue
+                matches.append((start, end, phrase))
+
+        return matches
+
+    def extract(self, text: str) -> Set[str]:
+        """Return the set of distinct phrases found in text."""
+        return {phrase for _, _, phrase in self.find_all(text)}
+
+
+@lru_cache()
+def get_skill_matcher() -> SkillMatcher:
+    """
+    Matcher compiled once over every surface form in the skill ontology and
+    shared by every caller. It reports phrases as written ("k8s"); map them
+    to canonical skills with get_skill_ontology().canonicalize().
+    """
+    return SkillMatcher(get_skill_ontology().aliases)
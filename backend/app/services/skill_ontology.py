@@ -0,0 +1,156 @@
+import json
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from .skills_data import SKILL_CATEGORIES, SKILL_SYNONYMS
+
+ONTOLOGY_VERSION = 1
+
+# (canonical name, category, aliases)
+SkillEntry = Tuple[str, str, Iterable[str]]
+
+
+def normalize_skill(term: str) -> str:
+    """Lowercase and collapse whitespace, the same way the SkillMatcher reports phrases."""
+    return " ".join(term.lower().split())
+
+
+class SkillOntology:
+    """
+    Compiled skill vocabulary, built once and shared read-only.
+
+    Every skill gets an interned integer ID (its index in `names`), a canonical
+    name and a category. `aliases` maps every normalized surface form, the
+    canonical name included, to that ID, so synonyms such as postgres/postgresql
+    or k8s/kubernetes resolve to one skill. `categories[id]` is the
+    skill -> category reverse index and `category_ids` the forward one.
+    """
+
+    def __init__(self, entries: Iterable[SkillEntry]):
+        self.names: List[str] = []
+        self.categories: List[str] = []
+        self.aliases: Dict[str, int] = {}
+        members: Dict[str, Set[int]] = {}
+
+        for name, category, aliases in entries:
+            key = normalize_skill(name)
+            if not key:
+                continue
+            skill_id = self.aliases.get(key)
+            if skill_id is None:
+                skill_id = len(self.names)
+                self.names.append(key)
+                self.categories.append(category)
+                self.aliases[key] = skill_id
+                members.setdefault(category, set()).add(skill_id)
+            for alias in aliases:
+                # The first skill to claim a surface form keeps it
+                self.aliases.setdefault(normalize_skill(alias), skill_id)
+
+        self.category_ids: Dict[str, FrozenSet[int]] = {
+            category: frozenset(ids) for category, ids in members.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, term: str) -> bool:
+        return normalize_skill(term) in self.aliases
+
+    def id_of(self, term: str) -> Optional[int]:
+        # Matcher output is already normalized; only other input pays for normalizing
+        skill_id = self.aliases.get(term)
+        return skill_id if skill_id is not None else self.aliases.get(normalize_skill(term))
+
+    def canonical(self, term: str) -> str:
+        """Canonical name for a skill or any of its aliases; unknown terms come back normalized."""
+        skill_id = self.id_of(term)
+        return self.names[skill_id] if skill_id is not None else normalize_skill(term)
+
+    def canonicalize(self, terms: Iterable[str]) -> List[str]:
+        """Canonical names for terms, de-duplicated in first-seen order."""
+        return list(dict.fromkeys(self.canonical(term) for term in terms))
+
+    def category(self, term: str) -> Optional[str]:
+        skill_id = self.id_of(term)
+        return self.categories[skill_id] if skill_id is not None else None
+
+    def group_by_category(self, terms: Iterable[str]) -> Dict[str, List[str]]:
+        """Canonical skills grouped by category through the reverse index; unknown terms are dropped."""
+        groups: Dict[str, List[str]] = {}
+        for term in terms:
+            skill_id = self.id_of(term)
+            if skill_id is None:
+                continue
+            group = groups.setdefault(self.categories[skill_id], [])
+            if self.names[skill_id] not in group:
+                group.append(self.names[skill_id])
+        return groups
+
+    @classmethod
+    def from_categories(
+        cls,
+        categories: Dict[str, Iterable[str]],
+        synonyms: Optional[Dict[str, Iterable[str]]] = None
+    ) -> "SkillOntology":
+        """
+        Build from {category: skills} plus {canonical: aliases}. Category members
+        that are aliases of another skill fold into it instead of becoming skills.
+        """
+        synonyms = {normalize_skill(k): {normalize_skill(a) for a in v} for k, v in (synonyms or {}).items()}
+        alias_of = {alias: name for name, aliases in synonyms.items() for alias in aliases if alias != name}
+        entries = []
+        for category, skills in categories.items():
+            for skill in sorted(normalize_skill(s) for s in skills):
+                if skill not in alias_of:
+                    entries.append((skill, category, sorted(synonyms.get(skill, ()))))
+        return cls(entries)
+
+    def to_dict(self) -> dict:
+        aliases: List[List[str]] = [[] for _ in self.names]
+        for alias, skill_id in self.aliases.items():
+            if alias != self.names[skill_id]:
+                aliases[skill_id].append(alias)
+        return {
+            "version": ONTOLOGY_VERSION,
+            "skills": [
+                {"name": name, "category": category, "aliases": sorted(skill_aliases)}
+                for name, category, skill_aliases in zip(self.names, self.categories, aliases)
+            ]
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SkillOntology":
+        return cls(
+            (skill["name"], skill.get("category", "Other"), skill.get("aliases", ()))
+            for skill in data["skills"]
+        )
+
+    def save(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillOntology":
+        """
+        Load a JSON ontology: {"skills": [{"name", "category", "aliases"}, ...]}.
+        Entries are flat records, so files with tens of thousands of skills load
+        in a single json.load and one pass.
+        """
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+@lru_cache()
+def get_skill_ontology() -> SkillOntology:
+    """
+    The ontology every service shares: SKILL_ONTOLOGY_PATH when set,
+    otherwise the built-in categories and synonyms from skills_data.
+    """
+    if settings.skill_ontology_path:
+        try:
+            return SkillOntology.load(settings.skill_ontology_path)
+        except Exception as e:
+            print(f"Could not load skill ontology from {settings.skill_ontology_path}: {e}. Using built-in skills.")
+    return SkillOntology.from_categories(SKILL_CATEGORIES, SKILL_SYNONYMS)
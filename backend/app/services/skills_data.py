@@ -5,7 +5,7 @@ SKILL_CATEGORIES = {
         "python", "java", "c++", "c#", "javascript", "typescript", "ruby", "go", "golang", "swift", "kotlin", "php", "rust", "scala", "r", "matlab", "perl", "lua", "dart", "html", "css", "sql", "bash", "shell", "powershell"
     },
     "Frontend": {
-        "react", "react.js", "angular", "vue", "vue.js", "next.js", "nuxt.js", "svelte", "jquery", "bootstrap", "tailwind", "express", "express.js", "django", "flask", "fastapi", "spring", "spring boot", "rails", "ruby on rails", "asp.net", "laravel", "symfony", "node.js", "nodejs"
+        "react", "react.js", "angular", "vue", "vue.js", "next.js", "nuxt.js", "svelte", "jquery", "bootstrap", "tailwind", "express", "express.js", "django", "flask", "fastapi", "spring", "spring boot", "rails", "ruby on rails", "asp.net", ".net", "laravel", "symfony", "node.js", "nodejs"
     },
     "AI/ML": {
         "tensorflow", "keras", "pytorch", "scikit-learn", "sklearn", "pandas", "numpy", "matplotlib", "seaborn", "opencv", "nltk", "spacy", "spark", "hadoop", "tableau", "power bi", "jupyter", "xgboost", "lightgbm", "catboost", "hugging face", "transformers", "llm", "bert", "gpt", "nlp", "computer vision", "statistics", "probability"
@@ -29,3 +29,30 @@ SKILL_CATEGORIES = {
 
 # Flatten for NLP extraction
 SKILL_DB = set().union(*SKILL_CATEGORIES.values())
+
+# Synonyms: canonical skill -> surface forms that mean the same thing.
+# Aliases listed in SKILL_CATEGORIES collapse into their canonical skill in the ontology.
+SKILL_SYNONYMS = {
+    "go": {"golang"},
+    "react": {"react.js", "reactjs"},
+    "vue": {"vue.js", "vuejs"},
+    "express": {"express.js", "expressjs"},
+    "node.js": {"nodejs", "node js"},
+    "next.js": {"nextjs"},
+    "nuxt.js": {"nuxtjs"},
+    "ruby on rails": {"rails", "ror"},
+    "spring boot": {"springboot"},
+    "scikit-learn": {"sklearn", "scikit learn"},
+    "hugging face": {"huggingface"},
+    "postgresql": {"postgres", "psql"},
+    "mongodb": {"mongo"},
+    "mssql": {"sql server", "microsoft sql server"},
+    "elasticsearch": {"elastic search"},
+    "aws": {"amazon web services"},
+    "gcp": {"google cloud", "google cloud platform"},
+    "azure": {"microsoft azure"},
+    "kubernetes": {"k8s"},
+    "github actions": {"gh actions"},
+    "rest": {"restful", "rest api", "rest apis"},
+    "ci/cd": {"cicd", "ci cd"},
+}
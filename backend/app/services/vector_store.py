@@ -1,56 +1,323 @@
+import contextlib
 import faiss
 import numpy as np
 import pickle
 import os
+from typing import Dict, List, Optional
+
+from .metadata_store import MetadataStore
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+
 
 class VectorStore:
-    def __init__(self, dimension: int = 384, index_path: str = "faiss_index.bin"):
+    def __init__(
+        self,
+        dimension: int = 384,
+        index_path: Optional[str] = None,
+        index_type: str = "flat",
+        nlist: int = 1024,
+        nprobe: int = 16,
+        hnsw_m: int = 32,
+        ef_search: int = 64,
+        defer_ivf_build: bool = False
+    ):
+        """
+        index_type selects the FAISS structure behind the store:
+        - "flat": exact search, cost grows linearly with the pool
+        - "ivf":  inverted lists over nlist centroids, nprobe lists scanned per query.
+                  Needs training, so the store stays flat until it holds enough
+                  vectors and then rebuilds itself as IVF. With defer_ivf_build
+                  the owner runs build_ivf() itself (e.g. in a background thread)
+                  instead of adds training k-means inline.
+        - "hnsw": graph search with hnsw_m links per node, no training needed.
+                  HNSW cannot delete in place; removed entries are tombstoned
+                  and filtered from results until compact() rebuilds the graph.
+
+        Entries get stable int64 IDs (optionally tied to a caller-supplied
+        external ID). Metadata lives in SQLite next to the index file and is
+        read per hit, so it never has to be loaded into RAM as a whole.
+        The index file is saved less often than metadata is committed, so
+        load() reconciles the two. Without an index_path everything stays in memory.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown index type: {index_type} (expected one of {INDEX_TYPES})")
         self.dimension = dimension
         self.index_path = index_path
-        self.index = faiss.IndexFlatIP(dimension)  # Inner Product (Cosine Sim if normalized)
-        self.metadata = {}  # Map ID to metadata
-        self.id_counter = 0
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+        self.defer_ivf_build = defer_ivf_build
+        self.index = self._new_index()
+        self.metadata = MetadataStore(index_path + ".sqlite" if index_path else None)
+
+    @property
+    def ivf_train_size(self) -> int:
+        # FAISS wants ~39 training points per centroid
+        return self.nlist * 39
+
+    def _new_index(self):
+        if self.index_type == "hnsw":
+            inner = faiss.IndexHNSWFlat(self.dimension, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            inner.hnsw.efSearch = self.ef_search
+        else:
+            # "ivf" starts out flat until there is enough data to train on
+            inner = faiss.IndexFlatIP(self.dimension)  # Inner Product (Cosine Sim if normalized)
+        return faiss.IndexIDMap2(inner)
+
+    def _apply_search_params(self):
+        # Search-time knobs are not persisted by FAISS
+        if isinstance(self.index, faiss.IndexIVF):
+            self.index.nprobe = self.nprobe
+        elif isinstance(self.index, faiss.IndexIDMap):
+            inner = faiss.downcast_index(self.index.index)
+            if isinstance(inner, faiss.IndexHNSW):
+                inner.hnsw.efSearch = self.ef_search
+
+    def _uses_tombstones(self) -> bool:
+        return self.index_type == "hnsw"
+
+    def _is_untrained_ivf(self) -> bool:
+        return self.index_type == "ivf" and not isinstance(self.index, faiss.IndexIVF)
 
-    def add_vector(self, vector: np.ndarray, meta: dict) -> int:
+    def _stored_vectors(self):
+        """(vectors, ids) currently held by an ID-mapped index."""
+        ids = faiss.vector_to_array(self.index.id_map).astype("int64")
+        inner = faiss.downcast_index(self.index.index)
+        vectors = inner.reconstruct_n(0, inner.ntotal) if inner.ntotal else np.zeros((0, self.dimension), "float32")
+        return vectors, ids
+
+    def _index_ids(self) -> np.ndarray:
+        """IDs of every vector in the index, tombstoned ones included."""
+        if isinstance(self.index, faiss.IndexIVF):
+            invlists = self.index.invlists
+            lists = [
+                faiss.rev_swig_ptr(invlists.get_ids(i), invlists.list_size(i)).copy()
+                for i in range(self.index.nlist) if invlists.list_size(i)
+            ]
+            return np.concatenate(lists).astype("int64") if lists else np.zeros(0, "int64")
+        return faiss.vector_to_array(self.index.id_map).astype("int64")
+
+    def ivf_build_due(self) -> bool:
+        return self._is_untrained_ivf() and self.index.ntotal >= self.ivf_train_size
+
+    def build_ivf(self, lock=None) -> bool:
+        """
+        Swap the interim flat index for a trained IVF index once enough vectors
+        exist. `lock` (the owner's lock around this store) is held only to take
+        a snapshot and to swap; k-means training and the bulk add run without
+        it, and changes made meanwhile are applied before the swap.
+        """
+        lock = lock or contextlib.nullcontext()
+        with lock:
+            if not self.ivf_build_due():
+                return False
+            vectors, ids = self._stored_vectors()
+        quantizer = faiss.IndexFlatIP(self.dimension)
+        ivf = faiss.IndexIVFFlat(quantizer, self.dimension, self.nlist, faiss.METRIC_INNER_PRODUCT)
+        ivf.train(vectors)
+        ivf.add_with_ids(vectors, ids)
+        with lock:
+            if not self._is_untrained_ivf():
+                return False
+            current = faiss.vector_to_array(self.index.id_map).astype("int64")
+            added = np.flatnonzero(~np.isin(current, ids))
+            if len(added):
+                inner = faiss.downcast_index(self.index.index)
+                ivf.add_with_ids(np.vstack([inner.reconstruct(int(i)) for i in added]), current[added])
+            removed = ids[~np.isin(ids, current)]
+            if len(removed):
+                ivf.remove_ids(removed)
+            self.index = ivf
+            self._apply_search_params()
+        return True
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        # FAISS expects contiguous float32; copy so callers' arrays are never normalized in place
+        vectors = np.array(vectors, dtype="float32", copy=True)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError(f"Vector dimension mismatch: {vectors.shape[-1]} vs {self.dimension}")
+        faiss.normalize_L2(vectors)  # Normalize for Cosine Similarity via IP
+        return vectors
+
+    def add_vectors(
+        self,
+        vectors: np.ndarray,
+        metas: List[dict],
+        external_ids: Optional[List[Optional[str]]] = None
+    ) -> List[int]:
+        """
+        Add many vectors in one index call and return their IDs.
+        An external ID that already exists is replaced (upsert).
+        """
+        vectors = self._prepare(vectors)
+        if len(vectors) != len(metas):
+            raise ValueError("vectors and metas must have the same length")
+        if external_ids is not None:
+            existing = self.metadata.resolve(e for e in external_ids if e is not None)
+            if existing:
+                self.remove(list(existing.values()))
+
+        ids = self.metadata.insert_many(metas, external_ids)
+        self.index.add_with_ids(vectors, np.asarray(ids, dtype="int64"))
+        if not self.defer_ivf_build:
+            self.build_ivf()
+        return ids
+
+    def add_vector(self, vector: np.ndarray, meta: dict, external_id: Optional[str] = None) -> int:
         """Add a vector to the index."""
         if vector.shape[0] != self.dimension:
             raise ValueError(f"Vector dimension mismatch: {vector.shape[0]} vs {self.dimension}")
-        
-        # FAISS expects float32
-        vector = vector.astype('float32').reshape(1, -1)
-        faiss.normalize_L2(vector)  # Normalize for Cosine Similarity via IP
-        
-        self.index.add(vector)
-        doc_id = self.id_counter
-        self.metadata[doc_id] = meta
-        self.id_counter += 1
-        return doc_id
+        return self.add_vectors(vector.reshape(1, -1), [meta], [external_id])[0]
 
-    def search(self, vector: np.ndarray, k: int = 5):
-        """Search for compliant vectors."""
-        vector = vector.astype('float32').reshape(1, -1)
-        faiss.normalize_L2(vector)
-        
-        distances, indices = self.index.search(vector, k)
-        results = []
-        for i, idx in enumerate(indices[0]):
-            if idx != -1 and idx in self.metadata:
+    def remove(self, ids: List[int]) -> int:
+        """Delete entries by ID. Returns how many live entries were removed."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return 0
+        removed = self.metadata.mark_deleted(ids)
+        if not self._uses_tombstones():
+            self.index.remove_ids(np.asarray(ids, dtype="int64"))
+        return removed
+
+    def remove_external(self, external_ids: List[str]) -> int:
+        return self.remove(list(self.metadata.resolve(external_ids).values()))
+
+    def get(self, doc_id: int) -> Optional[dict]:
+        row = self.metadata.get_many([doc_id]).get(int(doc_id))
+        return row["meta"] if row else None
+
+    def search_batch(self, vectors: np.ndarray, k: int = 5) -> List[List[Dict]]:
+        """Search many query vectors in one index call."""
+        queries = self._prepare(vectors)
+        if self.index.ntotal == 0:
+            return [[] for _ in range(len(queries))]
+
+        fetch = k
+        if self._uses_tombstones():
+            # Over-fetch so tombstoned hits do not shrink the result list
+            fetch += self.metadata.count(deleted=True)
+        fetch = min(fetch, self.index.ntotal)
+
+        distances, indices = self.index.search(queries, fetch)
+        rows = self.metadata.get_many({int(i) for i in indices.ravel() if i != -1})
+
+        batch = []
+        for q in range(len(queries)):
+            results = []
+            for dist, idx in zip(distances[q], indices[q]):
+                row = rows.get(int(idx))
+                if idx == -1 or row is None:
+                    continue
                 results.append({
                     "id": int(idx),
-                    "score": float(distances[0][i]),
-                    "metadata": self.metadata[idx]
+                    "external_id": row["external_id"],
+                    "score": float(dist),
+                    "metadata": row["meta"]
                 })
-        return results
+                if len(results) == k:
+                    break
+            batch.append(results)
+        return batch
+
+    def search(self, vector: np.ndarray, k: int = 5):
+        """Search for compliant vectors."""
+        return self.search_batch(vector.reshape(1, -1), k)[0]
+
+    def _rebuild_without(self, drop: np.ndarray):
+        vectors, ids = self._stored_vectors()
+        keep = ~np.isin(ids, drop)
+        self.index = self._new_index()
+        if keep.any():
+            self.index.add_with_ids(vectors[keep], ids[keep])
+
+    def compact(self) -> int:
+        """Rebuild the index without tombstoned entries and purge their metadata."""
+        dead = self.metadata.deleted_ids()
+        if dead and self._uses_tombstones():
+            self._rebuild_without(np.asarray(dead, dtype="int64"))
+        return self.metadata.purge_deleted()
+
+    def reconcile(self) -> int:
+        """
+        Bring the index and the metadata back in line after an unclean stop.
+        Metadata rows committed after the last index save have lost their
+        vectors and are deleted (their resumes need re-adding); vectors whose
+        metadata was deleted or purged since are dropped from the index.
+        Returns how many entries were fixed.
+        """
+        indexed = self._index_ids()
+        live = np.asarray(self.metadata.ids(), dtype="int64")
+        lost = live[~np.isin(live, indexed)]
+        if len(lost):
+            self.metadata.delete(lost.tolist())
+            print(f"Dropped {len(lost)} pooled entries added after the last index save; re-add those resumes.")
+
+        known = live
+        if self._uses_tombstones():
+            known = np.concatenate([live, np.asarray(self.metadata.deleted_ids(), dtype="int64")])
+        orphans = indexed[~np.isin(indexed, known)]
+        if len(orphans):
+            if self._uses_tombstones():
+                self._rebuild_without(orphans)
+            else:
+                self.index.remove_ids(orphans)
+            print(f"Removed {len(orphans)} index entries deleted after the last index save.")
+
+        if len(lost) or len(orphans):
+            self.save()
+        return len(lost) + len(orphans)
+
+    def __len__(self):
+        if self._uses_tombstones():
+            return self.index.ntotal - self.metadata.count(deleted=True)
+        return self.index.ntotal
 
     def save(self):
-        """Save index and metadata to disk."""
-        faiss.write_index(self.index, self.index_path)
-        with open(self.index_path + ".meta", "wb") as f:
-            pickle.dump(self.metadata, f)
+        """Save the index to disk. Metadata is already persisted row by row."""
+        if not self.index_path:
+            return
+        directory = os.path.dirname(self.index_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        faiss.write_index(self.index, tmp_path)
+        os.replace(tmp_path, self.index_path)  # Readers never see a half-written index
 
     def load(self):
-        """Load index and metadata from disk."""
+        """
+        Load the index from disk, migrating a legacy pickled-metadata store if
+        present, and reconcile it with the metadata.
+        """
+        if not self.index_path:
+            return
         if os.path.exists(self.index_path):
             self.index = faiss.read_index(self.index_path)
-            with open(self.index_path + ".meta", "rb") as f:
-                self.metadata = pickle.load(f)
+            if os.path.exists(self.index_path + ".meta"):
+                self._migrate_legacy_metadata()
+            self._apply_search_params()
+        self.reconcile()
+        if not self.defer_ivf_build:
+            self.build_ivf()
+
+    def _migrate_legacy_metadata(self):
+        """
+        Older stores kept sequential IDs in an un-mapped index and pickled metadata.
+        Move the metadata into SQLite under the same IDs and wrap the index in an ID map.
+        """
+        legacy_path = self.index_path + ".meta"
+        with open(legacy_path, "rb") as f:
+            legacy = pickle.load(f)
+        self.metadata.insert_with_ids(legacy.items())
+
+        # Legacy IVF indexes already assigned sequential IDs and accept add_with_ids as-is
+        if not isinstance(self.index, (faiss.IndexIDMap, faiss.IndexIVF)):
+            vectors = self.index.reconstruct_n(0, self.index.ntotal)
+            self.index = self._new_index()
+            self.index.add_with_ids(vectors, np.arange(len(vectors), dtype="int64"))
+
+        os.replace(legacy_path, legacy_path + ".migrated")
+        self.save()
+        print(f"Migrated {len(legacy)} legacy metadata entries to {self.metadata.path}")
@@ -0,0 +1,225 @@
+"""
+Load generator for POST /api/analyze.
+
+    cd backend
+    python benchmarks/load_test.py                                   # in-process (ASGI), no server needed
+    python benchmarks/load_test.py --url http://localhost:8000       # against a running backend
+    python benchmarks/load_test.py --concurrency 1,4,16,32 --duration 30 \
+        --sizes small=3,medium=2,large=1 --formats pdf=2,docx=1 --jd-file-ratio 0.5
+
+Requests draw resumes and JDs from the seeded synthetic corpus (see
+run_benchmarks.py), weighted by --sizes and --formats. Each concurrency level
+runs for --duration seconds with that many closed-loop clients, and reports
+latency percentiles, throughput and error rate. A level is saturated when it
+breaks the SLO (--max-error-rate, --slo-p95-ms) or adds less than
+--min-gain throughput over the best level before it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from run_benchmarks import DEFAULT_CORPUS, _percentile, load_corpus
+
+CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain",
+}
+
+
+def parse_weights(spec: str) -> Dict[str, float]:
+    """"small=3,large=1" -> {"small": 3.0, "large": 1.0}; bare names weigh 1."""
+    weights = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight) if weight else 1.0
+    return weights
+
+
+class RequestMix:
+    """Weighted random choice of (resume, JD, JD-as-file) from a corpus."""
+
+    def __init__(self, corpus: dict, sizes: Dict[str, float], formats: Dict[str, float], jd_file_ratio: float, seed: int):
+        self.rng = random.Random(seed)
+        self.jd_file_ratio = jd_file_ratio
+        self.resumes = [r for r in corpus["resumes"] if r["size"] in sizes and r["format"] in formats]
+        if not self.resumes:
+            raise ValueError("No corpus documents match the requested sizes and formats.")
+        self.weights = [sizes[r["size"]] * formats[r["format"]] for r in self.resumes]
+        self.jds: Dict[str, List[dict]] = {}
+        for jd in corpus["job_descriptions"]:
+            self.jds.setdefault(jd["size"], []).append(jd)
+
+    def next(self) -> dict:
+        resume = self.rng.choices(self.resumes, weights=self.weights)[0]
+        jd = self.rng.choice(self.jds.get(resume["size"]) or [j for js in self.jds.values() for j in js])
+        files = {"resume": (resume["file"], resume["content"], CONTENT_TYPES[resume["format"]])}
+        data = {}
+        if self.rng.random() < self.jd_file_ratio:
+            files["jd_file"] = (jd["file"], jd["text"].encode("utf-8"), "text/plain")
+        else:
+            data["job_description"] = jd["text"]
+        return {"files": files, "data": data, "size": resume["size"], "format": resume["format"]}
+
+
+async def _client_loop(client: httpx.AsyncClient, mix: RequestMix, deadline: float, results: list):
+    while time.perf_counter() < deadline:
+        request = mix.next()
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/analyze", files=request["files"], data=request["data"])
+            status = response.status_code
+        except httpx.HTTPError as e:
+            status = type(e).__name__
+        results.append((time.perf_counter() - start, status, request["size"]))
+
+
+async def run_level(client: httpx.AsyncClient, mix: RequestMix, concurrency: int, duration: float) -> dict:
+    """Drive `concurrency` closed-loop clients for `duration` seconds and summarize."""
+    results: list = []
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_client_loop(client, mix, deadline, results) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [seconds * 1000 for seconds, _, _ in results]
+    statuses: Dict[str, int] = {}
+    for _, status, _ in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(1 for _, status, _ in results if not (isinstance(status, int) and status < 400))
+    ok = [seconds * 1000 for seconds, status, _ in results if isinstance(status, int) and status < 400]
+    by_size: Dict[str, List[float]] = {}
+    for seconds, _, size in results:
+        by_size.setdefault(size, []).append(seconds * 1000)
+
+    def summary(values: List[float]) -> dict:
+        if not values:
+            return {}
+        return {
+            "p50_ms": round(statistics.median(values), 1),
+            "p95_ms": round(_percentile(values, 0.95), 1),
+            "p99_ms": round(_percentile(values, 0.99), 1),
+            "max_ms": round(max(values), 1)
+        }
+
+    return {
+        "concurrency": concurrency,
+        "requests": len(results),
+        "errors": errors,
+        "error_rate": round(errors / len(results), 4) if results else 0.0,
+        "rps": round(len(ok) / elapsed, 2),
+        "latency": summary(latencies),
+        "latency_by_size": {size: summary(values) for size, values in sorted(by_size.items())},
+        "statuses": statuses
+    }
+
+
+def find_saturation(levels: List[dict], max_error_rate: float, slo_p95_ms: Optional[float], min_gain: float) -> dict:
+    """
+    Max sustainable RPS is the best throughput among levels that meet the SLO.
+    The saturation point is the first level that breaks the SLO or no longer
+    adds at least `min_gain` throughput over the best level before it.
+    """
+    def meets_slo(level: dict) -> bool:
+        if not level["requests"] or level["error_rate"] > max_error_rate:
+            return False
+        return slo_p95_ms is None or level["latency"].get("p95_ms", 0) <= slo_p95_ms
+
+    sustainable = [level for level in levels if meets_slo(level)]
+    saturation = None
+    best_rps = 0.0
+    for level in levels:
+        if not meets_slo(level):
+            saturation = {"concurrency": level["concurrency"], "reason": "slo"}
+            break
+        if best_rps and level["rps"] < best_rps * (1 + min_gain):
+            saturation = {"concurrency": level["concurrency"], "reason": "throughput plateau"}
+            break
+        best_rps = max(best_rps, level["rps"])
+
+    best = max(sustainable, key=lambda level: level["rps"], default=None)
+    return {
+        "max_sustainable_rps": best["rps"] if best else 0.0,
+        "at_concurrency": best["concurrency"] if best else None,
+        "saturation": saturation
+    }
+
+
+async def run(args) -> dict:
+    corpus = load_corpus(args.corpus, args.count, args.seed)
+    mix = RequestMix(corpus, parse_weights(args.sizes), parse_weights(args.formats), args.jd_file_ratio, args.seed)
+    levels = [int(c) for c in args.concurrency.split(",")]
+
+    if args.url:
+        transport, base_url = None, args.url.rstrip("/")
+    else:
+        # In-process: requests go straight to the ASGI app, models load on the warm-up requests
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://loadtest"
+
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=timeout, limits=limits) as client:
+        for _ in range(args.warmup):
+            request = mix.next()
+            await client.post("/api/analyze", files=request["files"], data=request["data"])
+
+        results = []
+        for concurrency in levels:
+            level = await run_level(client, mix, concurrency, args.duration)
+            latency = level["latency"]
+            print(
+                f"c={concurrency:<4} rps={level['rps']:<8} p50={latency.get('p50_ms')}ms "
+                f"p95={latency.get('p95_ms')}ms p99={latency.get('p99_ms')}ms "
+                f"errors={level['errors']}/{level['requests']}",
+                file=sys.stderr
+            )
+            results.append(level)
+
+    return {
+        "target": args.url or "in-process",
+        "mix": {"sizes": args.sizes, "formats": args.formats, "jd_file_ratio": args.jd_file_ratio},
+        "duration_per_level": args.duration,
+        "levels": results,
+        "summary": find_saturation(results, args.max_error_rate, args.slo_p95_ms, args.min_gain)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running backend; in-process when omitted")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--count", type=int, default=5, help="Documents per size and format")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Comma-separated client counts")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per concurrency level")
+    parser.add_argument("--sizes", default="small,medium,large", help="Weighted sizes, e.g. small=3,large=1")
+    parser.add_argument("--formats", default="pdf,docx,txt", help="Weighted formats, e.g. pdf=2,docx=1")
+    parser.add_argument("--jd-file-ratio", type=float, default=0.0, help="Share of requests sending the JD as a file")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed requests before the first level")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--slo-p95-ms", type=float, help="p95 latency a sustainable level must stay under")
+    parser.add_argument("--min-gain", type=float, default=0.1, help="Throughput gain a level must add to count as unsaturated")
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Reproducible benchmark suite for the analysis pipeline.
+
+    cd backend
+    python benchmarks/run_benchmarks.py                    # run and compare with baseline.json
+    python benchmarks/run_benchmarks.py --update-baseline  # record a new baseline
+
+Generates (or reuses) a seeded synthetic corpus via scripts/generate_demo_data.py,
+then measures per-component latency (parser per format, extract_skills,
+get_embedding, calculate_trajectory, analyze_bullets), end-to-end throughput and
+peak RSS. Exits non-zero when a gated metric regresses by more than --threshold
+against the stored baseline. Baselines are machine-specific: record them on the
+hardware that runs the comparison.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "..", "scripts"))
+
+from app.core.config import settings
+from app.services.analysis_context import AnalysisContext
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.bullet_analyzer import BulletAnalyzer
+from app.services.parser import ResumeParser
+from app.services.scorer import Scorer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_CORPUS = os.path.join(BACKEND_DIR, "data", "benchmark_corpus")
+
+# Only these metrics fail the run; p95 values are reported but too noisy to gate on
+GATED_SUFFIXES = (".median_ms", ".docs_per_sec", "_mb")
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _time_calls(fn: Callable, inputs: list, repeat: int, before: Callable = None) -> Dict[str, float]:
+    """Time fn(x) for every input, `repeat` times; `before` runs untimed ahead of each call."""
+    samples = []
+    for _ in range(repeat):
+        for item in inputs:
+            if before is not None:
+                before()
+            start = time.perf_counter()
+            fn(item)
+            samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(_percentile(samples, 0.95), 3),
+        "calls": len(samples)
+    }
+
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def load_corpus(corpus_dir: str, count: int, seed: int) -> dict:
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    manifest = None
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    if manifest is None or manifest.get("seed") != seed or manifest.get("count") != count:
+        from generate_demo_data import generate_corpus
+        manifest = generate_corpus(corpus_dir, count=count, seed=seed)
+
+    def read(name):
+        with open(os.path.join(corpus_dir, name), "rb") as f:
+            return f.read()
+
+    resumes = [dict(entry, content=read(entry["file"])) for entry in manifest["resumes"]]
+    jds = [dict(entry, text=read(entry["file"]).decode("utf-8")) for entry in manifest["job_descriptions"]]
+    return {"manifest": manifest, "resumes": resumes, "job_descriptions": jds}
+
+
+def run_suite(engine, corpus: dict, repeat: int = 3) -> Dict[str, float]:
+    """Measure every component on the corpus. Returns a flat {metric: value} dict."""
+    metrics: Dict[str, float] = {}
+
+    def record(component: str, result: Dict[str, float]):
+        metrics[f"{component}.median_ms"] = result["median_ms"]
+        metrics[f"{component}.p95_ms"] = result["p95_ms"]
+
+    # Parser, per format (uncached)
+    for fmt in sorted({r["format"] for r in corpus["resumes"]}):
+        docs = [(r["content"], ResumeParser.detect_kind(r["file"])) for r in corpus["resumes"] if r["format"] == fmt]
+        record(f"parser.{fmt}", _time_calls(lambda d: ResumeParser.parse_document(*d), docs, repeat))
+
+    texts = [
+        ResumeParser.parse_document(r["content"], "text").text
+        for r in corpus["resumes"] if r["format"] == "txt"
+    ] or [ResumeParser.parse_document(r["content"], ResumeParser.detect_kind(r["file"])).text for r in corpus["resumes"]]
+    jd_text = max((jd["text"] for jd in corpus["job_descriptions"]), key=len)
+    clear_cache = engine.embedding_cache.clear
+
+    record("extract_skills", _time_calls(engine.extract_skills, texts, repeat))
+    # Cold: the cache is cleared before every call so the encoder itself is measured
+    record("get_embedding", _time_calls(engine.get_embedding, texts, repeat, before=clear_cache))
+    record("get_embedding_cached", _time_calls(engine.get_embedding, texts, repeat))
+
+    def trajectory(text):
+        context = AnalysisContext(engine, text, jd_text)
+        scoring = Scorer.score_context(context)
+        clear_cache()
+        start = time.perf_counter()
+        Scorer.calculate_trajectory(
+            nlp_engine=engine,
+            base_resume_text=text,
+            job_description=jd_text,
+            missing_skills=scoring["missing_skills"],
+            current_score=scoring["total_score"],
+            context=context
+        )
+        return (time.perf_counter() - start) * 1000
+
+    samples = [trajectory(text) for _ in range(repeat) for text in texts]
+    metrics["calculate_trajectory.median_ms"] = round(statistics.median(samples), 3)
+    metrics["calculate_trajectory.p95_ms"] = round(_percentile(samples, 0.95), 3)
+
+    record("analyze_bullets", _time_calls(lambda t: BulletAnalyzer.analyze_bullets(t, nlp_engine=engine), texts, repeat))
+
+    # End to end: parse + full analysis for every resume against a JD of the same size, cold caches
+    ResumeParser.cache.clear()
+    clear_cache()
+    jd_by_size = {jd["size"]: jd["text"] for jd in corpus["job_descriptions"]}
+    start = time.perf_counter()
+    for resume in corpus["resumes"]:
+        parsed = ResumeParser.parse_upload(resume["content"], resume["file"])
+        AnalysisPipeline.run(engine, parsed, jd_by_size[resume["size"]], filename=resume["file"],
+                             file_size=len(resume["content"]))
+    elapsed = time.perf_counter() - start
+    metrics["end_to_end.docs_per_sec"] = round(len(corpus["resumes"]) / elapsed, 3)
+    metrics["end_to_end.mean_ms"] = round(elapsed * 1000 / len(corpus["resumes"]), 3)
+
+    metrics["peak_rss_mb"] = peak_rss_mb()
+    return metrics
+
+
+def compare_to_baseline(metrics: Dict[str, float], baseline: Dict[str, float], threshold: float) -> List[str]:
+    """Regressions beyond `threshold` (a fraction) on gated metrics. Throughput must not drop; the rest must not rise."""
+    regressions = []
+    for name, base in sorted(baseline.items()):
+        if not name.endswith(GATED_SUFFIXES) or name not in metrics or not base:
+            continue
+        current = metrics[name]
+        if name.endswith("per_sec"):
+            change = (base - current) / base
+        else:
+            change = (current - base) / base
+        if change > threshold:
+            regressions.append(f"{name}: {base} -> {current} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--count", type=int, default=5, help="Documents per size and format")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed regression, as a fraction")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    from app.services.nlp_engine import NLPEngine
+
+    corpus = load_corpus(args.corpus, args.count, args.seed)
+    # Measure the encoder itself, not hits on a persistent tier left by earlier runs
+    settings.embedding_cache_dir = None
+    engine = NLPEngine()
+    engine.warmup()
+    metrics = run_suite(engine, corpus, repeat=args.repeat)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "model": settings.embedding_model,
+            "encoder_backend": engine.encoder_backend,
+            "embedding_mode": settings.embedding_mode,
+            "corpus": {"seed": args.seed, "count": args.count, "resumes": len(corpus["resumes"])},
+            "repeat": args.repeat
+        },
+        "metrics": metrics
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare_to_baseline(metrics, baseline["metrics"], args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import unittest
+from unittest import mock
+from app.services import analysis_pipeline
+from app.services.analysis_pipeline import AnalysisPipeline
+from app.services.parser import ParsedDocument
+
+SCORING = {"total_score": 72.0, "missing_skills": ["go"], "present_skills": ["python"]}
+
+
+class TestAnalysisPipeline(unittest.TestCase):
+    def test_plan_includes_dependencies_in_order(self):
+        self.assertEqual(AnalysisPipeline.plan(["missing_skills"]), ["score"])
+        self.assertEqual(
+            AnalysisPipeline.plan(["success_prediction"]),
+            ["score", "market_analysis", "success_prediction"]
+        )
+        self.assertEqual(AnalysisPipeline.plan(None), list(analysis_pipeline.SECTIONS))
+
+    def test_plan_rejects_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            AnalysisPipeline.plan(["score", "salary"])
+
+    def test_run_skips_stages_no_requested_field_needs(self):
+        parsed = ParsedDocument(text="Python developer", kind="text", status="success")
+        with mock.patch.object(analysis_pipeline, "AnalysisContext"), \
+                mock.patch.object(analysis_pipeline.Scorer, "score_context", return_value=SCORING), \
+                mock.patch.object(analysis_pipeline.Scorer, "calculate_trajectory") as trajectory, \
+                mock.patch.object(analysis_pipeline.BulletAnalyzer, "analyze_bullets") as bullets, \
+                mock.patch.object(analysis_pipeline.MarketDataService, "get_market_data") as market:
+            response = AnalysisPipeline.run(None, parsed, "JD", fields=["score", "missing_skills"])
+
+        trajectory.assert_not_called()
+        bullets.assert_not_called()
+        market.assert_not_called()
+        self.assertEqual(response.score, 72.0)
+        self.assertEqual(response.missing_skills, ["go"])
+        # Computed alongside the score but not requested
+        self.assertEqual(response.present_skills, [])
+        self.assertEqual(response.trajectory, [])
+        self.assertEqual(response.resume_parsing_status, "success")
+
+    def test_run_passes_interview_options_on(self):
+        parsed = ParsedDocument(text="Python developer", kind="text", status="success")
+        question = {"category": "Weakness / Missing Skill", "skill": "go", "question": "Q?", "difficulty": "Hard"}
+        with mock.patch.object(analysis_pipeline, "AnalysisContext"), \
+                mock.patch.object(analysis_pipeline.Scorer, "score_context", return_value=SCORING), \
+                mock.patch.object(analysis_pipeline.InterviewGenerator, "generate_questions", return_value=[question]) as generate:
+            response = AnalysisPipeline.run(
+                None, parsed, "JD", fields=["interview_questions"],
+                interview_rotation=2, interview_difficulty="hard"
+            )
+
+        self.assertEqual(generate.call_args.kwargs["rotation"], 2)
+        self.assertEqual(generate.call_args.kwargs["difficulty"], "hard")
+        self.assertEqual(response.interview_questions[0].difficulty, "Hard")
+
+
+if __name__ == "__main__":
+    unittest.main()
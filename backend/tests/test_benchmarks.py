@@ -0,0 +1,56 @@
+import unittest
+from benchmarks.load_test import find_saturation, parse_weights
+from benchmarks.run_benchmarks import compare_to_baseline
+
+
+class TestBaselineComparison(unittest.TestCase):
+    def test_flags_only_gated_regressions_beyond_threshold(self):
+        baseline = {
+            "parser.pdf.median_ms": 10.0,
+            "parser.pdf.p95_ms": 20.0,
+            "extract_skills.median_ms": 1.0,
+            "end_to_end.docs_per_sec": 40.0,
+            "peak_rss_mb": 500.0
+        }
+        current = {
+            "parser.pdf.median_ms": 11.0,   # +10%: within threshold
+            "parser.pdf.p95_ms": 60.0,      # p95 is informational
+            "extract_skills.median_ms": 2.0,
+            "end_to_end.docs_per_sec": 20.0,
+            "peak_rss_mb": 480.0
+        }
+        regressions = compare_to_baseline(current, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("end_to_end.docs_per_sec"))
+        self.assertTrue(regressions[1].startswith("extract_skills.median_ms"))
+
+    def test_faster_runs_pass(self):
+        baseline = {"get_embedding.median_ms": 5.0, "end_to_end.docs_per_sec": 10.0}
+        current = {"get_embedding.median_ms": 1.0, "end_to_end.docs_per_sec": 50.0}
+        self.assertEqual(compare_to_baseline(current, baseline, threshold=0.1), [])
+
+
+def _level(concurrency, rps, error_rate=0.0, p95=100.0):
+    return {"concurrency": concurrency, "requests": 100, "rps": rps, "error_rate": error_rate, "latency": {"p95_ms": p95}}
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_parse_weights(self):
+        self.assertEqual(parse_weights("small=3, large"), {"small": 3.0, "large": 1.0})
+
+    def test_saturation_on_throughput_plateau(self):
+        levels = [_level(1, 10), _level(2, 19), _level(4, 20), _level(8, 20.5)]
+        summary = find_saturation(levels, max_error_rate=0.01, slo_p95_ms=None, min_gain=0.1)
+        self.assertEqual(summary["saturation"], {"concurrency": 4, "reason": "throughput plateau"})
+        self.assertEqual(summary["max_sustainable_rps"], 20.5)
+
+    def test_slo_breaches_are_not_sustainable(self):
+        levels = [_level(1, 10), _level(2, 19, p95=900.0), _level(4, 30, error_rate=0.2)]
+        summary = find_saturation(levels, max_error_rate=0.01, slo_p95_ms=500.0, min_gain=0.1)
+        self.assertEqual(summary["saturation"], {"concurrency": 2, "reason": "slo"})
+        self.assertEqual(summary["max_sustainable_rps"], 10)
+        self.assertEqual(summary["at_concurrency"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
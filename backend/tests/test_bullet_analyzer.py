@@ -0,0 +1,41 @@
+import unittest
+import spacy
+from spacy.language import Language
+from app.services.bullet_analyzer import BulletAnalyzer
+
+CALLS = {"ner": 0}
+
+
+@Language.component("test_counting_ner")
+def counting_ner(doc):
+    CALLS["ner"] += 1
+    return doc
+
+
+class FakeEngine:
+    def __init__(self):
+        self.nlp = spacy.blank("en")
+        self.nlp.add_pipe("test_counting_ner", name="ner")
+
+
+RESUMES = [
+    "- Led a team of 5 engineers to deploy ML models on Kubernetes.\n"
+    "- Worked on frontend stuff with React for the website.",
+    "- Responsible for various tasks related to pipeline maintenance.\n"
+    "- Optimized PostgreSQL queries reducing latency by 40% across services.",
+]
+
+
+class TestBulletAnalyzer(unittest.TestCase):
+    def test_batch_matches_per_resume_and_skips_ner(self):
+        """Bullets from every resume go through one pipe call with NER disabled."""
+        engine = FakeEngine()
+        CALLS["ner"] = 0
+        batch = BulletAnalyzer.analyze_bullets_batch(RESUMES, nlp_engine=engine)
+        self.assertEqual(CALLS["ner"], 0)
+        self.assertEqual(batch, [BulletAnalyzer.analyze_bullets(text, nlp_engine=engine) for text in RESUMES])
+        self.assertEqual([r["text"] for r in batch[1]], ["Responsible for various tasks related to pipeline maintenance."])
+
+
+if __name__ == "__main__":
+    unittest.main()
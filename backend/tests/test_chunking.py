@@ -0,0 +1,33 @@
+import unittest
+import numpy as np
+from app.services.chunking import chunk_text, mean_pool, pooled_similarity
+
+
+class TestChunking(unittest.TestCase):
+    def test_windows_cover_text_and_keep_prefix_stable(self):
+        """Every word lands in a chunk, and appending text leaves earlier chunks unchanged."""
+        words = [f"w{i}" for i in range(25)]
+        chunks = chunk_text(" ".join(words), max_words=10, overlap=2)
+        self.assertEqual(chunks[0].split(), words[:10])
+        self.assertEqual(chunks[1].split()[0], "w8")
+        self.assertEqual(chunks[-1].split()[-1], "w24")
+
+        longer = chunk_text(" ".join(words + ["extra"] * 5), max_words=10, overlap=2)
+        self.assertEqual(longer[:len(chunks) - 1], chunks[:-1])
+        self.assertEqual(chunk_text("   "), [])
+
+    def test_pooling_strategies(self):
+        """max rewards one strong chunk match that mean pooling dilutes."""
+        resume = np.array([[1.0, 0.0], [0.0, 1.0], [0.0, 1.0]])
+        jd = np.array([[1.0, 0.0]])
+        self.assertAlmostEqual(pooled_similarity(resume, jd, "max"), 1.0)
+        self.assertAlmostEqual(pooled_similarity(resume, jd, "topk", top_k=2), 0.5)
+        self.assertAlmostEqual(pooled_similarity(resume, jd, "mean"), float(mean_pool(resume) @ jd[0]), places=6)
+        self.assertLess(pooled_similarity(resume, jd, "mean"), 1.0)
+        self.assertEqual(pooled_similarity(np.zeros((0, 2)), jd, "max"), 0.0)
+        with self.assertRaises(ValueError):
+            pooled_similarity(resume, jd, "median")
+
+
+if __name__ == "__main__":
+    unittest.main()
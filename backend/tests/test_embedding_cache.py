@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from app.services.embedding_cache import EmbeddingCache, make_key
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def test_key_normalizes_whitespace(self):
+        """Keys ignore whitespace differences but not the model."""
+        self.assertEqual(make_key("m", "Python  developer\n"), make_key("m", "Python developer"))
+        self.assertNotEqual(make_key("m", "python"), make_key("other", "python"))
+
+    def test_lru_eviction_by_bytes(self):
+        """Oldest entries are evicted once the byte budget is exceeded."""
+        vec = np.ones(4, dtype=np.float32)  # 16 bytes
+        cache = EmbeddingCache("m", max_bytes=32)
+        cache.put("a", vec)
+        cache.put("b", vec)
+        cache.get("a")  # "a" becomes most recent
+        cache.put("c", vec)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+
+    def test_persistent_tier_shared_read_only(self):
+        """Vectors written by one cache are visible to a read-only cache on the same directory."""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = EmbeddingCache("m", persist_dir=tmp)
+            reader = EmbeddingCache("m", persist_dir=tmp, read_only=True)
+            writer.put("first", np.array([1.0, 2.0], dtype=np.float32))
+            np.testing.assert_array_equal(reader.get("first"), [1.0, 2.0])
+
+            # Picks up rows appended after it opened the store
+            writer.put("second", np.array([3.0, 4.0], dtype=np.float32))
+            np.testing.assert_array_equal(reader.get("second"), [3.0, 4.0])
+            self.assertEqual(reader.stats()["disk_hits"], 2)
+
+            restarted = EmbeddingCache("m", persist_dir=tmp)
+            np.testing.assert_array_equal(restarted.get("second"), [3.0, 4.0])
+
+    def test_torn_row_does_not_shift_later_rows(self):
+        """A partial vector left by a crashed writer is cut off before the next append."""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache("m", persist_dir=tmp)
+            cache.put("first", np.array([1.0, 2.0], dtype=np.float32))
+            with open(os.path.join(tmp, "m.f32"), "ab") as f:
+                f.write(b"\x00" * 3)
+            cache.put("second", np.array([3.0, 4.0], dtype=np.float32))
+
+            restarted = EmbeddingCache("m", persist_dir=tmp)
+            np.testing.assert_array_equal(restarted.get("second"), [3.0, 4.0])
+            np.testing.assert_array_equal(restarted.get("first"), [1.0, 2.0])
+
+    def test_disk_tier_compacts_to_newest_rows(self):
+        """Past max_disk_bytes the newest half is kept, and readers follow the new generation."""
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = EmbeddingCache("m", persist_dir=tmp, max_disk_bytes=4 * 8)
+            reader = EmbeddingCache("m", persist_dir=tmp, read_only=True)
+            writer.put("text 0", np.array([0, 0], dtype=np.float32))
+            np.testing.assert_array_equal(reader.get("text 0"), [0.0, 0.0])
+            for i in range(1, 5):
+                writer.put(f"text {i}", np.array([i, i], dtype=np.float32))
+            self.assertEqual(writer.stats()["disk_compactions"], 1)
+            self.assertEqual(sorted(os.listdir(tmp)), ["m.1.f32", "m.1.idx", "m.lock", "m.meta.json"])
+
+            writer.clear()
+            self.assertIsNone(writer.get("text 0"))
+            # The first miss moves the reader to the new generation
+            reader.clear()
+            np.testing.assert_array_equal(reader.get("text 4"), [4.0, 4.0])
+            np.testing.assert_array_equal(reader.get("text 3"), [3.0, 3.0])
+            self.assertIsNone(reader.get("text 0"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+from app.services.encoders import compare_encoders, load_encoder
+
+
+class FixedEncoder:
+    def __init__(self, vectors):
+        self.vectors = np.asarray(vectors, dtype=np.float32)
+
+    def encode(self, texts, batch_size=32):
+        return self.vectors[:len(texts)]
+
+
+class TestEncoders(unittest.TestCase):
+    def test_identical_encoders_do_not_drift(self):
+        vectors = np.random.default_rng(0).normal(size=(6, 8))
+        report = compare_encoders(FixedEncoder(vectors), FixedEncoder(vectors * 2), ["t"] * 6)
+        self.assertAlmostEqual(report["min_cosine"], 1.0, places=5)
+        self.assertAlmostEqual(report["max_similarity_drift"], 0.0, places=5)
+
+    def test_drift_is_reported(self):
+        vectors = np.eye(3)
+        perturbed = vectors + np.array([[0, 0.1, 0], [0, 0, 0], [0, 0, 0]])
+        report = compare_encoders(FixedEncoder(vectors), FixedEncoder(perturbed), ["t"] * 3)
+        self.assertLess(report["min_cosine"], 1.0)
+        self.assertGreater(report["max_similarity_drift"], 0.05)
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            load_encoder("any-model", backend="tensorrt")
+
+
+if __name__ == "__main__":
+    unittest.main()
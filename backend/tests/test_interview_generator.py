@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+import unittest
+from app.services.interview_generator import InterviewGenerator, QuestionBank
+from app.services.skill_ontology import get_skill_ontology
+
+ENTRIES = [
+    {"skill": "Kubernetes", "aliases": ["openshift"], "questions": [
+        {"text": "What is a Pod?", "difficulty": "easy"},
+        {"text": "Explain the scheduler.", "difficulty": "hard"},
+        {"text": "What is a Service?", "difficulty": "easy"},
+        {"text": "Write an operator."}
+    ]}
+]
+
+
+class TestQuestionBank(unittest.TestCase):
+    def test_lookup_by_canonical_skill_and_alias(self):
+        bank = QuestionBank(ENTRIES, get_skill_ontology())
+        self.assertEqual(bank.lookup("k8s"), 0)
+        self.assertEqual(bank.lookup("OpenShift"), 0)
+        self.assertIsNone(bank.lookup("cobol"))
+
+    def test_rotation_and_difficulty_filter(self):
+        bank = QuestionBank(ENTRIES, get_skill_ontology())
+        self.assertEqual(bank.pick(0, 5), ("Explain the scheduler.", "hard"))
+        self.assertEqual(bank.pick(0, 1, ["easy"]), ("What is a Service?", "easy"))
+        self.assertEqual(bank.pick(0, 0, ["medium", "hard"]), ("Explain the scheduler.", "hard"))
+        self.assertIsNone(bank.pick(0, 0, ["expert"]))
+
+    def test_load_from_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bank.json")
+            with open(path, "w") as f:
+                json.dump({"skills": ENTRIES}, f)
+            bank = QuestionBank.load(path, get_skill_ontology())
+        self.assertEqual((len(bank), bank.skills), (1, ["Kubernetes"]))
+
+
+class TestInterviewGenerator(unittest.TestCase):
+    def test_aliases_map_to_one_entry_without_repeats(self):
+        questions = InterviewGenerator.generate_questions(["postgres", "mysql"], ["postgres", "mysql", "python"])
+        sql = [q["question"] for q in questions if q["skill"] in ("postgres", "mysql")]
+        self.assertEqual(len(sql), 2)
+        self.assertEqual(len(set(sql)), 2)
+
+    def test_rotation_is_deterministic(self):
+        first = InterviewGenerator.generate_questions(["react"], ["python"], rotation=1)
+        self.assertEqual(first, InterviewGenerator.generate_questions(["react"], ["python"], rotation=1))
+        self.assertNotEqual(first, InterviewGenerator.generate_questions(["react"], ["python"]))
+
+    def test_difficulty_filter(self):
+        questions = InterviewGenerator.generate_questions(["react", "python"], difficulty="hard")
+        self.assertEqual({q["difficulty"] for q in questions if q["category"] != "Behavioral"}, {"Hard"})
+        with self.assertRaises(ValueError):
+            InterviewGenerator.generate_questions(["react"], difficulty="expert")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from app.services.job_queue import JobQueue, JobWorkers, PermanentJobError
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_claims_by_priority_then_age(self):
+        queue = JobQueue()
+        low = queue.submit("analyze", {}, priority=0)
+        high = queue.submit("analyze", {}, priority=5)
+        later_low = queue.submit("analyze", {})
+        self.assertEqual([queue.claim()["job_id"] for _ in range(3)], [high, low, later_low])
+        self.assertIsNone(queue.claim())
+
+    def test_retry_backoff_then_failure(self):
+        queue = JobQueue(max_attempts=2, retry_backoff=60)
+        job_id = queue.submit("analyze", {}, files=[("resume", "r.txt", b"text")])
+        queue.claim()
+        self.assertEqual(queue.fail(job_id, "boom"), "queued")
+        # Not due until the backoff has passed
+        self.assertIsNone(queue.claim())
+
+        queue._conn.execute("UPDATE jobs SET available_at = 0")
+        self.assertEqual(queue.claim()["attempts"], 2)
+        self.assertEqual(queue.fail(job_id, "boom again"), "failed")
+        job = queue.get(job_id)
+        self.assertEqual((job["status"], job["error"]), ("failed", "boom again"))
+        self.assertEqual(queue.files(job_id), [])
+
+    def test_results_expire_after_ttl(self):
+        queue = JobQueue(result_ttl=0)
+        job_id = queue.submit("analyze", {})
+        queue.claim()
+        queue.complete(job_id, {"score": 1})
+        self.assertIsNone(queue.get(job_id))
+        self.assertEqual(queue.purge_expired(), 1)
+
+    def test_expired_leases_are_requeued_on_restart(self):
+        path = os.path.join(tempfile.mkdtemp(), "jobs.sqlite")
+        queue = JobQueue(path)
+        job_id = queue.submit("rank", {"top_k": 3}, files=[("resumes", "a.txt", b"a")])
+        queue.claim()
+        queue.close()
+
+        # A second process on the same database leaves a live lease alone
+        self.assertEqual(JobQueue(path).stats()["running"], 1)
+
+        reopened = JobQueue(path, lease_seconds=0)
+        self.assertEqual(reopened.stats()["queued"], 1)
+        job = reopened.claim()
+        self.assertEqual((job["job_id"], job["params"], job["attempts"]), (job_id, {"top_k": 3}, 2))
+        self.assertEqual(reopened.files(job_id), [("resumes", "a.txt", b"a")])
+
+    def test_interrupted_runs_use_up_attempts(self):
+        queue = JobQueue(max_attempts=2)
+        job_id = queue.submit("analyze", {}, files=[("resume", "r.txt", b"text")])
+        queue.claim()
+        self.assertEqual(queue.release(), 1)
+        queue.claim()
+        queue.release()
+        job = queue.get(job_id)
+        self.assertEqual((job["status"], job["attempts"]), ("failed", 2))
+        self.assertEqual(queue.files(job_id), [])
+
+
+class TestJobWorkers(unittest.TestCase):
+    def test_handler_outcomes(self):
+        queue = JobQueue(max_attempts=3, retry_backoff=60)
+
+        async def ok(params, files):
+            return {"echo": params["value"], "files": len(files)}
+
+        async def bad_input(params, files):
+            raise PermanentJobError("unreadable")
+
+        async def flaky(params, files):
+            raise RuntimeError("transient")
+
+        workers = JobWorkers(queue, {"ok": ok, "bad": bad_input, "flaky": flaky})
+        ids = {
+            "ok": queue.submit("ok", {"value": 7}, files=[("resume", "r.txt", b"x")]),
+            "bad": queue.submit("bad", {}),
+            "flaky": queue.submit("flaky", {})
+        }
+
+        async def drain():
+            while (job := queue.claim()) is not None:
+                await workers.run_job(job)
+
+        asyncio.run(drain())
+        self.assertEqual(queue.get(ids["ok"])["result"], {"echo": 7, "files": 1})
+        self.assertEqual(queue.get(ids["bad"])["status"], "failed")
+        flaky_job = queue.get(ids["flaky"])
+        self.assertEqual((flaky_job["status"], flaky_job["attempts"]), ("queued", 1))
+        self.assertGreater(queue._conn.execute("SELECT available_at FROM jobs WHERE id = ?", (ids["flaky"],)).fetchone()[0], time.time())
+
+    def test_jobs_past_the_timeout_fail_without_retry(self):
+        queue = JobQueue(max_attempts=3)
+
+        async def slow(params, files):
+            await asyncio.sleep(1)
+
+        job_id = queue.submit("slow", {})
+        workers = JobWorkers(queue, {"slow": slow}, job_timeout=0.05)
+        asyncio.run(workers.run_job(queue.claim()))
+        job = queue.get(job_id)
+        self.assertEqual((job["status"], job["attempts"]), ("failed", 1))
+        self.assertIn("time limit", job["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
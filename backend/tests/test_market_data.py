@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from app.services.market_data import MarketDataService, MarketDataset, RoleDetector, compute_role_centroids
+
+DATA = {
+    "default_role": "software engineer",
+    "default_region": "US",
+    "roles": {
+        "role": ["devops engineer", "software engineer"],
+        "patterns": [["sre", "devops"], []],
+        "demand_level": ["High", "Medium"],
+        "top_skills": [["Kubernetes"], ["Python"]]
+    },
+    "salaries": {
+        "role": ["devops engineer", "devops engineer", "software engineer"],
+        "region": ["US", "EU", "US"],
+        "salary_range": ["$120k", "€80k", "$100k"]
+    }
+}
+
+
+class TestMarketData(unittest.TestCase):
+    def test_keywords_respect_word_boundaries(self):
+        detector = RoleDetector(MarketDataset(DATA))
+        self.assertIsNone(detector.detect_keywords("Experience with presreading tools."))
+        self.assertEqual(detector.detect_keywords("On-call SRE for the platform."), 0)
+
+    def test_regional_salaries_fall_back_to_default_region(self):
+        dataset = MarketDataset(DATA)
+        self.assertEqual(dataset.get(0, "eu")["salary_range"], "€80k")
+        self.assertEqual(dataset.get(1, "EU")["region"], "US")
+        self.assertEqual(dataset.get(1)["salary_range"], "$100k")
+
+    def test_centroids_match_in_one_multiply(self):
+        dataset = MarketDataset(DATA)
+        centroids = compute_role_centroids(dataset, lambda texts: np.array([
+            [1.0, 0.0] if any(k in t.lower() for k in ("devops", "sre", "kubernetes")) else [0.0, 1.0]
+            for t in texts
+        ]))
+        detector = RoleDetector(dataset, centroids, min_similarity=0.5)
+        self.assertEqual(detector.detect_embedding(np.array([0.9, 0.1])), 0)
+        self.assertIsNone(detector.detect_embedding(np.array([-1.0, 0.0])))
+
+    def test_jd_decides_the_role(self):
+        result = MarketDataService.get_market_data(
+            resume_text="Data scientist building models.",
+            job_description="We are hiring a Backend Developer (Go, PostgreSQL)."
+        )
+        self.assertEqual(result["role"], "Backend Developer")
+        self.assertEqual(result["region"], "US")
+        self.assertEqual(MarketDataService.get_market_data("", "Gardening")["role"], "Software Engineer")
+
+if __name__ == "__main__":
+    unittest.main()
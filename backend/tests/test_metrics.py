@@ -0,0 +1,64 @@
+import asyncio
+import unittest
+from unittest import mock
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.metrics import (
+    Counter, Histogram, Registry, REQUEST_SECONDS, stage, start_request_timings, server_timing_header
+)
+from app.main import observe_requests
+
+
+class TestMetrics(unittest.TestCase):
+    def test_prometheus_exposition(self):
+        registry = Registry()
+        requests = registry.register(Counter("requests_total", "Requests.", ("route",)))
+        latency = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+        requests.inc(route="/api/analyze")
+        latency.observe(0.05, route="/api/analyze")
+        latency.observe(0.5, route="/api/analyze")
+        latency.observe(5.0, route="/api/analyze")
+
+        text = registry.expose()
+        self.assertIn('requests_total{route="/api/analyze"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/api/analyze",le="0.1"} 1', text)
+        self.assertIn('latency_seconds_bucket{route="/api/analyze",le="1.0"} 2', text)
+        self.assertIn('latency_seconds_bucket{route="/api/analyze",le="+Inf"} 3', text)
+        self.assertIn('latency_seconds_count{route="/api/analyze"} 3', text)
+        with self.assertRaises(ValueError):
+            requests.inc(path="/x")
+
+    def test_stage_timings_feed_server_timing(self):
+        timings = start_request_timings()
+        with stage("embedding"):
+            pass
+        with stage("embedding"):
+            pass
+        self.assertEqual([name for name, _ in timings], ["embedding", "embedding"])
+        self.assertRegex(server_timing_header(timings), r"^embedding;dur=\d+\.\d$")
+
+
+class TestObserveRequests(unittest.TestCase):
+    def test_streamed_latency_covers_the_body(self):
+        app = FastAPI()
+        app.middleware("http")(observe_requests)
+
+        @app.get("/stream")
+        async def stream():
+            async def body():
+                yield b"first\n"
+                await asyncio.sleep(0.2)
+                yield b"second\n"
+            return StreamingResponse(body(), media_type="application/x-ndjson")
+
+        with mock.patch.object(settings, "server_timing", True), \
+                mock.patch.object(REQUEST_SECONDS, "observe") as observe:
+            response = TestClient(app).get("/stream")
+        self.assertRegex(response.headers["Server-Timing"], r"^headers;dur=")
+        self.assertGreaterEqual(observe.call_args.args[0], 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
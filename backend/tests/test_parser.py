@@ -0,0 +1,54 @@
+import asyncio
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from app.services.extraction_service import ExtractionService
+from app.services.parser import ResumeParser, ParseCache, ParsedDocument
+
+
+class TestParseCache(unittest.TestCase):
+    def setUp(self):
+        ResumeParser.cache.clear()
+
+    def test_identical_uploads_parse_once(self):
+        """Byte-identical uploads are served from the cache."""
+        with mock.patch.object(ResumeParser, "extract_pdf", return_value=("Python developer", "")) as extract_pdf:
+            first = ResumeParser.parse_upload(b"%PDF-bytes", "resume.pdf")
+            second = ResumeParser.parse_upload(b"%PDF-bytes", "copy.PDF")
+        self.assertEqual(extract_pdf.call_count, 1)
+        self.assertIs(first, second)
+
+    def test_kind_is_part_of_key(self):
+        """The same bytes parsed as PDF and as text are cached separately."""
+        self.assertNotEqual(ParseCache.key(b"x", "pdf"), ParseCache.key(b"x", "text"))
+
+    def test_size_bounded_eviction(self):
+        """Least recently used documents are evicted past the size budget."""
+        cache = ParseCache(max_bytes=10)
+        cache.put("a", ParsedDocument(text="aaaaa"))
+        cache.put("b", ParsedDocument(text="bbbbb"))
+        cache.put("c", ParsedDocument(text="ccccc"))
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class TestExtractionService(unittest.TestCase):
+    def test_kill_pool_is_idempotent(self):
+        service = ExtractionService(workers=1)
+        pool = service._acquire_pool()
+        service._kill_pool(pool)
+        # shutdown() has cleared the pool's process table by now
+        service._kill_pool(pool)
+        self.assertIsNot(service._acquire_pool(), pool)
+        service.shutdown()
+
+    def test_document_broken_twice_is_reported_not_raised(self):
+        service = ExtractionService(workers=1)
+        with mock.patch.object(service, "_extract_in_pool", side_effect=BrokenProcessPool()):
+            doc = asyncio.run(service.extract(b"%PDF-1.4", "pdf"))
+        self.assertEqual(doc.status, "failed")
+        self.assertEqual(service.stats()["retries"], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+from app.api import dependencies
+from app.core.config import settings
+from app.core.readiness import Readiness
+
+
+class TestReadiness(unittest.TestCase):
+    def test_ready_only_after_every_component(self):
+        readiness = Readiness()
+        readiness.register("encoder", "candidate_pool")
+        with readiness.track("encoder"):
+            pass
+        readiness.mark_ready("encoder")
+        self.assertFalse(readiness.ready)
+        readiness.mark_ready("candidate_pool")
+        snapshot = readiness.snapshot()
+        self.assertTrue(snapshot["ready"])
+        self.assertIsNotNone(snapshot["components"]["encoder"]["load_seconds"])
+
+    def test_failure_is_reported(self):
+        readiness = Readiness()
+        readiness.register("encoder")
+        with self.assertRaises(OSError):
+            with readiness.track("encoder"):
+                raise OSError("model not found")
+        component = readiness.snapshot()["components"]["encoder"]
+        self.assertEqual((component["state"], component["error"]), ("failed", "model not found"))
+        self.assertFalse(readiness.ready)
+
+    def test_models_are_listed_without_preload(self):
+        """With PRELOAD_MODELS=0 /ready waits for the first load instead of reporting nothing."""
+        fresh = Readiness()
+        with mock.patch.object(dependencies, "readiness", fresh), \
+                mock.patch.object(settings, "preload_models", False), \
+                mock.patch.object(dependencies, "nlp_engine_loaded", return_value=False):
+            dependencies.register_readiness()
+        snapshot = fresh.snapshot()
+        self.assertFalse(snapshot["ready"])
+        self.assertEqual(sorted(snapshot["components"]), ["encoder", "spacy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
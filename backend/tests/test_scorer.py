@@ -1,5 +1,21 @@
 import unittest
+import numpy as np
 from app.services.scorer import Scorer
+from app.services.skill_bitsets import SkillBitMatrix
+from app.services.skill_ontology import get_skill_ontology
+
+
+class FakeEngine:
+    """Encoder stand-in: the vector grows towards the JD with each added sentence."""
+    def __init__(self):
+        self.batch_calls = 0
+
+    def get_embeddings(self, texts):
+        self.batch_calls += 1
+        return np.array([[1.0, 0.5 + 0.1 * t.count("advanced experience")] for t in texts])
+
+    def compute_similarities(self, matrix, vec):
+        return (matrix @ vec) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(vec))
 
 class TestScorer(unittest.TestCase):
     def test_perfect_score(self):
@@ -20,5 +36,63 @@ class TestScorer(unittest.TestCase):
         result = Scorer.calculate_score(0.0, ["java"], ["python"])
         self.assertEqual(result["total_score"], 0.0)
 
+    def test_trajectory_single_batch(self):
+        """Trajectory encodes every simulated skill in one batch and reuses the JD inputs."""
+        engine = FakeEngine()
+        trajectory = Scorer.calculate_trajectory(
+            nlp_engine=engine,
+            base_resume_text="python developer",
+            job_description="python react docker",
+            missing_skills=["react", "docker"],
+            current_score=50,
+            jd_vec=np.array([1.0, 1.0]),
+            resume_skills=["python"],
+            jd_skills=["python", "react", "docker"]
+        )
+        self.assertEqual(engine.batch_calls, 1)
+        self.assertEqual([t["skill"] for t in trajectory], ["react", "docker"])
+        # sem = cos([1, 0.6], [1, 1]) -> 97.0; skills = 2/3 -> 66.7; total = 84.9
+        self.assertEqual(trajectory[0]["new_score"], 85)
+        self.assertEqual(trajectory[0]["boost"], 35)
+
+    def test_batch_scores_match_single_pair(self):
+        """calculate_scores gives the same numbers as calculate_score for every candidate."""
+        job = ["python", "react", "docker"]
+        resumes = [["python"], ["Python", "React", "docker"], [], ["java"]]
+        semantic = [0.8, 0.95, 0.1, -0.2]
+        batch = Scorer.calculate_scores(np.array(semantic), resumes, job)
+        for sem, skills, result in zip(semantic, resumes, batch):
+            single = Scorer.calculate_score(sem, skills, job)
+            self.assertEqual(result["total_score"], single["total_score"])
+            self.assertEqual(result["section_scores"], single["section_scores"])
+            self.assertEqual(sorted(result["missing_skills"]), sorted(single["missing_skills"]))
+            self.assertEqual(sorted(result["present_skills"]), sorted(single["present_skills"]))
+
+    def test_batch_scores_match_single_pair_randomized(self):
+        """Synonyms, unknown skills and empty JDs score identically in batch and single-pair form."""
+        rng = np.random.default_rng(0)
+        pool = ["python", "Python", "k8s", "kubernetes", "postgres", "react.js", "aws", "in-house dsl", "figma", "go"]
+        for job_size in (0, 1, 4, 8):
+            job = list(rng.choice(pool, job_size))
+            resumes = [list(rng.choice(pool, rng.integers(0, 6))) for _ in range(50)]
+            semantic = rng.uniform(-0.3, 1.0, len(resumes))
+            batch = Scorer.calculate_scores(semantic, resumes, job)
+            for sem, skills, result in zip(semantic, resumes, batch):
+                single = Scorer.calculate_score(sem, skills, job)
+                self.assertEqual(
+                    (result["total_score"], result["section_scores"], sorted(result["missing_skills"]), sorted(result["present_skills"])),
+                    (single["total_score"], single["section_scores"], sorted(single["missing_skills"]), sorted(single["present_skills"]))
+                )
+
+    def test_skill_bit_matrix(self):
+        """Candidates are packed bit rows over the JD's canonical skills."""
+        matrix = SkillBitMatrix(get_skill_ontology(), ["Python", "k8s", "Custom Tool", "kubernetes"], [
+            ["python", "custom tool"], ["Kubernetes", "java"], []
+        ])
+        self.assertEqual(matrix.columns, ["python", "kubernetes", "custom tool"])
+        self.assertEqual(matrix.bits.dtype, np.uint8)
+        self.assertEqual(matrix.intersection_counts().tolist(), [2, 1, 0])
+        self.assertEqual(matrix.names(matrix.missing_bits()), [["kubernetes"], ["python", "custom tool"], ["python", "kubernetes", "custom tool"]])
+
 if __name__ == "__main__":
     unittest.main()
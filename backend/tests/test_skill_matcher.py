@@ -0,0 +1,31 @@
+import unittest
+from app.services.skill_matcher import SkillMatcher, get_skill_matcher
+
+
+class TestSkillMatcher(unittest.TestCase):
+    def test_multi_word_skills(self):
+        """Trigrams and phrases split across lines are found."""
+        skills = get_skill_matcher().extract("Shipped apps with Ruby on Rails on\nAmazon   Web Services.")
+        self.assertIn("ruby on rails", skills)
+        self.assertIn("amazon web services", skills)
+        self.assertIn("rails", skills)
+
+    def test_word_boundaries(self):
+        """Short skills do not fire inside longer words."""
+        skills = get_skill_matcher().extract("Worked at Google on JavaScript tooling.")
+        self.assertIn("javascript", skills)
+        self.assertNotIn("go", skills)
+        self.assertNotIn("java", skills)
+
+    def test_symbol_skills(self):
+        """C++, C# and .NET match without token splitting."""
+        skills = get_skill_matcher().extract("Expert in C++, C# and ASP.NET; some Node.js.")
+        self.assertTrue({"c++", "c#", ".net", "asp.net", "node.js"} <= skills)
+
+    def test_overlapping_phrases(self):
+        """Patterns sharing suffixes are all reported."""
+        matcher = SkillMatcher(["spring boot", "boot", "ring"])
+        self.assertEqual(matcher.extract("spring boot"), {"spring boot", "boot"})
+
+if __name__ == "__main__":
+    unittest.main()
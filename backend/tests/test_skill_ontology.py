@@ -0,0 +1,39 @@
+import os
+import tempfile
+import unittest
+from app.services.scorer import Scorer
+from app.services.skill_ontology import SkillOntology, get_skill_ontology
+
+
+class TestSkillOntology(unittest.TestCase):
+    def test_synonyms_share_one_id(self):
+        ontology = get_skill_ontology()
+        self.assertEqual(ontology.id_of("Postgres"), ontology.id_of("postgresql"))
+        self.assertEqual(ontology.canonicalize(["k8s", "Kubernetes", "react.js", "React"]), ["kubernetes", "react"])
+        self.assertEqual(ontology.category("amazon web services"), "DevOps & Cloud")
+        self.assertEqual(ontology.canonical("Some Niche Tool"), "some niche tool")
+
+    def test_synonyms_count_once_in_scores(self):
+        result = Scorer.calculate_score(0.5, ["postgres", "k8s"], ["PostgreSQL", "kubernetes", "K8s", "aws"])
+        self.assertEqual(result["section_scores"]["skills"], 67)
+        self.assertEqual(result["missing_skills"], ["aws"])
+
+    def test_recommendations_group_by_category(self):
+        recommendations = Scorer.generate_recommendations(["k8s", "kubernetes", "postgres"], 60)
+        self.assertTrue(any("(kubernetes)" in r for r in recommendations))
+        self.assertTrue(any("(postgresql)" in r for r in recommendations))
+
+    def test_save_and_load_round_trip(self):
+        ontology = SkillOntology.from_categories(
+            {"Database": {"postgresql", "postgres", "redis"}}, {"postgresql": {"postgres", "psql"}}
+        )
+        self.assertEqual(ontology.names, ["postgresql", "redis"])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "skills.json")
+            ontology.save(path)
+            loaded = SkillOntology.load(path)
+        self.assertEqual((loaded.names, loaded.aliases), (ontology.names, ontology.aliases))
+        self.assertEqual(loaded.category_ids, {"Database": frozenset({0, 1})})
+
+if __name__ == "__main__":
+    unittest.main()
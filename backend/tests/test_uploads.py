@@ -0,0 +1,98 @@
+import asyncio
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+from fastapi import HTTPException, UploadFile
+from app.api.uploads import parse_uploads, read_archive, read_upload, SpooledUpload
+from app.core.config import settings
+from app.services.parser import ParsedDocument, ResumeParser
+
+
+def _upload(content: bytes, filename: str = "resume.txt") -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename=filename)
+
+
+def _zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return buffer.getvalue()
+
+
+class TestReadUpload(unittest.TestCase):
+    def test_small_uploads_stay_in_memory(self):
+        spooled = asyncio.run(read_upload(_upload(b"Python developer"), max_bytes=1024, spool_bytes=1024))
+        self.assertIsNone(spooled.path)
+        self.assertEqual(spooled.source, b"Python developer")
+        self.assertEqual(spooled.digest, hashlib.sha256(b"Python developer").hexdigest())
+
+    def test_large_uploads_spool_to_disk_and_parse_by_path(self):
+        content = b"Python developer\n" * 10000
+        spooled = asyncio.run(read_upload(_upload(content), spool_bytes=1024))
+        self.assertTrue(os.path.exists(spooled.path))
+        self.assertEqual((spooled.size, spooled.read()), (len(content), content))
+        self.assertEqual(ResumeParser.parse_document(spooled.source, "text").text, content.decode())
+        spooled.close()
+        self.assertIsNone(spooled.path)
+
+    def test_oversized_upload_is_rejected_and_cleaned_up(self):
+        spool_dir = tempfile.mkdtemp()
+        with mock.patch.object(settings, "upload_spool_dir", spool_dir), self.assertRaises(HTTPException) as raised:
+            asyncio.run(read_upload(_upload(b"x" * 300 * 1024), max_bytes=200 * 1024, spool_bytes=1024))
+        self.assertEqual(raised.exception.status_code, 413)
+        self.assertEqual(os.listdir(spool_dir), [])
+
+
+class TestReadArchive(unittest.TestCase):
+    def test_members_are_streamed_into_spooled_uploads(self):
+        content = b"Python developer\n" * 10000
+        with mock.patch.object(settings, "upload_spool_bytes", 1024):
+            files = read_archive(_zip({"a.txt": content, "b.txt": b"Go developer", "notes.md": b"skip"}))
+        self.assertEqual([name for name, _ in files], ["a.txt", "b.txt"])
+        self.assertTrue(os.path.exists(files[0][1].path))
+        self.assertEqual(files[0][1].digest, hashlib.sha256(content).hexdigest())
+        self.assertEqual(files[1][1].source, b"Go developer")
+        files[0][1].close()
+
+    def test_high_compression_ratio_is_rejected(self):
+        with mock.patch.object(settings, "parse_max_bytes", 0), self.assertRaises(HTTPException) as raised:
+            read_archive(_zip({"bomb.txt": b"\0" * (8 * 1024 * 1024)}))
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_total_uncompressed_size_is_capped(self):
+        spool_dir = tempfile.mkdtemp()
+        members = {f"{i}.txt": os.urandom(64 * 1024) for i in range(4)}
+        with mock.patch.multiple(settings, archive_max_bytes=200 * 1024, upload_spool_bytes=1024,
+                                 upload_spool_dir=spool_dir), self.assertRaises(HTTPException) as raised:
+            read_archive(_zip(members))
+        self.assertEqual(raised.exception.status_code, 413)
+        self.assertEqual(os.listdir(spool_dir), [])
+
+
+class TestParseUploads(unittest.TestCase):
+    def test_extractions_are_bounded_by_worker_count(self):
+        running, peak = 0, 0
+
+        async def fake_parse(content, filename, digest=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return ParsedDocument(text=filename)
+
+        uploads = [(f"{i}.txt", SpooledUpload.from_bytes(f"{i}.txt", b"x")) for i in range(10)]
+        with mock.patch.object(settings, "parse_workers", 2), \
+                mock.patch.object(ResumeParser, "parse_upload_async", side_effect=fake_parse):
+            parsed = asyncio.run(parse_uploads(uploads + [("big.pdf", None)]))
+        self.assertEqual(peak, 2)
+        self.assertEqual([doc.status for _, doc in parsed][-2:], ["success", "too_large"])
+
+
+if __name__ == "__main__":
+    unittest.main()
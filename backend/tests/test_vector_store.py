@@ -0,0 +1,129 @@
+import os
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import faiss
+from app.services.vector_store import VectorStore
+
+
+class TestVectorStore(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(200, 16)).astype("float32")
+
+    def test_ivf_builds_after_training_threshold(self):
+        """An IVF store stays flat until it has enough vectors, then keeps IDs stable."""
+        store = VectorStore(dimension=16, index_type="ivf", nlist=4, nprobe=4)
+        ids = store.add_vectors(self.vectors[:100], [{"n": i} for i in range(100)])
+        self.assertNotIsInstance(store.index, faiss.IndexIVF)
+        ids += store.add_vectors(self.vectors[100:], [{"n": i} for i in range(100, 200)])
+        self.assertIsInstance(store.index, faiss.IndexIVF)
+        top = store.search(self.vectors[150], k=1)[0]
+        self.assertEqual(top["id"], ids[150])
+        self.assertEqual(top["metadata"], {"n": 150})
+
+    def test_hnsw_save_and_load(self):
+        """HNSW stores round-trip through disk and keep assigning fresh IDs."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pool", "index.faiss")
+            store = VectorStore(dimension=16, index_path=path, index_type="hnsw")
+            ids = store.add_vectors(self.vectors[:50], [{"n": i} for i in range(50)])
+            store.save()
+
+            reloaded = VectorStore(dimension=16, index_path=path, index_type="hnsw")
+            reloaded.load()
+            self.assertEqual(reloaded.search(self.vectors[7], k=1)[0]["id"], ids[7])
+            self.assertNotIn(reloaded.add_vector(self.vectors[60], {"n": 60}), ids)
+
+    def test_remove_and_upsert_by_external_id(self):
+        """Removed entries never come back; re-adding an external ID replaces it."""
+        for index_type in ("flat", "hnsw"):
+            with self.subTest(index_type=index_type):
+                store = VectorStore(dimension=16, index_type=index_type)
+                store.add_vectors(self.vectors[:20], [{"n": i} for i in range(20)], [f"c{i}" for i in range(20)])
+                self.assertEqual(store.remove_external(["c3"]), 1)
+                self.assertEqual(len(store), 19)
+                self.assertNotEqual(store.search(self.vectors[3], k=1)[0]["external_id"], "c3")
+
+                store.add_vector(self.vectors[3], {"n": "new"}, external_id="c5")
+                hits = store.search(self.vectors[3], k=1)
+                self.assertEqual((hits[0]["external_id"], hits[0]["metadata"]), ("c5", {"n": "new"}))
+                self.assertEqual(len(store), 19)
+
+                store.compact()
+                self.assertEqual(store.metadata.count(deleted=True), 0)
+                self.assertEqual(len(store.search(self.vectors[0], k=50)), 19)
+
+    def test_search_batch_matches_single_search(self):
+        store = VectorStore(dimension=16)
+        store.add_vectors(self.vectors, [{"n": i} for i in range(len(self.vectors))])
+        batch = store.search_batch(self.vectors[:5], k=3)
+        for query, hits in zip(self.vectors[:5], batch):
+            self.assertEqual(hits, store.search(query, k=3))
+
+    def test_legacy_pickle_metadata_is_migrated(self):
+        """Stores saved with pickled metadata and sequential IDs load under the same IDs."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.faiss")
+            legacy = faiss.IndexFlatIP(16)
+            vectors = self.vectors[:10].copy()
+            faiss.normalize_L2(vectors)
+            legacy.add(vectors)
+            faiss.write_index(legacy, path)
+            with open(path + ".meta", "wb") as f:
+                pickle.dump({i: {"n": i} for i in range(10)}, f)
+
+            store = VectorStore(dimension=16, index_path=path)
+            store.load()
+            top = store.search(self.vectors[4], k=1)[0]
+            self.assertEqual((top["id"], top["metadata"]), (4, {"n": 4}))
+            self.assertFalse(os.path.exists(path + ".meta"))
+            self.assertGreaterEqual(store.add_vector(self.vectors[11], {"n": 11}), 10)
+
+    def test_load_reconciles_index_with_metadata(self):
+        """Rows committed after the last index save are dropped, as are vectors deleted since."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.faiss")
+            store = VectorStore(dimension=16, index_path=path)
+            ids = store.add_vectors(self.vectors[:10], [{"n": i} for i in range(10)])
+            store.save()
+            store.remove(ids[:2])
+            store.add_vectors(self.vectors[10:13], [{"n": i} for i in range(10, 13)])
+
+            reloaded = VectorStore(dimension=16, index_path=path)
+            reloaded.load()
+            self.assertEqual(len(reloaded), 8)
+            self.assertEqual(reloaded.metadata.count(), 8)
+            hits = reloaded.search(self.vectors[0], k=20)
+            self.assertEqual(sorted(h["id"] for h in hits), ids[2:])
+
+    def test_deferred_ivf_build_catches_up_on_changes(self):
+        """Vectors added and removed while k-means runs are applied before the swap."""
+        store = VectorStore(dimension=16, index_type="ivf", nlist=4, nprobe=4, defer_ivf_build=True)
+        ids = store.add_vectors(self.vectors[:160], [{"n": i} for i in range(160)])
+        self.assertTrue(store.ivf_build_due())
+        test = self
+
+        class Lock:
+            entered = 0
+
+            def __enter__(self):
+                self.entered += 1
+                if self.entered == 2:
+                    # Changes that land between the snapshot and the swap
+                    ids.extend(store.add_vectors(test.vectors[160:], [{"n": i} for i in range(160, 200)]))
+                    store.remove([ids[0]])
+
+            def __exit__(self, *exc):
+                return False
+
+        self.assertTrue(store.build_ivf(Lock()))
+        self.assertIsInstance(store.index, faiss.IndexIVF)
+        self.assertEqual(len(store), 199)
+        self.assertEqual(store.search(self.vectors[190], k=1)[0]["id"], ids[190])
+        self.assertNotEqual(store.search(self.vectors[0], k=1)[0]["id"], ids[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""
+Precompute role-centroid embeddings for market-data role detection.
+
+    python scripts/build_role_centroids.py --output backend/data/role_centroids.npz
+    MARKET_ROLE_CENTROIDS_PATH=data/role_centroids.npz uvicorn app.main:app
+
+Embeds each role's name, patterns and top skills with the configured encoder
+(EMBEDDING_MODEL / ENCODER_BACKEND, or MARKET_DATA_PATH for the dataset) and
+stores one unit vector per role. The backend ignores the file if the dataset's
+roles or the embedding model change, so rebuild it after either.
+"""
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.core.config import settings
+from app.services.encoders import load_encoder
+from app.services.market_data import compute_role_centroids, get_market_dataset, save_role_centroids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="backend/data/role_centroids.npz")
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    dataset = get_market_dataset()
+    encoder = load_encoder(
+        args.model, settings.encoder_backend,
+        export_dir=settings.encoder_export_dir,
+        quantization=settings.encoder_quantization
+    )
+    centroids = compute_role_centroids(dataset, lambda texts: encoder.encode(texts, batch_size=args.batch_size))
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    save_role_centroids(args.output, dataset, centroids, args.model)
+    print(f"Wrote {len(dataset)} role centroids ({centroids.shape[1]} dims) to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
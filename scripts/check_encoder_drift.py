@@ -0,0 +1,79 @@
+"""
+Compare encoder backends against the fp32 PyTorch reference.
+
+    python scripts/check_encoder_drift.py --backends torch-int8 onnx onnx-int8
+    python scripts/check_encoder_drift.py --texts my_resumes.txt --max-drift 0.02
+
+Prints cosine agreement, similarity-score drift and speed for each backend,
+and exits non-zero if any backend drifts more than --max-drift.
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.core.config import settings
+from app.services.encoders import ENCODER_BACKENDS, compare_encoders, load_encoder
+from app.services.skills_data import SKILL_CATEGORIES
+
+TEMPLATES = [
+    "Built and maintained production services using {a} and {b}.",
+    "We are looking for an engineer with strong {a} experience; {b} is a plus.",
+    "Led a team of 5 engineers migrating from {b} to {a}, reducing costs by 30%.",
+    "Responsible for various tasks related to {a}.",
+]
+
+
+def sample_texts() -> list:
+    """Resume/JD-like sentences covering every skill category."""
+    texts = []
+    for skills in SKILL_CATEGORIES.values():
+        skills = sorted(skills)
+        for i, template in enumerate(TEMPLATES):
+            a, b = skills[i % len(skills)], skills[(i + 1) % len(skills)]
+            texts.append(template.format(a=a, b=b))
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=settings.embedding_model)
+    parser.add_argument("--backends", nargs="+", default=["torch-int8", "onnx", "onnx-int8"],
+                        choices=[b for b in ENCODER_BACKENDS if b != "torch"])
+    parser.add_argument("--texts", help="File with one text per line (defaults to built-in samples)")
+    parser.add_argument("--max-drift", type=float, default=0.02,
+                        help="Largest acceptable change in any text-to-text cosine score")
+    args = parser.parse_args()
+
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = sample_texts()
+
+    reference = load_encoder(args.model, "torch")
+    report, failed = {}, []
+    for backend in args.backends:
+        try:
+            candidate = load_encoder(
+                args.model, backend,
+                export_dir=settings.encoder_export_dir,
+                quantization=settings.encoder_quantization
+            )
+        except Exception as e:
+            report[backend] = {"error": str(e)}
+            continue
+        report[backend] = compare_encoders(reference, candidate, texts)
+        if report[backend]["max_similarity_drift"] > args.max_drift:
+            failed.append(backend)
+
+    print(json.dumps(report, indent=2))
+    if failed:
+        print(f"Drift above {args.max_drift}: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,15 @@
-from fpdf import FPDF
+import argparse
+import json
 import os
+import random
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "backend"))
+
+from app.services.skills_data import SKILL_CATEGORIES
 
 def create_sample_pdf():
+    from fpdf import FPDF
     pdf = FPDF()
     pdf.add_page()
     pdf.set_font("Arial", size=12)
@@ -42,9 +50,141 @@ def create_sample_pdf():
     pdf.output("demo_data/sample_resume.pdf")
     print("Created demo_data/sample_resume.pdf")
 
+# --- Synthetic corpora (used by backend/benchmarks) ---
+
+# Number of roles per resume and paragraphs per JD for each size class
+SIZES = {
+    "small": {"roles": 1, "bullets": 4, "jd_paragraphs": 1},
+    "medium": {"roles": 3, "bullets": 5, "jd_paragraphs": 3},
+    "large": {"roles": 8, "bullets": 7, "jd_paragraphs": 6},
+}
+FORMATS = ("pdf", "docx", "txt")
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Smith", "Garcia", "Chen", "Patel", "Kim", "Novak", "Okafor", "Silva", "Berg", "Rossi"]
+COMPANIES = ["Tech Corp", "DataWorks", "CloudNine", "Finlytics", "MediSoft", "RetailHub", "Quantive", "Orbital Labs"]
+TITLES = ["Software Engineer", "Senior Software Engineer", "Data Scientist", "DevOps Engineer",
+          "Backend Developer", "Frontend Developer", "ML Engineer", "Platform Engineer"]
+VERBS = ["Built", "Led", "Designed", "Optimized", "Migrated", "Implemented", "Automated", "Worked on", "Helped with"]
+OUTCOMES = ["reducing latency by {n}%", "serving {n}k users", "cutting costs by ${n}k",
+            "improving throughput {n}x", "for the internal platform", "across several teams"]
+JD_SENTENCES = [
+    "We are looking for an engineer with strong {a} and {b} experience.",
+    "You will design and operate services built on {a}, {b} and {c}.",
+    "Experience with {a} is required; familiarity with {b} is a plus.",
+    "The team owns {a} pipelines and ships features weekly using {b}.",
+]
+
+
+def _skills(rng: random.Random, k: int) -> list:
+    categories = list(SKILL_CATEGORIES.values())
+    picked = set()
+    while len(picked) < k:
+        picked.add(rng.choice(sorted(rng.choice(categories))))
+    return sorted(picked)
+
+
+def make_resume(rng: random.Random, size: str) -> str:
+    """Plain-text resume (ASCII only, so every writer can encode it)."""
+    spec = SIZES[size]
+    skills = _skills(rng, 6 + 2 * spec["roles"])
+    lines = [f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.choice(TITLES),
+             f"{rng.choice(FIRST_NAMES).lower()}@example.com", "", "Experience"]
+    year = 2024
+    for _ in range(spec["roles"]):
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)} ({start} - {year})")
+        for _ in range(spec["bullets"]):
+            outcome = rng.choice(OUTCOMES).format(n=rng.randint(2, 90))
+            used = rng.sample(skills, 2)
+            lines.append(f"- {rng.choice(VERBS)} services using {used[0]} and {used[1]}, {outcome}.")
+        year = start
+    lines += ["", "Skills", ", ".join(skills), "", "Education", "B.S. Computer Science, University of Technology"]
+    return "\n".join(lines)
+
+
+def make_job_description(rng: random.Random, size: str) -> str:
+    paragraphs = []
+    for _ in range(SIZES[size]["jd_paragraphs"]):
+        sentences = []
+        for template in rng.sample(JD_SENTENCES, 3):
+            a, b, c = _skills(rng, 3)
+            sentences.append(template.format(a=a, b=b, c=c))
+        paragraphs.append(" ".join(sentences))
+    return "\n\n".join(paragraphs)
+
+
+def write_pdf(text: str, path: str):
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Helvetica", size=11)
+    for line in text.split("\n"):
+        pdf.multi_cell(0, 6, text=line or " ", new_x="LMARGIN", new_y="NEXT")
+    pdf.output(path)
+
+
+def write_docx(text: str, path: str):
+    from docx import Document
+    doc = Document()
+    for line in text.split("\n"):
+        doc.add_paragraph(line)
+    doc.save(path)
+
+
+def write_txt(text: str, path: str):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+WRITERS = {"pdf": write_pdf, "docx": write_docx, "txt": write_txt}
+
+
+def generate_corpus(out_dir: str, count: int = 5, sizes=tuple(SIZES), formats=FORMATS, seed: int = 0) -> dict:
+    """
+    Write `count` resumes per (size, format) plus `count` JDs per size into out_dir,
+    along with a manifest.json describing them. The same seed always produces
+    the same corpus, so benchmark runs are comparable.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {"seed": seed, "count": count, "resumes": [], "job_descriptions": []}
+    for size in sizes:
+        for i in range(count):
+            text = make_resume(rng, size)
+            for fmt in formats:
+                name = f"resume_{size}_{i}.{fmt}"
+                try:
+                    WRITERS[fmt](text, os.path.join(out_dir, name))
+                except ImportError as e:
+                    print(f"Skipping {fmt} ({e})")
+                    continue
+                manifest["resumes"].append({"file": name, "size": size, "format": fmt, "chars": len(text)})
+        for i in range(count):
+            name = f"jd_{size}_{i}.txt"
+            text = make_job_description(rng, size)
+            write_txt(text, os.path.join(out_dir, name))
+            manifest["job_descriptions"].append({"file": name, "size": size, "chars": len(text)})
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
 if __name__ == "__main__":
-    try:
-        create_sample_pdf()
-    except Exception as e:
-        print(f"Error: {e}")
-        # Fallback if fpdf not installed (it's not in requirements.txt yet!)
+    parser = argparse.ArgumentParser(description="Generate demo data or a synthetic benchmark corpus.")
+    parser.add_argument("--corpus", help="Write a synthetic corpus to this directory instead of the sample PDF")
+    parser.add_argument("--count", type=int, default=5, help="Documents per size (and format)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES))
+    parser.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    args = parser.parse_args()
+
+    if args.corpus:
+        manifest = generate_corpus(args.corpus, args.count, args.sizes, args.formats, args.seed)
+        print(f"Created {len(manifest['resumes'])} resumes and {len(manifest['job_descriptions'])} JDs in {args.corpus}")
+    else:
+        try:
+            create_sample_pdf()
+        except Exception as e:
+            print(f"Error: {e}")
+            # Fallback if fpdf not installed (it's not in requirements.txt yet!)